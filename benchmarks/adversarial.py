@@ -0,0 +1,324 @@
+# benchmarks/adversarial.py
+"""
+Worst-case inputs with bounded-time / bounded-memory assertions.
+
+Each case generates a hostile but valid source at two sizes (n and 4n):
+1,000-deep elif chains, 98-deep nested ifs, 100k-element literals,
+huge boolean chains, thousands of `while True` loops and giant
+single-line files. Every analyzer, the full review and the serialized
+response must stay inside a time and memory envelope that grows
+linearly with input size, and must not grow faster than GROWTH_LIMIT
+between the two sizes. Deadlines are off: the envelope has to hold
+without cancellation.
+
+A RecursionError is reported as "depth_limit" and accepted: review
+turns it into ANALYSIS_DEPTH_LIMIT. Any other exception fails.
+
+Usage:
+    python -m benchmarks.adversarial
+    python -m benchmarks.adversarial --cases deep_elif,single_line --output adv.json
+    python -m benchmarks.adversarial --time-factor 2   # slower machines
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from core.architecture_engine import analyze_architecture
+from core.ast_analyzer import analyze_python_ast
+from core.cfg_builder import _CFG_CACHE
+from core.cfg_engine import analyze_cfg
+from core.complexity_engine import analyze_complexity
+from core.dfg_engine import analyze_dfg
+from core.explain_engine import explain_results
+from core.file_context import FileContext
+from core.resource_engine import analyze_resources
+from core.structure_analyzer import analyze_structure
+from core.taint_engine import _SUMMARY_CACHE, analyze_taint
+from services.review_brain import ReviewBrain
+
+
+# -----------------------------
+# Generators
+# -----------------------------
+def deep_elif(n: int) -> str:
+    """`elif` nests in orelse: an n-deep If chain at one indentation level."""
+    lines = ["def branch(x):", "    if x == 0:", "        return 0"]
+    for i in range(1, n):
+        lines += [f"    elif x == {i}:", f"        return {i}"]
+    lines.append("    return -1")
+    return "\n".join(lines) + "\n"
+
+
+def nested_ifs(n: int) -> str:
+    """n ifs as 98-deep stacks (the tokenizer allows 100 indent levels)."""
+    depth = 98
+    lines = []
+    for b in range(max(1, n // depth)):
+        lines.append(f"def nest_{b}(x):")
+        for d in range(depth):
+            lines.append("    " * (d + 1) + f"if x > {d}:")
+        lines.append("    " * (depth + 1) + "return x")
+        lines.append("    return None")
+    return "\n".join(lines) + "\n"
+
+
+def big_literal(n: int) -> str:
+    items = ", ".join(str(i) for i in range(n))
+    pairs = ", ".join(f"'k{i}': {i}" for i in range(n))
+    return f"DATA = [{items}]\nTABLE = {{{pairs}}}\n"
+
+
+def bool_chain(n: int) -> str:
+    """One condition with n operands (BoolOp values for ComplexityVisitor)."""
+    terms = " or ".join(f"a{i % 7} and b{i % 5}" for i in range(n // 2))
+    params = ", ".join([f"a{i}" for i in range(7)] + [f"b{i}" for i in range(5)])
+    return f"def check({params}):\n    if {terms}:\n        return 1\n    return 0\n"
+
+
+def while_true(n: int) -> str:
+    """n single-loop functions, one function with n loops, one 90-deep loop nest."""
+    lines = []
+    for i in range(n):
+        lines += [
+            f"def spin_{i}(q):",
+            "    while True:",
+            "        item = q.get()",
+            "        if item is None:",
+            "            break",
+        ]
+    lines.append("def many(q):")
+    for _ in range(n):
+        lines += ["    while True:", "        if q.get():", "            break"]
+    lines.append("def nested(q):")
+    for d in range(90):
+        lines.append("    " * (d + 1) + "while True:")
+    lines.append("    " * 91 + "break")
+    return "\n".join(lines) + "\n"
+
+
+def single_line(n: int) -> str:
+    """n statements on one line, each with findings that quote the line."""
+    return "; ".join(f"v{i} = input(); eval(v{i}); w{i} = u{i}" for i in range(n)) + "\n"
+
+
+# name → (generator, base n); measured at n and 4n
+CASES: Dict[str, Tuple[Callable[[int], str], int]] = {
+    "deep_elif": (deep_elif, 250),
+    "nested_ifs": (nested_ifs, 1000),
+    "big_literal": (big_literal, 25_000),
+    "bool_chain": (bool_chain, 25_000),
+    "while_true": (while_true, 1000),
+    "single_line": (single_line, 1000),
+}
+
+SIZE_FACTOR = 4
+
+
+# -----------------------------
+# Envelopes
+# -----------------------------
+# target kind → (base seconds, seconds per MB of source)
+TIME_ENVELOPE = {
+    "parse": (0.25, 1.5),
+    "analyzer": (0.5, 6.0),
+    "review": (2.0, 24.0),
+    "response": (0.5, 2.0),
+}
+
+# target kind → (base MB, traced bytes per source byte)
+MEMORY_ENVELOPE = {
+    "parse": (16, 200),
+    "analyzer": (32, 200),
+    "review": (64, 400),
+    "response": (32, 100),
+}
+
+# time(4n) / time(n) above SIZE_FACTOR * 2 means worse than ~n log n
+GROWTH_LIMIT = SIZE_FACTOR * 2.0
+# below this the ratio is timer noise
+GROWTH_MIN_SECONDS = 0.05
+
+ANALYZERS = {
+    "ast": analyze_python_ast,
+    "structure": analyze_structure,
+    "complexity": analyze_complexity,
+    "cfg": analyze_cfg,
+    "dfg": analyze_dfg,
+    "taint": analyze_taint,
+    "resources": analyze_resources,
+    "architecture": analyze_architecture,
+}
+
+
+def _kind(target: str) -> str:
+    return target if target in TIME_ENVELOPE else "analyzer"
+
+
+def envelope(target: str, size: int, time_factor: float) -> Tuple[float, float]:
+    """(seconds, bytes) allowed for `target` on a source of `size` bytes."""
+    kind = _kind(target)
+    base_s, per_mb = TIME_ENVELOPE[kind]
+    base_mb, per_byte = MEMORY_ENVELOPE[kind]
+    seconds = (base_s + per_mb * size / (1024 * 1024)) * time_factor
+    return seconds, base_mb * 1024 * 1024 + per_byte * size
+
+
+# -----------------------------
+# Measurement
+# -----------------------------
+def _cold():
+    _CFG_CACHE.clear()
+    _SUMMARY_CACHE.clear()
+
+
+def _targets(code: str, brain: ReviewBrain) -> Dict[str, Callable[[], Callable[[], object]]]:
+    """
+    Target name → setup returning the call to measure. Setup (parsing
+    for analyzers, the review for the response) is not measured.
+    """
+    payload = {"code": code, "language": "python", "deadline": None}
+
+    def parse():
+        return lambda: FileContext(code).tree
+
+    def analyzer(fn):
+        def setup():
+            ctx = FileContext(code)
+            ctx.tree
+            return lambda: fn(code, ctx)
+        return setup
+
+    def review():
+        return lambda: brain.review_code(dict(payload))
+
+    def response():
+        findings = brain.review_code(dict(payload))
+        return lambda: json.dumps(explain_results(findings))
+
+    targets = {"parse": parse}
+    targets.update({name: analyzer(fn) for name, fn in ANALYZERS.items()})
+    targets["review"] = review
+    targets["response"] = response
+    return targets
+
+
+def measure(setup: Callable[[], Callable[[], object]]) -> Dict:
+    _cold()
+    fn = setup()
+    start = time.perf_counter()
+    try:
+        fn()
+        outcome = "ok"
+    except RecursionError:
+        outcome = "depth_limit"
+    except Exception as e:
+        outcome = f"error: {type(e).__name__}: {e}"
+    seconds = time.perf_counter() - start
+
+    # traced separately: tracemalloc slows allocation-heavy code
+    _cold()
+    fn = setup()
+    tracemalloc.start()
+    try:
+        fn()
+    except Exception:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"outcome": outcome, "seconds": round(seconds, 4), "peak_bytes": peak}
+
+
+def run_case(name: str, brain: ReviewBrain, only: List[str], time_factor: float) -> Dict:
+    generate, base = CASES[name]
+    sizes = {}
+    violations = []
+
+    for n in (base, base * SIZE_FACTOR):
+        code = generate(n)
+        size = len(code.encode("utf-8"))
+        results = {}
+        for target, setup in _targets(code, brain).items():
+            if only and target not in only:
+                continue
+            stats = measure(setup)
+            max_s, max_bytes = envelope(target, size, time_factor)
+            stats["max_seconds"] = round(max_s, 3)
+            stats["max_bytes"] = int(max_bytes)
+            results[target] = stats
+
+            if stats["outcome"].startswith("error"):
+                violations.append(f"{name}[n={n}] {target}: {stats['outcome']}")
+            if stats["seconds"] > max_s:
+                violations.append(f"{name}[n={n}] {target}: {stats['seconds']:.2f}s > {max_s:.2f}s")
+            if stats["peak_bytes"] > max_bytes:
+                violations.append(
+                    f"{name}[n={n}] {target}: peak {stats['peak_bytes'] / 2**20:.1f} MB "
+                    f"> {max_bytes / 2**20:.1f} MB"
+                )
+            print(
+                f"[adversarial] {name:<12} n={n:<7} {target:<13} {stats['outcome']:<12} "
+                f"{stats['seconds']:>8.3f}s / {max_s:>7.2f}s  {stats['peak_bytes'] / 2**20:>8.1f} MB",
+                file=sys.stderr,
+            )
+
+        sizes[str(n)] = {"bytes": size, "results": results}
+
+    small, large = (sizes[str(base)]["results"], sizes[str(base * SIZE_FACTOR)]["results"])
+    growth = {}
+    for target in small:
+        a, b = small[target]["seconds"], large[target]["seconds"]
+        if max(a, b) < GROWTH_MIN_SECONDS or not a:
+            continue
+        growth[target] = round(b / a, 2)
+        if growth[target] > GROWTH_LIMIT:
+            violations.append(f"{name} {target}: x{growth[target]} time for x{SIZE_FACTOR} input")
+
+    return {"sizes": sizes, "growth": growth, "violations": violations}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default="", help=f"comma-separated: {', '.join(CASES)}")
+    parser.add_argument("--targets", default="", help="comma-separated: parse, analyzer names, review, response")
+    parser.add_argument("--time-factor", type=float, default=1.0, help="scale every time envelope")
+    parser.add_argument("--output", default=None, help="write the JSON report here")
+    args = parser.parse_args()
+
+    cases = [c for c in args.cases.split(",") if c] or list(CASES)
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+    only = [t for t in args.targets.split(",") if t]
+
+    # analyzers log to stdout; keep it clean for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        brain = ReviewBrain()
+        report = {
+            "envelopes": {"time": TIME_ENVELOPE, "memory": MEMORY_ENVELOPE, "growth_limit": GROWTH_LIMIT},
+            "time_factor": args.time_factor,
+            "cases": {name: run_case(name, brain, only, args.time_factor) for name in cases},
+        }
+
+    violations = [v for case in report["cases"].values() for v in case["violations"]]
+    report["violations"] = violations
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    for v in violations:
+        print(f"[adversarial] VIOLATION {v}", file=sys.stderr)
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# benchmarks/analyzer_bench.py
+"""
+Per-analyzer micro-benchmarks over the synthetic corpus.
+
+Times every analyze_* entry point, scope mapping / resolution,
+explain_results, to_sarif and evaluate_policy at each corpus scale.
+Reports ops/s, p50 / p99 latency and peak traced memory as JSON.
+Compare mode fails (exit 1) when a target's p50 regresses past the
+tolerance against a saved baseline.
+
+Usage:
+    python -m benchmarks.analyzer_bench --scales small,medium --output bench.json
+    python -m benchmarks.analyzer_bench --compare bench.json --tolerance 0.25
+"""
+import argparse
+import contextlib
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from benchmarks.corpus import SCALES, generate, scale_info
+from core.architecture_engine import analyze_architecture
+from core.ast_analyzer import analyze_python_ast
+from core.ast_summary import summarize
+from core.cfg_builder import _CFG_CACHE
+from core.cfg_engine import analyze_cfg
+from core.complexity_engine import analyze_complexity
+from core.dfg_engine import analyze_dfg
+from core.explain_engine import explain_results
+from core.file_context import FileContext
+from core.flat_ast import FlatTree, enabled as flat_enabled
+from core.policy_engine import evaluate_policy
+from core.resource_engine import analyze_resources
+from core.sarif_exporter import to_sarif
+from core.scope_mapper import ScopeIndex, map_scopes, resolve_scope
+from core.structure_analyzer import analyze_structure
+from core.taint_engine import _SUMMARY_CACHE, analyze_taint
+from services.review_brain import ReviewBrain
+
+DEFAULT_SCALES = "small,medium,large"
+
+
+def _cold():
+    # Cross-request caches would turn repeats into cache hits.
+    # Compiled rule sets stay warm: they are per policy, not per file.
+    _CFG_CACHE.clear()
+    _SUMMARY_CACHE.clear()
+
+
+def _index_resolve(code: str, lines: List[int]):
+    index = ScopeIndex.from_code(code)
+    return [index.resolve(line) for line in lines]
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict:
+    samples = []
+    for _ in range(repeat):
+        _cold()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    # Separate traced run: tracemalloc slows allocation-heavy code
+    _cold()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mean = sum(samples) / len(samples)
+    return {
+        "ops_per_sec": round(1 / mean, 3) if mean else None,
+        "p50_ms": round(_percentile(samples, 0.50) * 1000, 3),
+        "p99_ms": round(_percentile(samples, 0.99) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def targets(code: str) -> Dict[str, Callable[[], object]]:
+    """Benchmark name → zero-argument callable for one source."""
+    brain = ReviewBrain()
+    raw = brain.review_code({"code": code, "language": "python", "deadline": None})
+    explained = explain_results(raw)
+    scopes = map_scopes(code)
+    lines = [f.line for f in raw if f.line is not None]
+    tree = FileContext(code).tree
+
+    benches = {
+        "parse": lambda: FileContext(code),
+        "analyze_python_ast": lambda: analyze_python_ast(code),
+        "analyze_structure": lambda: analyze_structure(code),
+        "analyze_complexity": lambda: analyze_complexity(code),
+        "analyze_cfg": lambda: analyze_cfg(code),
+        "analyze_dfg": lambda: analyze_dfg(code),
+        "analyze_taint": lambda: analyze_taint(code),
+        "analyze_resources": lambda: analyze_resources(code),
+        "analyze_architecture": lambda: analyze_architecture(code),
+        "map_scopes": lambda: map_scopes(code),
+        # linear scan per finding vs. one index build + bisect per finding
+        "resolve_scope": lambda: [resolve_scope(line, scopes) for line in lines],
+        "scope_index_resolve": lambda: _index_resolve(code, lines),
+        "explain_results": lambda: explain_results(raw),
+        "to_sarif": lambda: to_sarif(explained, "bench.py"),
+        "evaluate_policy": lambda: evaluate_policy(explained),
+        "review_code": lambda: brain.review_code({"code": code, "language": "python", "deadline": None}),
+        # subtree summaries: visitor walk vs. flat arrays (NumPy)
+        "summarize": lambda: summarize(tree),
+    }
+    if flat_enabled():
+        benches["flat_summaries"] = lambda: FlatTree(tree).summaries()
+    return benches
+
+
+def run(scales: List[str], repeat: int, only: List[str]) -> Dict:
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        },
+        "scales": {},
+        "results": {},
+    }
+
+    for scale in scales:
+        code = generate(SCALES[scale])
+        report["scales"][scale] = scale_info(scale, code)
+
+        for name, fn in targets(code).items():
+            if only and name not in only:
+                continue
+            stats = measure(fn, repeat)
+            report["results"].setdefault(name, {})[scale] = stats
+            print(f"[bench] {scale:<7} {name:<22} p50={stats['p50_ms']:>10.3f}ms  peak={stats['peak_kb']:>10.1f}KB", file=sys.stderr)
+
+    return report
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float, min_ms: float) -> List[Dict]:
+    """
+    Targets whose p50 grew by more than `tolerance` (0.25 = 25%).
+    Baselines under `min_ms` are skipped: timer noise dominates there.
+    """
+    regressions = []
+    for name, by_scale in report["results"].items():
+        for scale, stats in by_scale.items():
+            base = baseline.get("results", {}).get(name, {}).get(scale)
+            if not base or not base.get("p50_ms") or base["p50_ms"] < min_ms:
+                continue
+            ratio = stats["p50_ms"] / base["p50_ms"]
+            if ratio > 1 + tolerance:
+                regressions.append({
+                    "target": name,
+                    "scale": scale,
+                    "baseline_p50_ms": base["p50_ms"],
+                    "p50_ms": stats["p50_ms"],
+                    "ratio": round(ratio, 3),
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help=f"comma-separated: {', '.join(SCALES)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", default="", help="comma-separated target names")
+    parser.add_argument("--output", default=None, help="write the JSON report here")
+    parser.add_argument("--compare", default=None, help="baseline report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore baselines faster than this")
+    args = parser.parse_args()
+
+    scales = [s for s in args.scales.split(",") if s]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+    only = [t for t in args.only.split(",") if t]
+
+    # analyzers log to stdout; keep it clean for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run(scales, args.repeat, only)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(report, baseline, args.tolerance, args.min_ms)
+        for r in report["regressions"]:
+            print(
+                f"[bench] REGRESSION {r['scale']} {r['target']}: "
+                f"{r['baseline_p50_ms']}ms -> {r['p50_ms']}ms (x{r['ratio']})",
+                file=sys.stderr,
+            )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# benchmarks/cold_start.py
+"""
+Cold-start profile of services.wisdom_service.
+
+Each run is a fresh interpreter in a scratch cwd, measuring:
+- import:  importing the service module
+- up:      lifespan startup done (a server would accept connections)
+- ready:   /ready returns 200 (warm-up finished)
+- first / second review latency
+
+Runs alternate warm-up on and off, so the first-request cost the
+warm-up removes is visible. One extra `python -X importtime` run
+attributes import time to top-level packages.
+
+Exits 1 when the median import time exceeds the budget
+(WISDOM_IMPORT_BUDGET_MS, see services/warmup.py).
+
+Usage:
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --runs 10 --budget-ms 600 --output cold.json
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+API_KEY = "devsync_live_abc123"
+
+# Probe output is the last stdout line, after this marker
+RESULT_MARKER = "COLD_START_RESULT "
+
+
+# -----------------------------
+# Probe (runs in the child)
+# -----------------------------
+def probe():
+    """Measures one cold start. Only stdlib is imported before the service."""
+    import asyncio
+    import contextlib
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr):
+        from services import wisdom_service
+        imported = time.perf_counter()
+
+        from benchmarks.corpus import CorpusSpec, generate
+        from benchmarks.load_test import AsgiClient
+
+        # different sources: the second request must not hit the
+        # first one's content-keyed caches
+        bodies = [
+            json.dumps({
+                "file": "cold.py",
+                "language": "python",
+                "code": generate(CorpusSpec(functions=10, seed=seed)),
+            }).encode()
+            for seed in (7, 8)
+        ]
+        headers = {"content-type": "application/json", "x-api-key": API_KEY}
+        import_ms = (imported - start) * 1000
+
+        async def run() -> Dict:
+            # the probe's own imports above are not part of startup
+            client = AsgiClient(wisdom_service.app)
+            started = time.perf_counter()
+            await client.start()
+            up = time.perf_counter()
+
+            while (await client.request("GET", "/ready", b"", {}))[0] != 200:
+                await asyncio.sleep(0.002)
+            ready = time.perf_counter()
+
+            latencies = []
+            for body in bodies:
+                sent = time.perf_counter()
+                status, _, _, _ = await client.request("POST", "/review", body, headers)
+                latencies.append((status, time.perf_counter() - sent))
+            await client.stop()
+
+            return {
+                "import_ms": import_ms,
+                "up_ms": import_ms + (up - started) * 1000,
+                "ready_ms": import_ms + (ready - started) * 1000,
+                "first_review_ms": latencies[0][1] * 1000,
+                "second_review_ms": latencies[1][1] * 1000,
+                "statuses": [s for s, _ in latencies],
+                "readiness": wisdom_service.readiness.snapshot(),
+            }
+
+        result = asyncio.run(run())
+
+    print(RESULT_MARKER + json.dumps(result))
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+def _env(warmup: bool) -> Dict[str, str]:
+    from benchmarks.load_test import prepare_env
+
+    prepare_env(None)
+    env = dict(os.environ)
+    env.pop("LLM_API_KEY", None)
+    env["WISDOM_WARMUP"] = "true" if warmup else "false"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def run_probe(warmup: bool) -> Dict:
+    from benchmarks.load_test import make_workdir
+
+    workdir = make_workdir()
+    spawned = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.cold_start", "--probe"],
+            cwd=workdir, env=_env(warmup), capture_output=True, text=True,
+        )
+        wall_ms = (time.perf_counter() - spawned) * 1000
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    lines = [l for l in proc.stdout.splitlines() if l.startswith(RESULT_MARKER)]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"probe failed ({proc.returncode}):\n{proc.stderr[-2000:]}")
+    result = json.loads(lines[-1][len(RESULT_MARKER):])
+    result["process_ms"] = wall_ms
+    return result
+
+
+def import_profile(top: int) -> List[Dict]:
+    """Self import time per top-level package, from -X importtime."""
+    from benchmarks.load_test import make_workdir
+
+    workdir = make_workdir()
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import services.wisdom_service"],
+            cwd=workdir, env=_env(False), capture_output=True, text=True,
+        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    totals: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_us)
+
+    ranked = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+    return [{"package": p, "self_ms": round(us / 1000, 1)} for p, us in ranked[:top]]
+
+
+def _summary(results: List[Dict]) -> Dict:
+    keys = ("import_ms", "up_ms", "ready_ms", "first_review_ms", "second_review_ms", "process_ms")
+    return {k: round(median(r[k] for r in results), 1) for k in keys}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per mode")
+    parser.add_argument("--budget-ms", type=float, default=None, help="import budget (default: service setting)")
+    parser.add_argument("--top", type=int, default=12, help="packages in the import profile")
+    parser.add_argument("--output", default=None, help="write the JSON report here")
+    args = parser.parse_args()
+
+    if args.probe:
+        probe()
+        return
+
+    from services.warmup import IMPORT_BUDGET_MS
+    budget = args.budget_ms if args.budget_ms is not None else IMPORT_BUDGET_MS
+
+    runs: Dict[str, List[Dict]] = {"warmup": [], "no_warmup": []}
+    for i in range(max(1, args.runs)):
+        for mode in runs:
+            result = run_probe(warmup=(mode == "warmup"))
+            runs[mode].append(result)
+            print(
+                f"[cold_start] {mode:<9} run {i + 1}: import {result['import_ms']:.0f} ms, "
+                f"ready {result['ready_ms']:.0f} ms, first review {result['first_review_ms']:.1f} ms",
+                file=sys.stderr,
+            )
+
+    summary = {mode: _summary(results) for mode, results in runs.items()}
+    import_ms = median(r["import_ms"] for results in runs.values() for r in results)
+
+    report = {
+        "python": sys.version.split()[0],
+        "budget_ms": budget,
+        "import_ms": round(import_ms, 1),
+        "over_budget": import_ms > budget,
+        "summary": summary,
+        "warmup_stages_ms": runs["warmup"][-1]["readiness"]["stages"],
+        "import_profile": import_profile(args.top),
+        "runs": runs,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    print(
+        f"[cold_start] import {import_ms:.0f} ms (budget {budget:.0f} ms); first review "
+        f"{summary['warmup']['first_review_ms']} ms warm vs {summary['no_warmup']['first_review_ms']} ms cold",
+        file=sys.stderr,
+    )
+    if report["over_budget"]:
+        print("[cold_start] OVER BUDGET", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# benchmarks/corpus.py
+"""
+Deterministic synthetic Python sources for benchmarks.
+
+Scale knobs: number of functions, nesting depth, imports, findings
+density (share of functions that trigger rules) and total size.
+
+Usage:
+    python -m benchmarks.corpus --scale large > /tmp/large.py
+"""
+import argparse
+import random
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+STDLIB_MODULES = [
+    "os", "sys", "re", "json", "time", "math", "random", "subprocess",
+    "pathlib", "typing", "itertools", "functools", "collections", "io",
+    "hashlib", "logging", "datetime", "socket", "threading", "shutil",
+]
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    functions: int = 50
+    depth: int = 3
+    imports: int = 10
+    findings: float = 0.2           # share of functions with a finding
+    methods_per_class: int = 8      # 0 → module-level functions only
+    target_bytes: Optional[int] = None  # keep adding functions up to this size
+    seed: int = 0
+
+
+SCALES = {
+    "small": CorpusSpec(functions=20, depth=2, imports=5),
+    "medium": CorpusSpec(functions=300, depth=3, imports=15),
+    "large": CorpusSpec(functions=1000, depth=4, imports=20, target_bytes=1024 * 1024),
+    "xlarge": CorpusSpec(functions=1000, depth=4, imports=20, target_bytes=10 * 1024 * 1024),
+}
+
+# Each snippet trips one analyzer; {v} is a per-function suffix
+FINDING_SNIPPETS = [
+    "eval(arg_{v})",
+    "os.system(arg_{v})",
+    "fh_{v} = open(arg_{v}, 'w')",
+    "unused_{v} = arg_{v} + 1",
+    "print(missing_{v})",
+    "data_{v} = input()\n{pad}exec(data_{v})",
+]
+
+
+def _block(rng: random.Random, depth: int, indent: int, v: str, lines: List[str]):
+    pad = "    " * indent
+    if depth == 0:
+        lines.append(f"{pad}total_{v} += arg_{v}")
+        return
+
+    kind = rng.choice(("if", "for", "while", "try", "with"))
+    if kind == "if":
+        lines.append(f"{pad}if arg_{v} > {depth} and total_{v} or not arg_{v}:")
+        _block(rng, depth - 1, indent + 1, v, lines)
+        lines.append(f"{pad}else:")
+        lines.append(f"{pad}    total_{v} -= 1")
+    elif kind == "for":
+        lines.append(f"{pad}for i_{depth} in range(arg_{v}):")
+        lines.append(f"{pad}    total_{v} += i_{depth}")
+        _block(rng, depth - 1, indent + 1, v, lines)
+    elif kind == "while":
+        lines.append(f"{pad}while total_{v} < {depth * 10}:")
+        _block(rng, depth - 1, indent + 1, v, lines)
+        lines.append(f"{pad}    if total_{v} > arg_{v}:")
+        lines.append(f"{pad}        break")
+    elif kind == "try":
+        lines.append(f"{pad}try:")
+        _block(rng, depth - 1, indent + 1, v, lines)
+        lines.append(f"{pad}except ValueError:")
+        lines.append(f"{pad}    total_{v} = 0")
+    else:
+        lines.append(f"{pad}with open(arg_{v}) as f_{depth}:")
+        lines.append(f"{pad}    total_{v} += len(f_{depth}.read())")
+        _block(rng, depth - 1, indent + 1, v, lines)
+
+
+def _function(rng: random.Random, spec: CorpusSpec, i: int, indent: int, method: bool) -> List[str]:
+    pad = "    " * indent
+    v = str(i)
+    params = ("self, " if method else "") + f"arg_{v}, extra_{v}=None"
+
+    lines = [f"{pad}def func_{v}({params}):"]
+    lines.append(f"{pad}    total_{v} = 0")
+    _block(rng, spec.depth, indent + 1, v, lines)
+
+    if rng.random() < spec.findings:
+        snippet = rng.choice(FINDING_SNIPPETS).format(v=v, pad=pad + "    ")
+        lines.append(f"{pad}    {snippet}")
+
+    lines.append(f"{pad}    return helper(total_{v}) if extra_{v} else total_{v}")
+    lines.append("")
+    return lines
+
+
+def generate(spec: CorpusSpec) -> str:
+    rng = random.Random(spec.seed)
+    lines: List[str] = []
+
+    modules = (STDLIB_MODULES * (spec.imports // len(STDLIB_MODULES) + 1))[: spec.imports]
+    for n, module in enumerate(modules):
+        alias = f" as {module}_{n}" if n >= len(STDLIB_MODULES) else ""
+        lines.append(f"import {module}{alias}")
+    lines.append("")
+    lines.append("")
+
+    size = sum(len(line) + 1 for line in lines)
+    i = 0
+    while i < spec.functions or (spec.target_bytes and size < spec.target_bytes):
+        chunk: List[str] = []
+        if spec.methods_per_class and i % (spec.methods_per_class * 2) == 0:
+            # alternate: a class of methods, then as many plain functions
+            chunk.append(f"class Service{i}:")
+            for m in range(spec.methods_per_class):
+                chunk.extend(_function(rng, spec, i + m, 1, True))
+            i += spec.methods_per_class
+        else:
+            chunk.extend(_function(rng, spec, i, 0, False))
+            i += 1
+
+        lines.extend(chunk)
+        size += sum(len(line) + 1 for line in chunk)
+
+    lines.append("")
+    lines.append("def helper(x):")
+    lines.append("    return x")
+    return "\n".join(lines) + "\n"
+
+
+def scale_info(name: str, code: str) -> dict:
+    return {
+        **asdict(SCALES[name]),
+        "bytes": len(code.encode("utf-8")),
+        "lines": code.count("\n"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    args = parser.parse_args()
+
+    print(generate(SCALES[args.scale]), end="")
+
+
+if __name__ == "__main__":
+    main()
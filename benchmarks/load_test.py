@@ -0,0 +1,763 @@
+# benchmarks/load_test.py
+"""
+End-to-end HTTP load test for services.wisdom_service:app.
+
+Open-loop Poisson arrivals at a target RPS over a weighted mix of
+/review, /review?compact=true, /review/sarif and /api/wisdom/chat.
+Review sources follow a log-normal size distribution built from the
+synthetic corpus. The LLM is replaced by a local stub that speaks the
+chat-completions protocol (plain and streamed) with injected latency.
+
+Latency is measured from each request's scheduled arrival, so a
+saturated server shows up as queueing rather than a lower send rate.
+
+Modes:
+    inprocess   drive the ASGI app directly (no sockets)
+    uvicorn     spawn a local uvicorn (single process) and use HTTP
+    --url       an already running server; no stub, no stage breakdown
+
+Per-stage timings (analysis, explain, policy, LLM, audit log, ...)
+come from wrappers installed around the service's stage functions.
+
+Usage:
+    python -m benchmarks.load_test --rps 10 --duration 30
+    python -m benchmarks.load_test --mode uvicorn --rps 40 --mix review=6,sarif=2,chat=2
+    python -m benchmarks.load_test --url http://localhost:8000 --api-key <key>
+"""
+import argparse
+import asyncio
+import contextlib
+import functools
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks.corpus import CorpusSpec, generate
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# name → (method, path, body kind)
+ENDPOINTS = {
+    "review": ("POST", "/review", "code"),
+    "review_compact": ("POST", "/review?compact=true", "code"),
+    "sarif": ("POST", "/review/sarif", "code"),
+    "chat": ("POST", "/api/wisdom/chat", "chat"),
+}
+
+DEFAULT_MIX = "review=5,review_compact=2,sarif=1,chat=2"
+DEFAULT_API_KEY = "devsync_live_abc123"
+
+CHAT_MESSAGES = [
+    "Why is this function flagged?",
+    "Explain the taint finding on line 12.",
+    "How do I refactor this loop?",
+    "Is this safe to run in production?",
+]
+
+STAGES_PATH = "/__loadtest/stages"
+
+
+# -----------------------------
+# Percentiles
+# -----------------------------
+def _percentile(ordered: List[float], q: float) -> float:
+    # nearest rank: p999 of 100 samples is the max, not an interpolation
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def summarize(samples: List[float]) -> Dict:
+    """Seconds in, milliseconds out."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 3),
+        "p999_ms": round(_percentile(ordered, 0.999) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+# -----------------------------
+# LLM stub
+# -----------------------------
+class LLMStub:
+    """
+    Local chat-completions endpoint with injected latency.
+
+    Plain requests sleep ~latency then return one message. Streamed
+    requests (chat route) sleep ~latency before the first token, then
+    emit `tokens` SSE chunks `token_ms` apart.
+    """
+
+    def __init__(self, latency_ms: float, jitter_ms: float, tokens: int, token_ms: float):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens = tokens
+        self.token_ms = token_ms
+        self.calls = 0
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def _delay(self) -> float:
+        return max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                stub.calls += 1
+                time.sleep(stub._delay())
+
+                if body.get("stream"):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    for i in range(stub.tokens):
+                        chunk = {"choices": [{"delta": {"content": f"tok{i} "}}]}
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                        self.wfile.flush()
+                        time.sleep(stub.token_ms / 1000)
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.close_connection = True
+                    return
+
+                content = " ".join(f"tok{i}" for i in range(stub.tokens))
+                data = json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="llm-stub", daemon=True).start()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+# -----------------------------
+# Stage instrumentation (server side)
+# -----------------------------
+class StageTimer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {}
+
+    def record(self, stage: str, seconds: float):
+        with self.lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            samples = {k: list(v) for k, v in self.samples.items()}
+        return {stage: summarize(values) for stage, values in sorted(samples.items())}
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+
+
+STAGES = StageTimer()
+
+# module attribute → stage name
+SERVICE_STAGES = {
+    "enforce_rate_limit": "rate_limit",
+    "load_org_policy": "org_policy",
+    "explain_results": "explain",
+    "evaluate_policy": "policy",
+    "explain_with_llm": "llm_explain",
+    "to_sarif": "sarif",
+    "log_review_event": "audit_log",
+    "track_usage": "usage",
+    "render": "serialize",
+}
+CHAT_STAGES = {
+    "load_memory": "chat_memory_load",
+    "detect_intent": "chat_intent",
+    "build_context": "chat_context",
+    "save_message": "chat_memory_save",
+}
+
+
+def _timed(fn, stage: str):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            STAGES.record(stage, time.perf_counter() - start)
+    return wrapper
+
+
+class _TimedAnalyzer:
+    def __init__(self, inner):
+        self.inner = inner
+
+    def review_code(self, payload: dict):
+        start = time.perf_counter()
+        try:
+            return self.inner.review_code(payload)
+        finally:
+            STAGES.record("analysis", time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+def instrumented_app():
+    """
+    The service app with stage timers and a stats route. Also the
+    uvicorn factory: `uvicorn benchmarks.load_test:instrumented_app --factory`.
+    """
+    from services import wisdom_service
+    from services.routes import chat
+
+    if not isinstance(wisdom_service.analyzer, _TimedAnalyzer):
+        wisdom_service.analyzer = _TimedAnalyzer(wisdom_service.analyzer)
+        for module, stages in ((wisdom_service, SERVICE_STAGES), (chat, CHAT_STAGES)):
+            for attr, stage in stages.items():
+                setattr(module, attr, _timed(getattr(module, attr), stage))
+
+        app = wisdom_service.app
+        app.add_api_route(STAGES_PATH, STAGES.snapshot, methods=["GET"], include_in_schema=False)
+        app.add_api_route(STAGES_PATH, STAGES.reset, methods=["DELETE"], include_in_schema=False)
+
+    return wisdom_service.app
+
+
+def prepare_env(llm_url: Optional[str]):
+    """Environment the service reads at import time."""
+    # bypass the per-org daily limit; a load test is thousands of scans
+    os.environ["DEV_MODE"] = "true"
+    if llm_url:
+        os.environ["LLM_API_URL"] = llm_url
+        os.environ["LLM_API_KEY"] = "loadtest"
+    if not os.getenv("POLICY_PUBLIC_KEY"):
+        key = REPO_ROOT / "core" / "security" / "public.pem"
+        if key.exists():
+            os.environ["POLICY_PUBLIC_KEY"] = key.read_text()
+
+
+# -----------------------------
+# Clients
+# -----------------------------
+Result = Tuple[Optional[int], Optional[float], int, bytes]
+
+
+class AsgiClient:
+    """Calls the ASGI app directly; runs its lifespan like a server would."""
+
+    def __init__(self, app):
+        self.app = app
+        self.lifespan_task = None
+        self.lifespan_in: Optional[asyncio.Queue] = None
+        self.lifespan_out: Optional[asyncio.Queue] = None
+        self.state: Dict = {}
+
+    async def start(self):
+        self.lifespan_in, self.lifespan_out = asyncio.Queue(), asyncio.Queue()
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": self.state}
+        self.lifespan_task = asyncio.create_task(
+            self.app(scope, self.lifespan_in.get, self.lifespan_out.put)
+        )
+        await self.lifespan_in.put({"type": "lifespan.startup"})
+        message = await self.lifespan_out.get()
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"app startup failed: {message.get('message')}")
+
+    async def stop(self):
+        if self.lifespan_task is None:
+            return
+        await self.lifespan_in.put({"type": "lifespan.shutdown"})
+        await self.lifespan_out.get()
+        await self.lifespan_task
+
+    async def request(self, method: str, path: str, body: bytes, headers: Dict, keep_body: bool = False) -> Result:
+        path, _, query = path.partition("?")
+        raw_headers = [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+            "state": dict(self.state),
+        }
+
+        done = asyncio.Event()
+        received = False
+        status: Optional[int] = None
+        ttfb: Optional[float] = None
+        size = 0
+        chunks: List[bytes] = []
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status, ttfb, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                if ttfb is None:
+                    ttfb = time.perf_counter()
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if keep_body:
+                    chunks.append(chunk)
+                if not message.get("more_body", False):
+                    done.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            done.set()
+        return status, ttfb, size, b"".join(chunks)
+
+
+class HttpClient:
+    """Blocking requests on a thread pool; one Session per thread."""
+
+    def __init__(self, base_url: str, threads: int, timeout: float = 300):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix="loadtest")
+        self.local = threading.local()
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        self.executor.shutdown(wait=True)
+
+    def _session(self) -> requests.Session:
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = requests.Session()
+        return session
+
+    def _send(self, method: str, path: str, body: bytes, headers: Dict, keep_body: bool) -> Result:
+        ttfb = None
+        size = 0
+        chunks: List[bytes] = []
+        with self._session().request(
+            method, self.base_url + path, data=body or None, headers=headers,
+            stream=True, timeout=self.timeout,
+        ) as r:
+            for chunk in r.iter_content(64 * 1024):
+                if ttfb is None:
+                    ttfb = time.perf_counter()
+                size += len(chunk)
+                if keep_body:
+                    chunks.append(chunk)
+            return r.status_code, ttfb, size, b"".join(chunks)
+
+    async def request(self, method: str, path: str, body: bytes, headers: Dict, keep_body: bool = False) -> Result:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self._send, method, path, body, headers, keep_body,
+        )
+
+
+# -----------------------------
+# Workload
+# -----------------------------
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name == "batch":
+            raise ValueError("the service has no /review/batch endpoint; use review / review_compact / sarif")
+        if name not in ENDPOINTS:
+            raise ValueError(f"unknown endpoint {name!r}; choose from {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("empty workload mix")
+    return mix
+
+
+def source_sizes(n: int, median_kb: float, sigma: float, max_kb: float, seed: int) -> List[int]:
+    """Log-normal file sizes: most files small, a long tail of large ones."""
+    rng = random.Random(seed)
+    return [
+        int(min(max_kb, max(0.2, rng.lognormvariate(math.log(median_kb), sigma))) * 1024)
+        for _ in range(n)
+    ]
+
+
+class Workload:
+    def __init__(self, mix: Dict[str, float], sizes: List[int], api_key: str, seed: int):
+        self.names = list(mix)
+        self.weights = [mix[n] for n in self.names]
+        self.headers = {"content-type": "application/json", "x-api-key": api_key}
+
+        # bodies are encoded once; the driver only picks
+        self.code_bodies = []
+        for i, size in enumerate(sizes):
+            code = generate(CorpusSpec(functions=1, imports=8, target_bytes=size, seed=seed + i))
+            self.code_bodies.append(json.dumps({
+                "file": f"load_{i}.py", "language": "python", "code": code,
+            }).encode())
+
+        snippet = generate(CorpusSpec(functions=3, seed=seed))
+        self.chat_bodies = [
+            json.dumps({
+                "message": message,
+                "session_id": f"loadtest-{i}",
+                "code": snippet,
+                "file": "snippet.py",
+                "language": "python",
+            }).encode()
+            for i, message in enumerate(CHAT_MESSAGES * 4)
+        ]
+
+    def pick(self, rng: random.Random) -> Tuple[str, str, str, bytes]:
+        name = rng.choices(self.names, self.weights)[0]
+        method, path, kind = ENDPOINTS[name]
+        bodies = self.code_bodies if kind == "code" else self.chat_bodies
+        return name, method, path, rng.choice(bodies)
+
+
+def _is_error(status: Optional[int]) -> bool:
+    # 422 is the review's policy-fail verdict, not a failed request
+    return status is None or status >= 500 or (400 <= status < 500 and status != 422)
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+async def _one(client, workload: Workload, name: str, method: str, path: str, body: bytes, scheduled: float) -> Dict:
+    record = {"endpoint": name, "status": None, "error": None, "bytes": 0, "ttfb": None}
+    try:
+        status, ttfb, size, _ = await client.request(method, path, body, workload.headers)
+        record.update(status=status, bytes=size, ttfb=None if ttfb is None else ttfb - scheduled)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["latency"] = time.perf_counter() - scheduled
+    return record
+
+
+async def drive(client, workload: Workload, rps: float, duration: float, max_inflight: int, seed: int) -> Dict:
+    rng = random.Random(seed)
+    tasks: List[asyncio.Task] = []
+    inflight = 0
+    dropped = 0
+
+    def finished(_):
+        nonlocal inflight
+        inflight -= 1
+
+    start = time.perf_counter()
+    end = start + duration
+    scheduled = start
+    while True:
+        scheduled += rng.expovariate(rps)
+        if scheduled >= end:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if inflight >= max_inflight:
+            dropped += 1
+            continue
+
+        name, method, path, body = workload.pick(rng)
+        task = asyncio.create_task(_one(client, workload, name, method, path, body, scheduled))
+        inflight += 1
+        task.add_done_callback(finished)
+        tasks.append(task)
+
+    records = list(await asyncio.gather(*tasks))
+    return {"records": records, "dropped": dropped, "elapsed": time.perf_counter() - start}
+
+
+def report(run: Dict, stages: Optional[Dict], meta: Dict) -> Dict:
+    records = run["records"]
+    elapsed = run["elapsed"]
+
+    def block(rs: List[Dict]) -> Dict:
+        errors = sum(1 for r in rs if r["error"] or _is_error(r["status"]))
+        statuses: Dict[str, int] = {}
+        for r in rs:
+            key = str(r["status"]) if r["status"] is not None else "transport_error"
+            statuses[key] = statuses.get(key, 0) + 1
+        return {
+            "requests": len(rs),
+            "throughput_rps": round(len(rs) / elapsed, 3) if elapsed else None,
+            "errors": errors,
+            "error_rate": round(errors / len(rs), 4) if rs else 0.0,
+            "status": statuses,
+            "latency": summarize([r["latency"] for r in rs]),
+            "ttfb": summarize([r["ttfb"] for r in rs if r["ttfb"] is not None]),
+            "mean_response_bytes": int(sum(r["bytes"] for r in rs) / len(rs)) if rs else 0,
+        }
+
+    by_endpoint: Dict[str, List[Dict]] = {}
+    for r in records:
+        by_endpoint.setdefault(r["endpoint"], []).append(r)
+
+    overall = block(records)
+    overall["dropped"] = run["dropped"]
+    overall["elapsed_s"] = round(elapsed, 3)
+
+    sample_errors = sorted({r["error"] for r in records if r["error"]})[:10]
+
+    return {
+        "meta": meta,
+        "overall": overall,
+        "endpoints": {name: block(rs) for name, rs in sorted(by_endpoint.items())},
+        "stages": stages,
+        "sample_errors": sample_errors,
+    }
+
+
+# -----------------------------
+# Server setup
+# -----------------------------
+def make_workdir() -> Path:
+    """
+    Scratch cwd for the service: it writes usage/, logs/ and its chat
+    database relative to cwd, and reads core/org_policies from there.
+    """
+    workdir = Path(tempfile.mkdtemp(prefix="wisdom-load-"))
+    (workdir / "core").mkdir()
+    (workdir / "core" / "org_policies").symlink_to(REPO_ROOT / "core" / "org_policies")
+    return workdir
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _spawn_uvicorn(port: int, workdir: Path, log_path: Path) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    log = open(log_path, "wb")
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "benchmarks.load_test:instrumented_app",
+            "--factory", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    log.close()
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with {process.returncode}; see {log_path}")
+        try:
+            requests.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return process
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"uvicorn did not come up within 60s; see {log_path}")
+
+
+async def _wait_ready(client, timeout: float = 60):
+    """Until /ready is 200 (404: a server without a readiness probe)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status, _, _, _ = await client.request("GET", "/ready", b"", {})
+        if status in (200, 404):
+            return
+        await asyncio.sleep(0.05)
+    raise RuntimeError(f"service not ready within {timeout:.0f}s")
+
+
+async def _fetch_stages(client, method: str) -> Optional[Dict]:
+    status, _, _, body = await client.request(method, STAGES_PATH, b"", {}, keep_body=True)
+    if status != 200:
+        return None
+    return json.loads(body or b"null")
+
+
+async def run(args, mix: Dict[str, float], llm_url: Optional[str], workdir: Path, log_path: Path) -> Dict:
+    sizes = source_sizes(args.sources, args.size_median_kb, args.size_sigma, args.size_max_kb, args.seed)
+    workload = Workload(mix, sizes, args.api_key, args.seed)
+
+    process = None
+    if args.url:
+        client = HttpClient(args.url, args.max_inflight)
+    elif args.mode == "uvicorn":
+        port = args.port or _free_port()
+        process = _spawn_uvicorn(port, workdir, log_path)
+        client = HttpClient(f"http://127.0.0.1:{port}", args.max_inflight)
+    else:
+        client = AsgiClient(instrumented_app())
+
+    try:
+        await client.start()
+        # background warm-up must not overlap the measurement
+        await _wait_ready(client)
+
+        rng = random.Random(args.seed + 1)
+        for _ in range(args.warmup):
+            name, method, path, body = workload.pick(rng)
+            await client.request(method, path, body, workload.headers)
+        await _fetch_stages(client, "DELETE")
+
+        result = await drive(client, workload, args.rps, args.duration, args.max_inflight, args.seed)
+        stages = await _fetch_stages(client, "GET")
+        await client.stop()
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    meta = {
+        "mode": "external" if args.url else args.mode,
+        "target_rps": args.rps,
+        "duration_s": args.duration,
+        "max_inflight": args.max_inflight,
+        "mix": mix,
+        "sizes_kb": {
+            "median": args.size_median_kb,
+            "sigma": args.size_sigma,
+            "max": args.size_max_kb,
+            "sources": sorted(round(s / 1024, 1) for s in sizes),
+        },
+        "llm_stub": None if not llm_url else {
+            "latency_ms": args.llm_latency_ms,
+            "jitter_ms": args.llm_jitter_ms,
+            "tokens": args.llm_tokens,
+            "token_ms": args.llm_token_ms,
+        },
+        "workdir": None if args.url else str(workdir),
+        "python": sys.version.split()[0],
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+    }
+    return report(result, stages, meta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--url", default=None, help="load an already running server instead")
+    parser.add_argument("--port", type=int, default=0, help="uvicorn port (default: any free port)")
+    parser.add_argument("--api-key", default=DEFAULT_API_KEY)
+
+    parser.add_argument("--rps", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--warmup", type=int, default=5, help="requests before measuring")
+    parser.add_argument("--max-inflight", type=int, default=256, help="arrivals beyond this are dropped")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"endpoint=weight list from: {', '.join(ENDPOINTS)}")
+    parser.add_argument("--seed", type=int, default=0)
+
+    parser.add_argument("--sources", type=int, default=24, help="distinct review sources")
+    parser.add_argument("--size-median-kb", type=float, default=8.0)
+    parser.add_argument("--size-sigma", type=float, default=1.0, help="log-normal shape")
+    parser.add_argument("--size-max-kb", type=float, default=512.0)
+
+    parser.add_argument("--llm-latency-ms", type=float, default=600.0, help="stub time to first token")
+    parser.add_argument("--llm-jitter-ms", type=float, default=150.0)
+    parser.add_argument("--llm-tokens", type=int, default=40)
+    parser.add_argument("--llm-token-ms", type=float, default=10.0)
+
+    parser.add_argument("--output", default=None, help="write the JSON report here")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.rps <= 0:
+        parser.error("--rps must be positive")
+
+    stub = None
+    llm_url = None
+    if not args.url:
+        stub = LLMStub(args.llm_latency_ms, args.llm_jitter_ms, args.llm_tokens, args.llm_token_ms)
+        stub.start()
+        llm_url = stub.url
+        prepare_env(llm_url)
+
+    workdir = make_workdir()
+    log_path = workdir / "server.log"
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        # in-process the service logs every request to stdout
+        with open(log_path, "w") as log, contextlib.redirect_stdout(log):
+            result = asyncio.run(run(args, mix, llm_url, workdir, log_path))
+    finally:
+        os.chdir(cwd)
+        if stub is not None:
+            stub.stop()
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    overall = result["overall"]
+    print(
+        f"[load] {overall['requests']} requests, {overall['throughput_rps']} rps, "
+        f"p50={overall['latency'].get('p50_ms')}ms p99={overall['latency'].get('p99_ms')}ms "
+        f"errors={overall['error_rate']:.2%} dropped={overall['dropped']}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
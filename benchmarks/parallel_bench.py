@@ -0,0 +1,188 @@
+# benchmarks/parallel_bench.py
+"""
+Analyzer execution modes compared on the synthetic corpus.
+
+Modes:
+    serial        ReviewBrain, analyzers one after another
+    threads       ReviewBrain, one thread per analyzer over the shared
+                  tree (the default only on free-threaded builds;
+                  forced here, so GIL builds show the overhead)
+    chunked       threads, plus the file parsed in top-level chunks of
+                  --chunk-lines and chunk-local analyzers run per chunk
+                  (files of at least two chunks: --scale large / xlarge)
+    process_pool  AnalysisPool: whole reviews in worker processes
+
+Per mode: single-review latency (p50 of --repeat sequential reviews)
+and throughput (--requests reviews from --concurrency client
+threads). Every request uses a distinct source, so cross-request
+caches never turn a repeat into a hit. Findings of every mode are
+checked against serial.
+
+Usage:
+    python -m benchmarks.parallel_bench
+    python -m benchmarks.parallel_bench --scale large --threads 8 --workers 4 --concurrency 4
+    python -m benchmarks.parallel_bench --scale xlarge --modes serial,threads,chunked --chunk-lines 2000
+    python3.13t -m benchmarks.parallel_bench --output ft.json
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import platform
+import sys
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+from statistics import median
+from typing import Dict, List
+
+from benchmarks.corpus import SCALES, generate
+from core.cfg_builder import _CFG_CACHE
+from core.chunking import CHUNK_LINES
+from core.taint_engine import _SUMMARY_CACHE
+from services.analysis_pool import AnalysisPool
+from services.analysis_threads import gil_disabled
+from services.review_brain import ReviewBrain
+
+MODES = ("serial", "threads", "chunked", "process_pool")
+
+
+def _cold():
+    # in-process modes only; pool workers see distinct sources instead
+    _CFG_CACHE.clear()
+    _SUMMARY_CACHE.clear()
+
+
+def _digest(findings) -> str:
+    keys = [[f.rule_id, f.line, f.column, f.symbol] for f in findings]
+    return hashlib.sha256(json.dumps(keys).encode("utf-8")).hexdigest()
+
+
+def _sources(scale: str, count: int, offset: int) -> List[str]:
+    return [generate(replace(SCALES[scale], seed=offset + i)) for i in range(count)]
+
+
+def _payload(code: str) -> dict:
+    return {"code": code, "language": "python", "deadline": None}
+
+
+def _engine(mode: str, args):
+    if mode == "serial":
+        return ReviewBrain("0")
+    if mode == "threads":
+        return ReviewBrain(str(args.threads), chunk_lines=0)
+    if mode == "chunked":
+        return ReviewBrain(str(args.threads), chunk_lines=args.chunk_lines)
+    pool = AnalysisPool(args.workers)
+    pool.start()
+    return pool
+
+
+def run_mode(mode: str, args, latency_sources: List[str], load_sources: List[str]) -> Dict:
+    engine = _engine(mode, args)
+    try:
+        # one untimed review: pool worker start-up, executor threads
+        engine.review_code(_payload(generate(SCALES["small"])))
+
+        samples = []
+        digests = []
+        for code in latency_sources:
+            _cold()
+            start = time.perf_counter()
+            findings = engine.review_code(_payload(code))
+            samples.append(time.perf_counter() - start)
+            digests.append(_digest(findings))
+
+        _cold()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as clients:
+            for findings in clients.map(lambda c: engine.review_code(_payload(c)), load_sources):
+                digests.append(_digest(findings))
+        elapsed = time.perf_counter() - start
+    finally:
+        if isinstance(engine, AnalysisPool):
+            engine.shutdown()
+
+    return {
+        "p50_ms": round(median(samples) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2),
+        "reviews_per_sec": round(len(load_sources) / elapsed, 2),
+        "digests": digests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--threads", type=int, default=8, help="analyzer threads (threads mode)")
+    parser.add_argument("--chunk-lines", type=int, default=CHUNK_LINES or 5000, help="lines per chunk (chunked mode)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes (process_pool mode)")
+    parser.add_argument("--repeat", type=int, default=5, help="sequential reviews for latency")
+    parser.add_argument("--requests", type=int, default=16, help="reviews for throughput")
+    parser.add_argument("--concurrency", type=int, default=4, help="client threads for throughput")
+    parser.add_argument("--output", default=None, help="write the JSON report here")
+    args = parser.parse_args()
+
+    modes = [m for m in args.modes.split(",") if m]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+
+    latency_sources = _sources(args.scale, args.repeat, 1000)
+    load_sources = _sources(args.scale, args.requests, 2000)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        results = {}
+        for mode in modes:
+            results[mode] = run_mode(mode, args, latency_sources, load_sources)
+            print(
+                f"[parallel] {mode:<13} p50 {results[mode]['p50_ms']:>9.2f} ms  "
+                f"{results[mode]['reviews_per_sec']:>7.2f} reviews/s",
+                file=sys.stderr,
+            )
+
+    reference = (results.get("serial") or next(iter(results.values())))["digests"]
+    base = results.get("serial")
+    for r in results.values():
+        r["identical_to_serial"] = r["digests"] == reference
+        if base:
+            r["latency_speedup"] = round(base["p50_ms"] / r["p50_ms"], 2) if r["p50_ms"] else None
+            r["throughput_speedup"] = round(r["reviews_per_sec"] / base["reviews_per_sec"], 2)
+    for r in results.values():
+        del r["digests"]
+
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "free_threaded_build": bool(sysconfig.get_config_var("Py_GIL_DISABLED")),
+            "gil_disabled": gil_disabled(),
+            "scale": args.scale,
+            "threads": args.threads,
+            "chunk_lines": args.chunk_lines,
+            "workers": args.workers,
+            "concurrency": args.concurrency,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        },
+        "modes": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if not all(r["identical_to_serial"] for r in results.values()):
+        print("[parallel] findings differ between modes", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# benchmarks/replay.py
+"""
+Replay captured requests against the current engine.
+
+Reads capture archives (services/capture.py), re-runs each request
+through ReviewBrain + explain + policy and records findings and
+per-stage timings (median of --repeat runs). Writes the run as JSON,
+which later serves as --baseline for another engine version.
+
+Checks:
+- output: findings must match the capture (or --baseline) exactly
+- latency: with --baseline, a stage or request slower by more than
+  --tolerance (and above --min-ms) is a regression
+
+Exits 1 when output changed or latency regressed.
+
+Usage:
+    python -m benchmarks.replay captures/devsync --output v1.json
+    python -m benchmarks.replay captures/devsync --baseline v1.json --output v2.json
+"""
+import argparse
+import contextlib
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from statistics import median
+from typing import Dict, List, Optional
+
+from core.explain_engine import explain_results
+from core.policy_engine import evaluate_policy
+from services.capture import finding_key, findings_digest, iter_captures
+from services.review_brain import ReviewBrain
+
+
+def replay_one(brain: ReviewBrain, record: dict, repeat: int, deadline: Optional[float]) -> Dict:
+    samples: List[Dict[str, float]] = []
+    keys: List = []
+
+    for _ in range(repeat):
+        timings: Dict[str, float] = {}
+        payload = {
+            "code": record["code"],
+            "language": record.get("language") or "python",
+            "file": record.get("file"),
+            "scope": record.get("scope") or "file",
+            "taint": record.get("taint"),
+            "rules": record.get("rules"),
+            "select": record.get("select"),
+            "verdict_policy": record.get("verdict_policy"),
+            "deadline": deadline,
+            "timings": timings,
+        }
+
+        start = time.perf_counter()
+        findings = brain.review_code(payload)
+        timings["analysis"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        explained = explain_results(findings)
+        timings["explain"] = time.perf_counter() - start
+
+        # effective policy; v1 captures hold the request's (`version`)
+        policy = record.get("policy") or {}
+        start = time.perf_counter()
+        evaluate_policy(
+            explained,
+            policy_version=policy.get("policy_version", policy.get("version", "v1")),
+            profile=policy.get("profile", "balanced"),
+            warning_threshold=policy.get("warning_threshold", 5),
+        )
+        timings["policy"] = time.perf_counter() - start
+
+        samples.append(timings)
+        keys = [finding_key(f) for f in findings]
+
+    stages = sorted({stage for s in samples for stage in s})
+    return {
+        "id": record["id"],
+        "endpoint": record.get("endpoint"),
+        "bytes": record.get("bytes"),
+        "redactions": record.get("redactions", 0),
+        "findings": keys,
+        "digest": findings_digest(keys),
+        "timings_ms": {
+            stage: round(median(s.get(stage, 0.0) for s in samples) * 1000, 3)
+            for stage in stages
+        },
+    }
+
+
+def _partial(keys: List) -> bool:
+    # deadline-cut captures are not expected to reproduce exactly
+    return any(k[0] in ("ANALYSIS_TIMEOUT", "ANALYSIS_ABORTED") for k in keys)
+
+
+def diff_findings(expected: List, actual: List) -> Dict:
+    exp = [tuple(k) for k in expected]
+    act = [tuple(k) for k in actual]
+    exp_set, act_set = set(exp), set(act)
+    added = [list(k) for k in act if k not in exp_set]
+    removed = [list(k) for k in exp if k not in act_set]
+    return {"added": added[:20], "removed": removed[:20], "reordered": not added and not removed}
+
+
+def compare_output(runs: List[Dict], expected: Dict[str, List]) -> Dict:
+    identical = 0
+    skipped = 0
+    changed = []
+    for run in runs:
+        keys = expected.get(run["id"])
+        if keys is None:
+            continue
+        if _partial(keys) or _partial(run["findings"]):
+            skipped += 1
+            continue
+        if findings_digest(keys) == run["digest"]:
+            identical += 1
+            continue
+        change = {"id": run["id"], "redactions": run["redactions"]}
+        change.update(diff_findings(keys, run["findings"]))
+        changed.append(change)
+    return {"identical": identical, "changed": changed, "skipped_partial": skipped}
+
+
+def compare_timings(runs: List[Dict], baseline: Dict[str, Dict], tolerance: float, min_ms: float) -> Dict:
+    totals_base: Dict[str, float] = {}
+    totals_now: Dict[str, float] = {}
+    regressions = []
+
+    for run in runs:
+        base = baseline.get(run["id"])
+        if base is None:
+            continue
+        for stage, now_ms in run["timings_ms"].items():
+            base_ms = base["timings_ms"].get(stage)
+            if base_ms is None:
+                continue
+            totals_base[stage] = totals_base.get(stage, 0.0) + base_ms
+            totals_now[stage] = totals_now.get(stage, 0.0) + now_ms
+            if base_ms >= min_ms and now_ms > base_ms * (1 + tolerance):
+                regressions.append({
+                    "id": run["id"],
+                    "stage": stage,
+                    "baseline_ms": base_ms,
+                    "ms": now_ms,
+                    "ratio": round(now_ms / base_ms, 3),
+                })
+
+    stages = {}
+    for stage, base_total in sorted(totals_base.items()):
+        now_total = totals_now[stage]
+        stages[stage] = {
+            "baseline_ms": round(base_total, 3),
+            "ms": round(now_total, 3),
+            "ratio": round(now_total / base_total, 3) if base_total else None,
+        }
+        # aggregate regressions catch many small per-request slowdowns
+        if base_total >= min_ms and now_total > base_total * (1 + tolerance):
+            regressions.append({
+                "id": "*",
+                "stage": stage,
+                "baseline_ms": round(base_total, 3),
+                "ms": round(now_total, 3),
+                "ratio": stages[stage]["ratio"],
+            })
+
+    return {"stages": stages, "regressions": regressions}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("archives", nargs="+", help="capture files or directories")
+    parser.add_argument("--baseline", default=None, help="earlier replay output to compare against")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--deadline", type=float, default=None, help="review deadline (default: none)")
+    parser.add_argument("--limit", type=int, default=0, help="replay at most this many requests")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=5.0, help="ignore stages faster than this")
+    parser.add_argument("--output", default=None, help="write the run / report JSON here")
+    args = parser.parse_args()
+
+    runs: List[Dict] = []
+    captured: Dict[str, List] = {}
+    missing_source = 0
+
+    with contextlib.redirect_stdout(sys.stderr):
+        brain = ReviewBrain()
+        for record in iter_captures(args.archives):
+            if args.limit and len(runs) >= args.limit:
+                break
+            if record.get("code") is None:
+                missing_source += 1
+                continue
+            captured[record["id"]] = record["result"]["findings"]
+            runs.append(replay_one(brain, record, max(1, args.repeat), args.deadline))
+
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "deadline": args.deadline,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        },
+        "requests": len(runs),
+        "missing_source": missing_source,
+        "runs": runs,
+        "output_vs_capture": compare_output(runs, captured),
+    }
+
+    failed = bool(report["output_vs_capture"]["changed"])
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {r["id"]: r for r in json.load(f)["runs"]}
+        report["output_vs_baseline"] = compare_output(runs, {i: r["findings"] for i, r in baseline.items()})
+        report["timing_vs_baseline"] = compare_timings(runs, baseline, args.tolerance, args.min_ms)
+        failed = failed or bool(report["output_vs_baseline"]["changed"])
+        failed = failed or bool(report["timing_vs_baseline"]["regressions"])
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    out = report["output_vs_capture"]
+    print(
+        f"[replay] {len(runs)} requests: {out['identical']} identical, "
+        f"{len(out['changed'])} changed, {out['skipped_partial']} partial",
+        file=sys.stderr,
+    )
+    if args.baseline:
+        for r in report["timing_vs_baseline"]["regressions"]:
+            print(
+                f"[replay] SLOWER {r['id']} {r['stage']}: {r['baseline_ms']}ms -> {r['ms']}ms (x{r['ratio']})",
+                file=sys.stderr,
+            )
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/serialization_bench.py
+"""
+Serialization share of /review latency for large inputs.
+
+Usage:
+    python -m benchmarks.serialization_bench --size-mb 1 --repeat 5
+"""
+import argparse
+import json
+import time
+from statistics import median
+
+from core.explain_engine import explain_results
+from services.review_brain import ReviewBrain
+from services import serialization
+
+
+FUNCTION_TEMPLATE = '''
+def handler_{i}(a, b, c):
+    unused_{i} = a + b
+    if a and b or c:
+        for k in range(c):
+            print(missing_{i})
+    return a
+'''
+
+
+def make_source(size_bytes: int) -> str:
+    parts = ["import os\nimport sys\n"]
+    total = len(parts[0])
+    i = 0
+    while total < size_bytes:
+        chunk = FUNCTION_TEMPLATE.format(i=i)
+        parts.append(chunk)
+        total += len(chunk)
+        i += 1
+    return "".join(parts)
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return median(samples) * 1000
+
+
+def run(size_mb: float, repeat: int) -> dict:
+    code = make_source(int(size_mb * 1024 * 1024))
+    body = json.dumps({"file": "bench.py", "language": "python", "code": code})
+    brain = ReviewBrain()
+
+    raw = brain.review_code({"code": code, "language": "python"})
+    explained = explain_results(raw)
+    response = {"success": True, "issues": explained}
+
+    stages = {
+        "request_decode_json": _time(lambda: json.loads(body), repeat),
+        "analysis": _time(lambda: brain.review_code({"code": code, "language": "python"}), repeat),
+        "explain": _time(lambda: explain_results(raw), repeat),
+        "encode_stdlib_json": _time(
+            lambda: json.dumps(response, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            repeat,
+        ),
+    }
+
+    if serialization.orjson is not None:
+        stages["request_decode_orjson"] = _time(lambda: serialization.orjson.loads(body), repeat)
+        stages["encode_orjson"] = _time(lambda: serialization.dumps_json(response), repeat)
+
+    if serialization.msgpack is not None:
+        stages["encode_msgpack"] = _time(lambda: serialization.dumps_msgpack(response), repeat)
+
+    core_ms = stages["analysis"] + stages["explain"]
+    share = {
+        name: round(ms / (core_ms + ms), 4)
+        for name, ms in stages.items()
+        if name.startswith("encode_") or name.startswith("request_decode_")
+    }
+
+    return {
+        "input_bytes": len(code),
+        "finding_count": len(explained),
+        "repeat": repeat,
+        "median_ms": {k: round(v, 3) for k, v in stages.items()},
+        "serialization_share": share,
+        "payload_bytes": {
+            "json": len(serialization.dumps_json(response)),
+            **(
+                {"msgpack": len(serialization.dumps_msgpack(response))}
+                if serialization.msgpack is not None else {}
+            ),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.size_mb, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
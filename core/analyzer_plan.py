@@ -0,0 +1,170 @@
+# core/analyzer_plan.py
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.ast_analyzer import BUILTIN_RULES
+from core.rule_dsl import rule_specs
+
+# Review order (see services/review_brain.py)
+ANALYZERS = (
+    "ast", "structure", "complexity", "cfg", "dfg", "taint", "resources", "architecture",
+)
+
+# rule_id → category of everything each engine can report. The AST
+# analyzer's rules come from its rule set (built-ins + org "rules")
+# instead. A rule missing here is never planned for: keep in step
+# with the engines.
+ANALYZER_RULES: Dict[str, Dict[str, str]] = {
+    "structure": {
+        "STRUCT_LARGE_FUNCTION": "maintainability",
+        "STRUCT_DEEP_NESTING": "maintainability",
+    },
+    "complexity": {
+        "COMPLEXITY_CYCLOMATIC_HIGH": "maintainability",
+        "COMPLEXITY_CYCLOMATIC_MODERATE": "maintainability",
+        "DESIGN_TOO_MANY_PARAMETERS": "design",
+        "DESIGN_MANY_PARAMETERS": "design",
+        "STRUCT_VERY_LARGE_FUNCTION": "maintainability",
+    },
+    "cfg": {
+        "CFG_DEAD_AFTER_RETURN": "logic",
+        "CFG_DEAD_AFTER_RAISE": "logic",
+        "CFG_DEAD_BRANCH_LITERAL": "logic",
+        "CFG_INFINITE_LOOP_CONFIRMED": "logic",
+    },
+    "dfg": {
+        "DFG_USE_BEFORE_ASSIGN": "logic",
+        "DFG_UNUSED_VARIABLE": "maintainability",
+    },
+    "taint": {
+        "TAINT_SINK_REACHED": "security",
+    },
+    "resources": {
+        "RESOURCE_FILE_NOT_CLOSED": "resource",
+    },
+    "architecture": {
+        "ARCH_UNUSED_IMPORT": "architecture",
+        "ARCH_GOD_MODULE": "architecture",
+        "ARCH_IMPORT_CYCLE": "architecture",
+        "ARCH_LAYER_VIOLATION": "architecture",
+        "ARCH_DEPENDENCY_HOTSPOT": "architecture",
+    },
+}
+
+PREFILTER_RULE = ("REGEX_DESTRUCTIVE_COMMAND", "security")
+
+# Findings about the analysis itself: reported whatever the selection
+ALWAYS_REPORTED = {
+    "AST_SYNTAX_ERROR", "ANALYSIS_TIMEOUT", "ANALYSIS_DEPTH_LIMIT", "ANALYSIS_SHORT_CIRCUIT",
+    "POLICY_RULES_INVALID", "CLEAN_CODE",
+}
+
+
+def _names(value) -> Optional[Tuple[str, ...]]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = [value]
+    return tuple(str(v).strip() for v in value if str(v).strip())
+
+
+@dataclass(frozen=True)
+class RuleFilter:
+    """
+    One rule selection: rule ids (fnmatch patterns, `TAINT_*`) and / or
+    categories. A rule is selected when it matches either list.
+    """
+
+    rules: Optional[Tuple[str, ...]] = None
+    categories: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def from_spec(cls, spec: Optional[dict]) -> Optional["RuleFilter"]:
+        """From a `{"rules": [...], "categories": [...]}` block; None selects everything."""
+        if not spec:
+            return None
+        rules = _names(spec.get("rules"))
+        categories = _names(spec.get("categories"))
+        if rules is None and categories is None:
+            return None
+        return cls(rules, tuple(c.lower() for c in categories) if categories is not None else None)
+
+    def selects(self, rule_id: str, category: str) -> bool:
+        if self.categories and category.lower() in self.categories:
+            return True
+        return any(fnmatchcase(rule_id, pattern) for pattern in self.rules or ())
+
+    def to_dict(self) -> dict:
+        return {
+            "rules": list(self.rules) if self.rules is not None else None,
+            "categories": list(self.categories) if self.categories is not None else None,
+        }
+
+
+@dataclass(frozen=True)
+class AnalyzerPlan:
+    """
+    What one review runs. `analyzers` in review order; `ast_rules`
+    the AST rule ids to compile (None: all). With several filters
+    (org policy, then request) a rule must pass every one, so a
+    request can narrow the org's selection but never widen it.
+    """
+
+    filters: Tuple[RuleFilter, ...]
+    analyzers: Tuple[str, ...]
+    ast_rules: Optional[Tuple[str, ...]]
+    prefilter: bool
+
+    @property
+    def complete(self) -> bool:
+        return not self.filters
+
+    def selects(self, rule_id: str, category: str) -> bool:
+        if rule_id in ALWAYS_REPORTED:
+            return True
+        return all(f.selects(rule_id, category) for f in self.filters)
+
+    def describe(self) -> dict:
+        """Response metadata."""
+        return {
+            "filtered": not self.complete,
+            "filters": [f.to_dict() for f in self.filters],
+            "analyzers": list(self.analyzers),
+            "skipped": [a for a in ANALYZERS if a not in self.analyzers],
+            "ast_rules": len(self.ast_rules) if self.ast_rules is not None else None,
+            "prefilter": self.prefilter,
+        }
+
+
+def plan_analysis(
+    selections: Optional[Sequence[Optional[dict]]] = None,
+    org_rules: Optional[Sequence[dict]] = None,
+) -> AnalyzerPlan:
+    """
+    Resolve rule selections (org policy "select" block, request
+    `rules` / `categories`) into the analyzers and AST rules that can
+    produce a selected finding. No selection: everything runs.
+
+    The AST analyzer always runs (it reports syntax errors); with no
+    selected AST rules its rule walk is skipped.
+    """
+    filters = tuple(f for f in map(RuleFilter.from_spec, selections or ()) if f is not None)
+    if not filters:
+        return AnalyzerPlan((), ANALYZERS, None, True)
+
+    def selected(rule_id: str, category: str) -> bool:
+        return all(f.selects(rule_id, category) for f in filters)
+
+    ast_rules = tuple(
+        spec.get("id")
+        for spec in BUILTIN_RULES + rule_specs(org_rules)
+        if isinstance(spec, dict) and selected(spec.get("id") or "", spec.get("category", "policy"))
+    )
+
+    analyzers: List[str] = ["ast"]
+    for name in ANALYZERS[1:]:
+        if any(selected(rule_id, category) for rule_id, category in ANALYZER_RULES[name].items()):
+            analyzers.append(name)
+
+    return AnalyzerPlan(filters, tuple(analyzers), ast_rules, selected(*PREFILTER_RULE))
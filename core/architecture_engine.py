@@ -1,25 +1,31 @@
 #core/architecture_engine.py
 import ast
-from typing import List, Dict, Set
-
-
-def _issue(
-    rule_id: str,
-    severity: str,
-    category: str,
-    message: str,
-    confidence: str = "medium",
-) -> Dict:
-    return {
-        "rule_id": rule_id,
-        "severity": severity,
-        "category": category,
-        "message": message,
-        "confidence": confidence,
-    }
-
-
-class ArchitectureVisitor(ast.NodeVisitor):
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.deadline import CancellableVisitor
+from core.file_context import FileContext
+from core.finding import Finding
+from core.flat_ast import FlatTree
+from core.project_graph import ModuleGraph
+from core.project_index import ProjectIndex
+from core.symbol_table import IMPORTED, Symbol, SymbolTable
+
+IO_MODULES = {"os", "subprocess"}
+
+HOTSPOT_FAN_IN = 50
+HOTSPOT_FAN_OUT = 10
+
+
+def _unused_import_message(sym: Symbol) -> str:
+    if sym.imported_from is not None:
+        # from-imported names are plain identifiers
+        name = sym.qualified.rpartition(".")[2]
+        return f"Imported name '{name}' from '{sym.imported_from}' is never used."
+    return f"Imported module '{sym.qualified or sym.name}' is never used."
+
+
+class ArchitectureVisitor(CancellableVisitor):
     """
     Phase D.2 + D.3 — Architecture Intelligence (Single-file, Conservative)
 
@@ -30,14 +36,17 @@ class ArchitectureVisitor(ast.NodeVisitor):
     D.3:
     - God module (aggregated)
     - Mixed concerns
+
+    Import usage is read from the symbol table: an import is used when
+    any load resolves to its binding (`import numpy as np` → `np.x`).
     """
 
-    def __init__(self):
-        self.issues: List[Dict] = []
+    def __init__(self, symbols: SymbolTable, reexported: Set[str] = frozenset()):
+        self.issues: List[Finding] = []
+        self.symbols = symbols
 
-        # D.2 tracking
-        self.imports: Set[str] = set()
-        self.used_names: Set[str] = set()
+        # names other project modules import from this one
+        self.reexported = reexported
 
         # D.3 metrics
         self.import_count = 0
@@ -51,24 +60,14 @@ class ArchitectureVisitor(ast.NodeVisitor):
     # Imports
     # -----------------------------
     def visit_Import(self, node: ast.Import):
-        for alias in node.names:
-            self.imports.add(alias.name.split(".")[0])
-            self.import_count += 1
+        self.import_count += len(node.names)
         self.generic_visit(node)
 
     def visit_ImportFrom(self, node: ast.ImportFrom):
         if node.module:
-            self.imports.add(node.module.split(".")[0])
             self.import_count += 1
         self.generic_visit(node)
 
-    # -----------------------------
-    # Usage tracking
-    # -----------------------------
-    def visit_Name(self, node: ast.Name):
-        self.used_names.add(node.id)
-        self.generic_visit(node)
-
     # -----------------------------
     # Structure / logic
     # -----------------------------
@@ -94,33 +93,59 @@ class ArchitectureVisitor(ast.NodeVisitor):
         self.generic_visit(node)
 
     def visit_Call(self, node: ast.Call):
-        if isinstance(node.func, ast.Name) and node.func.id == "open":
+        if self.is_io(node):
             self.has_io = True
 
-        if isinstance(node.func, ast.Attribute):
-            if isinstance(node.func.value, ast.Name):
-                if node.func.value.id in {"os", "subprocess"}:
-                    self.has_io = True
-
         self.generic_visit(node)
 
+    def is_io(self, node: ast.Call) -> bool:
+        name = self.symbols.qualified_name(node.func)
+        if name == "open":
+            return True
+        return bool(name) and name.count(".") == 1 and name.split(".")[0] in IO_MODULES
+
+    # -----------------------------
+    # Same counters from the flat arrays (no tree walk)
+    # -----------------------------
+    def count_flat(self, flat: FlatTree):
+        self.import_count = int(flat.child_count[flat.rows_of((ast.Import,))].sum())
+        self.import_count += sum(
+            1 for row in flat.rows_of((ast.ImportFrom,)).tolist() if flat.nodes[row].module
+        )
+        self.func_count = len(flat.rows_of((ast.FunctionDef,)))
+        self.class_count = len(flat.rows_of((ast.ClassDef,)))
+        self.has_logic = bool(flat.is_any((ast.FunctionDef, ast.If, ast.For, ast.While)).any())
+
+        # one IO call settles it
+        for row in flat.rows_of((ast.Call,)).tolist():
+            self.deadline.tick()
+            if self.is_io(flat.nodes[row]):
+                self.has_io = True
+                break
+
     # -----------------------------
     # Module boundary (D.2 + D.3)
     # -----------------------------
     def visit_Module(self, node: ast.Module):
         self.generic_visit(node)
+        self.report()
 
+    def report(self):
         # ---- D.2: Unused imports
-        for name in self.imports:
-            if name not in self.used_names:
-                self.issues.append(
-                    _issue(
-                        "ARCH_UNUSED_IMPORT",
-                        "warning",
-                        "architecture",
-                        f"Imported module '{name}' is never used.",
+        for scope in self.symbols.scopes:
+            for sym in scope.symbols.values():
+                if sym.flags & IMPORTED and not sym.uses:
+                    if scope.kind == "module" and sym.name in self.reexported:
+                        continue
+                    self.issues.append(
+                        Finding(
+                            "ARCH_UNUSED_IMPORT",
+                            "warning",
+                            "architecture",
+                            _unused_import_message(sym),
+                            symbol=sym.name,
+                        )
                     )
-                )
 
         # ---- D.3 aggregation
         top_level_defs = self.func_count + self.class_count
@@ -136,7 +161,7 @@ class ArchitectureVisitor(ast.NodeVisitor):
 
         if signals >= 2:
             self.issues.append(
-                _issue(
+                Finding(
                     "ARCH_GOD_MODULE",
                     "warning",
                     "architecture",
@@ -145,12 +170,177 @@ class ArchitectureVisitor(ast.NodeVisitor):
             )
 
 
-def analyze_architecture(code: str) -> List[Dict]:
-    try:
-        tree = ast.parse(code)
-    except SyntaxError:
+def analyze_architecture(
+    code: str,
+    ctx: Optional[FileContext] = None,
+    project: Optional[ProjectIndex] = None,
+    module: Optional[str] = None,
+) -> List[Finding]:
+    ctx = ctx or FileContext(code)
+    if ctx.tree is None:
         return []
 
-    visitor = ArchitectureVisitor()
-    visitor.visit(tree)
+    # With a project index, imports re-exported to other modules are used
+    reexported = project.imported_names(module) if project and module else frozenset()
+
+    visitor = ArchitectureVisitor(ctx.symbols, reexported)
+    visitor.deadline = ctx.deadline
+    if ctx.flat is not None:
+        visitor.count_flat(ctx.flat)
+        visitor.report()
+    else:
+        visitor.visit(ctx.tree)
     return visitor.issues
+
+
+# -----------------------------
+# Phase D.4 — Project-wide rules (ProjectIndex graph)
+# -----------------------------
+class ProjectRules:
+    """
+    Repository-level architecture rules:
+    - import cycles (strongly connected components)
+    - forbidden layer dependencies from org policy
+    - hotspots: modules with both high fan-in and high fan-out, so
+      changes ripple through them in both directions
+
+    Org policy block (layers listed top → bottom; a layer may import
+    itself and layers below it, never those above):
+
+        "architecture": {
+          "layers": [
+            {"name": "api", "modules": ["services"]},
+            {"name": "core", "modules": ["core"]}
+          ],
+          "forbidden": [{"from": "core", "to": "api"}],
+          "hotspot_fan_in": 50,
+          "hotspot_fan_out": 10
+        }
+    """
+
+    def __init__(self, index: ProjectIndex, config: Optional[dict] = None):
+        config = config or {}
+        self.index = index
+        self.graph = ModuleGraph.from_index(index)
+        self.issues: Dict[str, List[Finding]] = {}
+
+        self.layers = config.get("layers") or []
+        self.layer_names = [layer["name"] for layer in self.layers]
+        self.forbidden: Set[Tuple[int, int]] = set()
+        positions = {name: i for i, name in enumerate(self.layer_names)}
+        for rule in config.get("forbidden") or []:
+            if rule.get("from") in positions and rule.get("to") in positions:
+                self.forbidden.add((positions[rule["from"]], positions[rule["to"]]))
+
+        self.fan_in_limit = config.get("hotspot_fan_in", HOTSPOT_FAN_IN)
+        self.fan_out_limit = config.get("hotspot_fan_out", HOTSPOT_FAN_OUT)
+
+    def run(self) -> Dict[str, List[Finding]]:
+        self.check_cycles()
+        if self.layers:
+            self.check_layers()
+        self.check_hotspots()
+        return {path: self.issues[path] for path in sorted(self.issues)}
+
+    def _add(self, module: str, finding: Finding):
+        self.issues.setdefault(self.index.modules[module].path, []).append(finding)
+
+    def _import_line(self, importer: str, imported: str) -> Optional[int]:
+        for imp in self.index.modules[importer].imports:
+            if imported in self.index.resolve(imp):
+                return imp.line
+        return None
+
+    # -----------------------------
+    # Import cycles
+    # -----------------------------
+    def check_cycles(self):
+        names = self.graph.names
+
+        for component in self.graph.strongly_connected():
+            if len(component) < 2:
+                continue
+
+            start = min(component, key=lambda v: names[v])
+            cycle = self.graph.cycle_through(start, set(component))
+            path = " → ".join(names[v] for v in cycle)
+            extra = f" ({len(component)} modules in the cycle group)" if len(component) > len(cycle) - 1 else ""
+
+            finding = Finding(
+                "ARCH_IMPORT_CYCLE",
+                "warning",
+                "architecture",
+                f"Import cycle: {path}{extra}.",
+                "high",
+                symbol=names[start],
+                line=self._import_line(names[start], names[cycle[1]]),
+            )
+            self._add(names[start], finding)
+
+    # -----------------------------
+    # Layering
+    # -----------------------------
+    def _layer_ids(self) -> array:
+        prefixes: Dict[str, int] = {}
+        for i, layer in enumerate(self.layers):
+            for prefix in layer.get("modules", []):
+                prefixes.setdefault(prefix, i)
+
+        # longest matching dotted prefix
+        layer_of = array("i", [-1]) * len(self.graph)
+        for v, name in enumerate(self.graph.names):
+            parts = name.split(".")
+            for end in range(len(parts), 0, -1):
+                hit = prefixes.get(".".join(parts[:end]))
+                if hit is not None:
+                    layer_of[v] = hit
+                    break
+        return layer_of
+
+    def check_layers(self):
+        layer_of = self._layer_ids()
+        names = self.graph.names
+        offsets, targets = self.graph.offsets, self.graph.targets
+
+        for v in range(len(names)):
+            lv = layer_of[v]
+            if lv < 0:
+                continue
+            for i in range(offsets[v], offsets[v + 1]):
+                lw = layer_of[targets[i]]
+                if lw < 0 or lw == lv:
+                    continue
+                if lw < lv or (lv, lw) in self.forbidden:
+                    w = targets[i]
+                    self._add(names[v], Finding(
+                        "ARCH_LAYER_VIOLATION",
+                        "error",
+                        "architecture",
+                        f"Module '{names[v]}' (layer '{self.layer_names[lv]}') must not import "
+                        f"'{names[w]}' (layer '{self.layer_names[lw]}').",
+                        "high",
+                        symbol=names[w],
+                        line=self._import_line(names[v], names[w]),
+                    ))
+
+    # -----------------------------
+    # Hotspots
+    # -----------------------------
+    def check_hotspots(self):
+        names = self.graph.names
+        for v in range(len(names)):
+            fan_in = self.graph.fan_in(v)
+            fan_out = self.graph.fan_out(v)
+            if fan_in >= self.fan_in_limit and fan_out >= self.fan_out_limit:
+                self._add(names[v], Finding(
+                    "ARCH_DEPENDENCY_HOTSPOT",
+                    "warning",
+                    "architecture",
+                    f"Module '{names[v]}' is a dependency hotspot (fan-in {fan_in}, fan-out {fan_out}).",
+                    symbol=names[v],
+                ))
+
+
+def analyze_project(index: ProjectIndex, config: Optional[dict] = None) -> Dict[str, List[Finding]]:
+    """Project-wide architecture findings, grouped by file path."""
+    return ProjectRules(index, config).run()
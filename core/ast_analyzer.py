@@ -1,147 +1,130 @@
 #   core/ast_analyzer.py
-import ast
-from typing import List, Dict
+from typing import Collection, List, Optional, Sequence, Tuple
 
+from core.file_context import FileContext
+from core.finding import Finding
+from core.rule_dsl import RuleSet, RuleSpecError, compile_rules, rule_specs
 
-def _issue(
-    rule_id: str,
-    severity: str,
-    category: str,
-    message: str,
-    confidence: str = "high",
-) -> Dict:
-    return {
-        "rule_id": rule_id,
-        "severity": severity,
-        "category": category,
-        "message": message,
-        "confidence": confidence,
-    }
+# Built-in AST rules, in the same declarative format org policies use
+# (see core/rule_dsl.py). Compiled once into node-type dispatch tables.
+BUILTIN_RULES = [
+    {
+        "id": "AST_INFINITE_LOOP",
+        "node": "While",
+        "fields": {"test": {"const": True}},
+        "subtree": {"has_break": False},
+        "severity": "warning",
+        "category": "performance",
+        "message": "Possible infinite loop detected: 'while True' without break.",
+        "confidence": "high",
+    },
+    {
+        "id": "AST_BARE_EXCEPT",
+        "node": "ExceptHandler",
+        "fields": {"type": {"is": None}},
+        "severity": "warning",
+        "category": "bug",
+        "message": "Bare except detected. This catches SystemExit, KeyboardInterrupt, etc.",
+        "confidence": "high",
+    },
+    {
+        "id": "AST_EMPTY_EXCEPT",
+        "node": "ExceptHandler",
+        "fields": {"type": {"present": True}, "body": {"only": "Pass"}},
+        "severity": "warning",
+        "category": "bug",
+        "message": "Empty except block detected. Exception is silently ignored.",
+        "confidence": "medium",
+    },
+    {
+        "id": "AST_EVAL_EXECUTION",
+        "call": "eval",
+        "severity": "error",
+        "category": "security",
+        "message": "Use of eval() detected. This allows arbitrary code execution.",
+        "confidence": "high",
+    },
+    {
+        "id": "AST_EXEC_EXECUTION",
+        "call": "exec",
+        "severity": "error",
+        "category": "security",
+        "message": "Use of exec() detected. This allows arbitrary code execution.",
+        "confidence": "high",
+    },
+    {
+        "id": "AST_OS_SYSTEM",
+        "call": "os.system",
+        "severity": "error",
+        "category": "security",
+        "message": "Use of os.system() detected. This executes shell commands.",
+        "confidence": "high",
+    },
+    {
+        "id": "AST_SUBPROCESS_CALL",
+        "call": "subprocess.*",
+        "severity": "error",
+        "category": "security",
+        "message": "Use of subprocess detected. This can execute external commands.",
+        "confidence": "high",
+    },
+    {
+        "id": "AST_FILE_WRITE",
+        "call": "open",
+        "min_args": 2,
+        "args": {"1": {"contains": ["w", "a", "+"]}},
+        "severity": "warning",
+        "category": "security",
+        "message": "File write operation detected. This can overwrite or modify files.",
+        "confidence": "medium",
+    },
+]
 
 
-def analyze_python_ast(code: str) -> List[Dict]:
-    issues: List[Dict] = []
+def rules_for_policy(
+    org_rules: Optional[Sequence[dict]] = None,
+    selected: Optional[Collection[str]] = None,
+) -> RuleSet:
+    """
+    Built-in rules plus an org policy's "rules" block (cached by hash);
+    only the `selected` rule ids when given (see core/analyzer_plan.py).
+    """
+    specs = BUILTIN_RULES + rule_specs(org_rules)
+    if selected is not None:
+        selected = set(selected)
+        specs = [spec for spec in specs if spec.get("id") in selected]
+    return compile_rules(specs)
 
+
+def valid_org_rules(org_rules) -> Tuple[Optional[Sequence[dict]], Optional[RuleSpecError]]:
+    """
+    (org_rules, None) when the block compiles (cached), else (None,
+    error): a malformed block is reported and only the built-ins run.
+    """
     try:
-        tree = ast.parse(code)
-    except SyntaxError as e:
+        rules_for_policy(org_rules)
+    except RuleSpecError as e:
+        return None, e
+    return org_rules, None
+
+
+def analyze_python_ast(
+    code: str,
+    ctx: Optional[FileContext] = None,
+    rules: Optional[RuleSet] = None,
+) -> List[Finding]:
+    ctx = ctx or FileContext(code)
+    if ctx.tree is None:
+        e = ctx.syntax_error
         return [
-            _issue(
+            Finding(
                 rule_id="AST_SYNTAX_ERROR",
                 severity="error",
                 category="syntax",
-                message=f"Syntax error: {e.msg} (line {e.lineno})",
+                message=f"Syntax error: {e.msg}" + (f" (line {e.lineno})" if e.lineno else ""),
                 confidence="high",
             )
         ]
 
-    for node in ast.walk(tree):
-
-        # Infinite loop
-        if isinstance(node, ast.While):
-            if isinstance(node.test, ast.Constant) and node.test.value is True:
-                has_break = any(isinstance(n, ast.Break) for n in ast.walk(node))
-                if not has_break:
-                    issues.append(
-                        _issue(
-                            "AST_INFINITE_LOOP",
-                            "warning",
-                            "performance",
-                            "Possible infinite loop detected: 'while True' without break.",
-                            "high",
-                        )
-                    )
-
-        # Bare / empty except
-        if isinstance(node, ast.ExceptHandler):
-            if node.type is None:
-                issues.append(
-                    _issue(
-                        "AST_BARE_EXCEPT",
-                        "warning",
-                        "bug",
-                        "Bare except detected. This catches SystemExit, KeyboardInterrupt, etc.",
-                        "high",
-                    )
-                )
-            elif len(node.body) == 1 and isinstance(node.body[0], ast.Pass):
-                issues.append(
-                    _issue(
-                        "AST_EMPTY_EXCEPT",
-                        "warning",
-                        "bug",
-                        "Empty except block detected. Exception is silently ignored.",
-                        "medium",
-                    )
-                )
-
-        # eval / exec
-        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-            if node.func.id == "eval":
-                issues.append(
-                    _issue(
-                        "AST_EVAL_EXECUTION",
-                        "error",
-                        "security",
-                        "Use of eval() detected. This allows arbitrary code execution.",
-                        "high",
-                    )
-                )
-            if node.func.id == "exec":
-                issues.append(
-                    _issue(
-                        "AST_EXEC_EXECUTION",
-                        "error",
-                        "security",
-                        "Use of exec() detected. This allows arbitrary code execution.",
-                        "high",
-                    )
-                )
-
-        # os.system
-        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
-            if (
-                isinstance(node.func.value, ast.Name)
-                and node.func.value.id == "os"
-                and node.func.attr == "system"
-            ):
-                issues.append(
-                    _issue(
-                        "AST_OS_SYSTEM",
-                        "error",
-                        "security",
-                        "Use of os.system() detected. This executes shell commands.",
-                        "high",
-                    )
-                )
-
-        # subprocess.*
-        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
-            if isinstance(node.func.value, ast.Name) and node.func.value.id == "subprocess":
-                issues.append(
-                    _issue(
-                        "AST_SUBPROCESS_CALL",
-                        "error",
-                        "security",
-                        "Use of subprocess detected. This can execute external commands.",
-                        "high",
-                    )
-                )
-
-        # File writes
-        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-            if node.func.id == "open" and len(node.args) >= 2:
-                mode_node = node.args[1]
-                if isinstance(mode_node, ast.Constant) and isinstance(mode_node.value, str):
-                    if any(m in mode_node.value for m in ["w", "a", "+"]):
-                        issues.append(
-                            _issue(
-                                "AST_FILE_WRITE",
-                                "warning",
-                                "security",
-                                "File write operation detected. This can overwrite or modify files.",
-                                "medium",
-                            )
-                        )
-
-    return issues
+    # One walk, one dict hit per node — independent of rule count
+    return (rules if rules is not None else rules_for_policy()).run(ctx)
@@ -0,0 +1,105 @@
+# core/ast_summary.py
+import ast
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from core.deadline import NO_DEADLINE, Deadline
+
+# Same node sets the rules have always used
+DECISION_NODES = (ast.If, ast.For, ast.While, ast.Try, ast.ExceptHandler)
+BLOCK_NODES = (ast.If, ast.For, ast.While, ast.Try, ast.With)
+
+_BREAK = 1
+_RETURN = 2
+_RAISE = 4
+
+
+@dataclass(slots=True)
+class NodeSummary:
+    """
+    Facts about a statement's whole subtree (the statement included).
+    """
+
+    has_break: bool
+    has_return: bool
+    has_raise: bool
+    decision_points: int
+    max_nesting: int
+    statement_count: int
+
+    @property
+    def has_exit(self) -> bool:
+        return self.has_break or self.has_return or self.has_raise
+
+
+def summarize(tree: ast.AST, deadline: Deadline = NO_DEADLINE) -> Dict[ast.AST, NodeSummary]:
+    """
+    Single post-order pass over the tree.
+
+    Returns a summary for every statement node, so rules answer
+    "does this subtree contain X / how many Y" in O(1) instead of
+    re-walking the subtree (O(N · depth) overall).
+
+    Iterative: safe on deeply nested inputs.
+    """
+    tick = deadline.tick
+
+    # Pre-order flattening: every child appears after its parent
+    order: List[Tuple[ast.AST, int]] = []
+    stack: List[Tuple[ast.AST, int]] = [(tree, -1)]
+    while stack:
+        tick()
+        node, parent = stack.pop()
+        idx = len(order)
+        order.append((node, parent))
+        for child in ast.iter_child_nodes(node):
+            stack.append((child, idx))
+
+    n = len(order)
+    flags = [0] * n
+    decisions = [0] * n
+    nesting = [0] * n
+    statements = [0] * n
+
+    summaries: Dict[ast.AST, NodeSummary] = {}
+
+    # Reverse pre-order == children folded before their parent
+    for idx in range(n - 1, -1, -1):
+        tick()
+        node, parent = order[idx]
+
+        if isinstance(node, ast.Break):
+            flags[idx] |= _BREAK
+        elif isinstance(node, ast.Return):
+            flags[idx] |= _RETURN
+        elif isinstance(node, ast.Raise):
+            flags[idx] |= _RAISE
+
+        if isinstance(node, DECISION_NODES):
+            decisions[idx] += 1
+        elif isinstance(node, ast.BoolOp):
+            decisions[idx] += len(node.values) - 1
+
+        if isinstance(node, BLOCK_NODES):
+            nesting[idx] += 1
+
+        if isinstance(node, ast.stmt):
+            statements[idx] += 1
+            f = flags[idx]
+            summaries[node] = NodeSummary(
+                has_break=bool(f & _BREAK),
+                has_return=bool(f & _RETURN),
+                has_raise=bool(f & _RAISE),
+                decision_points=decisions[idx],
+                max_nesting=nesting[idx],
+                statement_count=statements[idx],
+            )
+
+        if parent >= 0:
+            flags[parent] |= flags[idx]
+            decisions[parent] += decisions[idx]
+            if nesting[idx] > nesting[parent]:
+                nesting[parent] = nesting[idx]
+            statements[parent] += statements[idx]
+
+    return summaries
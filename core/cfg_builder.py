@@ -0,0 +1,455 @@
+# core/cfg_builder.py
+import ast
+import hashlib
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from core.deadline import NO_DEADLINE, Deadline
+from core.lru import LRUCache
+
+# Statements that open their own scope: their bodies get their own CFG
+SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+TRY_NODES = (ast.Try,) + ((ast.TryStar,) if hasattr(ast, "TryStar") else ())
+
+CFG_CACHE_SIZE = 4096
+
+# (block id, finally depth) — see _Builder.jump
+Target = Tuple[int, int]
+
+
+class BasicBlock:
+    __slots__ = ("id", "items", "succs", "preds")
+
+    def __init__(self, block_id: int):
+        self.id = block_id
+        # indices into FunctionCFG.items order (see enumerate_items)
+        self.items: List[int] = []
+        self.succs: List[int] = []
+        self.preds: List[int] = []
+
+
+class FunctionCFG:
+    """
+    Basic-block CFG for one function (or module) body.
+
+    Tree-independent: blocks hold item *indices* in enumerate_items()
+    order, so one CFG can be cached by body hash and bound to any
+    structurally identical function.
+
+    Block 0 is the entry, block 1 the exit.
+    """
+
+    __slots__ = ("blocks", "item_count", "loops")
+
+    ENTRY = 0
+    EXIT = 1
+
+    def __init__(self):
+        self.blocks: List[BasicBlock] = []
+        self.item_count = 0
+        # loop item index → (header block, first block after the loop)
+        self.loops: Dict[int, Tuple[int, int]] = {}
+
+    def new_block(self) -> BasicBlock:
+        block = BasicBlock(len(self.blocks))
+        self.blocks.append(block)
+        return block
+
+    def edge(self, src: int, dst: int):
+        succs = self.blocks[src].succs
+        if dst not in succs:
+            succs.append(dst)
+            self.blocks[dst].preds.append(src)
+
+    def reachable(self, start: int = ENTRY) -> Set[int]:
+        seen = {start}
+        stack = [start]
+        while stack:
+            for nxt in self.blocks[stack.pop()].succs:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+
+    def loop_can_exit(self, loop_index: int) -> bool:
+        """
+        True if some path from the loop header leaves the loop
+        (break, return, uncaught raise, or a false test).
+        Loop body blocks are exactly the ids between header and after.
+        """
+        header, after = self.loops[loop_index]
+        seen = {header}
+        stack = [header]
+        while stack:
+            for nxt in self.blocks[stack.pop()].succs:
+                if not header <= nxt < after:
+                    return True
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return False
+
+    def postorder(self) -> List[int]:
+        order: List[int] = []
+        seen = {self.ENTRY}
+        stack = [(self.ENTRY, iter(self.blocks[self.ENTRY].succs))]
+        while stack:
+            block_id, succs = stack[-1]
+            for nxt in succs:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append((nxt, iter(self.blocks[nxt].succs)))
+                    break
+            else:
+                stack.pop()
+                order.append(block_id)
+        return order
+
+
+# -----------------------------
+# Item enumeration
+# -----------------------------
+def _child_bodies(node: ast.AST) -> Iterator[List[ast.AST]]:
+    if isinstance(node, SCOPE_NODES):
+        return
+    if isinstance(node, ast.Match):
+        yield node.cases
+        return
+    if isinstance(node, TRY_NODES):
+        yield node.body
+        yield node.handlers
+        yield node.orelse
+        yield node.finalbody
+        return
+    for field in ("body", "orelse"):
+        value = getattr(node, field, None)
+        if isinstance(value, list):
+            yield value
+
+
+def enumerate_items(body: List[ast.stmt]) -> List[ast.AST]:
+    """
+    Deterministic pre-order list of CFG items in a body:
+    statements, except handlers and match cases (headers only —
+    their bodies follow them). Nested scopes are single items.
+    """
+    items: List[ast.AST] = []
+    stack: List[Iterator[ast.AST]] = [iter(body)]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            continue
+        items.append(node)
+        bodies = list(_child_bodies(node))
+        for child in reversed(bodies):
+            stack.append(iter(child))
+    return items
+
+
+def scope_body(node: ast.AST) -> List[ast.stmt]:
+    return node.body if isinstance(node, (ast.Module,) + SCOPE_NODES) else []
+
+
+# -----------------------------
+# Builder
+# -----------------------------
+class _Builder:
+    def __init__(self, items: List[ast.AST], deadline: Deadline = NO_DEADLINE):
+        self.deadline = deadline
+        self.cfg = FunctionCFG()
+        self.cfg.item_count = len(items)
+        self.index = {id(item): i for i, item in enumerate(items)}
+
+        # Jump targets are (block, finally depth at registration):
+        # a jump passes through every finally opened since then.
+        # (continue target, break target) per enclosing loop
+        self.loop_stack: List[Tuple[Target, Target]] = []
+        # where a raise may go: handlers of enclosing try, else exit
+        self.raise_stack: List[List[Target]] = []
+        # open finally blocks: (entry block, pending targets)
+        self.finally_stack: List[Tuple[int, Set[Target]]] = []
+
+    def build(self, body: List[ast.stmt]) -> FunctionCFG:
+        entry = self.cfg.new_block()
+        exit_block = self.cfg.new_block()
+        end = self.body(body, entry.id)
+        if end is not None:
+            self.cfg.edge(end, exit_block.id)
+        return self.cfg
+
+    def add(self, block: int, node: ast.AST):
+        self.cfg.blocks[block].items.append(self.index[id(node)])
+
+    def target(self, block: int) -> Target:
+        return (block, len(self.finally_stack))
+
+    def jump(self, src: int, dst: Target):
+        """
+        Abrupt transfer (return/break/continue/raise).
+        Routed through the innermost finally opened after the target;
+        that finally's exit later fans out to its pending targets.
+        """
+        block, depth = dst
+        if len(self.finally_stack) > depth:
+            fin_entry, pending = self.finally_stack[-1]
+            self.cfg.edge(src, fin_entry)
+            pending.add(dst)
+        else:
+            self.cfg.edge(src, block)
+
+    def raise_targets(self) -> List[Target]:
+        return self.raise_stack[-1] if self.raise_stack else [(FunctionCFG.EXIT, 0)]
+
+    def body(self, stmts: List[ast.stmt], current: Optional[int]) -> Optional[int]:
+        for stmt in stmts:
+            self.deadline.tick()
+            if current is None:
+                # unreachable statement: own block with no predecessors
+                current = self.cfg.new_block().id
+            current = self.stmt(stmt, current)
+        return current
+
+    def stmt(self, node: ast.stmt, current: int) -> Optional[int]:
+        cfg = self.cfg
+
+        if isinstance(node, ast.Return):
+            self.add(current, node)
+            self.jump(current, (FunctionCFG.EXIT, 0))
+            return None
+
+        if isinstance(node, ast.Raise):
+            self.add(current, node)
+            for target in self.raise_targets():
+                self.jump(current, target)
+            return None
+
+        if isinstance(node, (ast.Break, ast.Continue)):
+            self.add(current, node)
+            if self.loop_stack:
+                cont, brk = self.loop_stack[-1]
+                self.jump(current, brk if isinstance(node, ast.Break) else cont)
+            return None
+
+        if isinstance(node, ast.If):
+            self.add(current, node)
+            then_block = cfg.new_block().id
+            cfg.edge(current, then_block)
+            then_end = self.body(node.body, then_block)
+
+            if node.orelse:
+                else_block = cfg.new_block().id
+                cfg.edge(current, else_block)
+                else_end = self.body(node.orelse, else_block)
+            else:
+                else_end = current
+
+            after = cfg.new_block().id
+            for end in (then_end, else_end):
+                if end is not None:
+                    cfg.edge(end, after)
+            return after
+
+        if isinstance(node, (ast.While, ast.For, ast.AsyncFor)):
+            return self.loop(node, current)
+
+        if isinstance(node, (ast.With, ast.AsyncWith)):
+            self.add(current, node)
+            return self.body(node.body, current)
+
+        if isinstance(node, TRY_NODES):
+            return self.try_(node, current)
+
+        if isinstance(node, ast.Match):
+            return self.match(node, current)
+
+        # simple statement (incl. nested def / class headers)
+        self.add(current, node)
+        return current
+
+    def loop(self, node: ast.AST, current: int) -> int:
+        cfg = self.cfg
+
+        header = cfg.new_block().id
+        cfg.edge(current, header)
+        self.add(header, node)
+
+        # break edges collect here; it falls through to the after block,
+        # which can only be created once the body is built
+        break_block = cfg.new_block().id
+
+        body_block = cfg.new_block().id
+        cfg.edge(header, body_block)
+
+        self.loop_stack.append((self.target(header), self.target(break_block)))
+        body_end = self.body(node.body, body_block)
+        self.loop_stack.pop()
+        if body_end is not None:
+            cfg.edge(body_end, header)
+
+        infinite = (
+            isinstance(node, ast.While)
+            and isinstance(node.test, ast.Constant)
+            and bool(node.test.value)
+        )
+
+        else_end: Optional[int] = None
+        if not infinite:
+            if node.orelse:
+                else_block = cfg.new_block().id
+                cfg.edge(header, else_block)
+                else_end = self.body(node.orelse, else_block)
+            else:
+                else_end = header
+
+        after = cfg.new_block().id
+        cfg.edge(break_block, after)
+        if else_end is not None:
+            cfg.edge(else_end, after)
+
+        cfg.loops[self.index[id(node)]] = (header, after)
+        return after
+
+    def try_(self, node: ast.AST, current: int) -> Optional[int]:
+        cfg = self.cfg
+
+        fin_entry = None
+        pending: Set[Target] = set()
+        if node.finalbody:
+            fin_entry = cfg.new_block().id
+            self.finally_stack.append((fin_entry, pending))
+
+        handler_entries = [cfg.new_block().id for _ in node.handlers]
+        targets = [self.target(h) for h in handler_entries]
+        # Unless a handler catches everything, an exception may escape
+        if not any(_catches_all(h) for h in node.handlers):
+            targets += self.raise_targets()
+        self.raise_stack.append(targets)
+
+        body_block = cfg.new_block().id
+        cfg.edge(current, body_block)
+        first_body_block = body_block
+        body_end = self.body(node.body, body_block)
+
+        # Any statement in the body may raise
+        for block_id in range(first_body_block, len(cfg.blocks)):
+            for h in handler_entries:
+                cfg.edge(block_id, h)
+        self.raise_stack.pop()
+
+        if body_end is not None and node.orelse:
+            else_block = cfg.new_block().id
+            cfg.edge(body_end, else_block)
+            body_end = self.body(node.orelse, else_block)
+
+        ends = [body_end]
+        for handler, entry in zip(node.handlers, handler_entries):
+            self.add(entry, handler)
+            ends.append(self.body(handler.body, entry))
+
+        after = cfg.new_block().id
+
+        if fin_entry is not None:
+            self.finally_stack.pop()
+            for end in ends:
+                if end is not None:
+                    cfg.edge(end, fin_entry)
+            fin_end = self.body(node.finalbody, fin_entry)
+            if fin_end is not None:
+                cfg.edge(fin_end, after)
+                for target in pending:
+                    self.jump(fin_end, target)
+        else:
+            for end in ends:
+                if end is not None:
+                    cfg.edge(end, after)
+
+        return after if cfg.blocks[after].preds else None
+
+    def match(self, node: ast.Match, current: int) -> int:
+        cfg = self.cfg
+        self.add(current, node)
+
+        after = cfg.new_block().id
+        exhaustive = False
+
+        for case in node.cases:
+            case_block = cfg.new_block().id
+            cfg.edge(current, case_block)
+            self.add(case_block, case)
+            end = self.body(case.body, case_block)
+            if end is not None:
+                cfg.edge(end, after)
+
+            pattern = case.pattern
+            if (
+                case.guard is None
+                and isinstance(pattern, ast.MatchAs)
+                and pattern.pattern is None
+            ):
+                exhaustive = True
+
+        if not exhaustive:
+            cfg.edge(current, after)
+
+        return after
+
+
+def _catches_all(handler: ast.ExceptHandler) -> bool:
+    return handler.type is None or (
+        isinstance(handler.type, ast.Name) and handler.type.id == "BaseException"
+    )
+
+
+class BoundCFG:
+    """
+    A (possibly cached) FunctionCFG bound to the items of one tree.
+    """
+
+    __slots__ = ("cfg", "items", "index")
+
+    def __init__(self, cfg: FunctionCFG, items: List[ast.AST]):
+        self.cfg = cfg
+        self.items = items
+        self.index = {id(item): i for i, item in enumerate(items)}
+
+    def item(self, node: ast.AST) -> int:
+        return self.index[id(node)]
+
+    def loop_can_exit(self, loop: ast.AST) -> bool:
+        return self.cfg.loop_can_exit(self.item(loop))
+
+
+def build_cfg(node: ast.AST, deadline: Deadline = NO_DEADLINE) -> BoundCFG:
+    """
+    Build the CFG of a function / class / module body.
+    """
+    items = enumerate_items(scope_body(node))
+    return BoundCFG(_Builder(items, deadline).build(scope_body(node)), items)
+
+
+# -----------------------------
+# Per-function-hash cache
+# -----------------------------
+_CFG_CACHE = LRUCache(CFG_CACHE_SIZE)   # body hash → FunctionCFG
+
+
+def body_hash(node: ast.AST) -> str:
+    dump = "\n".join(ast.dump(stmt) for stmt in scope_body(node))
+    return hashlib.sha256(dump.encode("utf-8")).hexdigest()
+
+
+def cached_cfg(node: ast.AST, key: Optional[str] = None, deadline: Deadline = NO_DEADLINE) -> BoundCFG:
+    """
+    build_cfg memoized by body hash (LRU). Identical function bodies
+    — across files or across requests — share one FunctionCFG.
+    """
+    key = key or body_hash(node)
+    cfg = _CFG_CACHE.get(key)
+
+    if cfg is not None:
+        return BoundCFG(cfg, enumerate_items(scope_body(node)))
+
+    bound = build_cfg(node, deadline)
+    _CFG_CACHE.put(key, bound.cfg)
+    return bound
@@ -1,37 +1,32 @@
 # core/cfg_engine.py
 
 import ast
-from typing import List, Dict
-
-
-def _issue(
-    rule_id: str,
-    severity: str,
-    category: str,
-    message: str,
-    confidence: str = "medium",
-) -> Dict:
-    return {
-        "rule_id": rule_id,
-        "severity": severity,
-        "category": category,
-        "message": message,
-        "confidence": confidence,
-    }
-
-
-class CFGVisitor(ast.NodeVisitor):
+from typing import List, Optional
+
+from core.deadline import CancellableVisitor
+from core.file_context import FileContext
+from core.finding import Finding
+
+
+class CFGVisitor(CancellableVisitor):
     """
-    Phase C.1 — Minimal CFG Engine
+    Phase C.1 — CFG Engine
 
     Guarantees:
     - No false positives
-    - Block-aware only
+    - Loop exits decided on the basic-block CFG (core/cfg_builder)
     - No path explosion
     """
 
-    def __init__(self):
-        self.issues: List[Dict] = []
+    def __init__(self, ctx: FileContext):
+        self.issues: List[Finding] = []
+        self.ctx = ctx
+        self.scope_stack: List[ast.AST] = [ctx.tree]
+
+    def _visit_scope(self, node: ast.AST):
+        self.scope_stack.append(node)
+        self.generic_visit(node)
+        self.scope_stack.pop()
 
     # -----------------------------
     # Function-level CFG
@@ -42,28 +37,36 @@ class CFGVisitor(ast.NodeVisitor):
             # Dead code after return
             if isinstance(stmt, ast.Return) and idx + 1 < len(node.body):
                 self.issues.append(
-                    _issue(
+                    Finding(
                         "CFG_DEAD_AFTER_RETURN",
                         "warning",
                         "logic",
                         f"Code after return statement in function '{node.name}' is unreachable.",
                         "medium",
+                        symbol=node.name,
                     )
                 )
 
             # Dead code after raise
             if isinstance(stmt, ast.Raise) and idx + 1 < len(node.body):
                 self.issues.append(
-                    _issue(
+                    Finding(
                         "CFG_DEAD_AFTER_RAISE",
                         "warning",
                         "logic",
                         f"Code after raise statement in function '{node.name}' is unreachable.",
                         "medium",
+                        symbol=node.name,
                     )
                 )
 
-        self.generic_visit(node)
+        self._visit_scope(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        self._visit_scope(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._visit_scope(node)
 
     # -----------------------------
     # Branch-level CFG
@@ -72,7 +75,7 @@ class CFGVisitor(ast.NodeVisitor):
         # Constant false branch
         if isinstance(node.test, ast.Constant) and node.test.value is False:
             self.issues.append(
-                _issue(
+                Finding(
                     "CFG_DEAD_BRANCH_LITERAL",
                     "warning",
                     "logic",
@@ -87,15 +90,11 @@ class CFGVisitor(ast.NodeVisitor):
     # Loop-level CFG
     # -----------------------------
     def visit_While(self, node: ast.While):
-        # Confirmed infinite loop
+        # Confirmed infinite loop: no CFG path leaves the loop
         if isinstance(node.test, ast.Constant) and node.test.value is True:
-            has_exit = any(
-                isinstance(n, (ast.Break, ast.Return, ast.Raise))
-                for n in ast.walk(node)
-            )
-            if not has_exit:
+            if not self.ctx.cfg(self.scope_stack[-1]).loop_can_exit(node):
                 self.issues.append(
-                    _issue(
+                    Finding(
                         "CFG_INFINITE_LOOP_CONFIRMED",
                         "warning",
                         "logic",
@@ -107,12 +106,12 @@ class CFGVisitor(ast.NodeVisitor):
         self.generic_visit(node)
 
 
-def analyze_cfg(code: str) -> List[Dict]:
-    try:
-        tree = ast.parse(code)
-    except SyntaxError:
+def analyze_cfg(code: str, ctx: Optional[FileContext] = None) -> List[Finding]:
+    ctx = ctx or FileContext(code)
+    if ctx.tree is None:
         return []
 
-    visitor = CFGVisitor()
-    visitor.visit(tree)
+    visitor = CFGVisitor(ctx)
+    visitor.deadline = ctx.deadline
+    visitor.visit(ctx.tree)
     return visitor.issues
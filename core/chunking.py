@@ -0,0 +1,79 @@
+# core/chunking.py
+import io
+import os
+import tokenize
+from dataclasses import dataclass
+from typing import Iterator, List
+
+# Target lines per chunk when a large file is parsed in pieces; 0 = never
+CHUNK_LINES = int(os.getenv("WISDOM_CHUNK_LINES", "5000"))
+
+# Clauses that continue the previous top-level statement
+_CONTINUATIONS = {"else", "elif", "except", "finally"}
+
+_SKIP = {tokenize.NL, tokenize.COMMENT, tokenize.ENCODING, tokenize.ENDMARKER}
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """
+    A run of whole top-level statements. `line_offset` is the number
+    of file lines before it: chunk line n is file line n + line_offset.
+    """
+
+    line_offset: int
+    text: str
+
+
+def split_top_level(code: str, target_lines: int = CHUNK_LINES) -> Iterator[Chunk]:
+    """
+    Cut `code` into chunks of about `target_lines` lines, only at
+    top-level statement boundaries found with `tokenize`: decorators
+    stay with their def / class, else / elif / except / finally with
+    their statement, bracketed and triple-quoted continuation lines
+    with their logical line. Every chunk parses on its own, and the
+    concatenated chunk trees equal the whole-file tree.
+
+    Lazy: lines are buffered only back to the last cut. Raises
+    tokenize.TokenError / SyntaxError on input the tokenizer rejects;
+    callers fall back to parsing the whole file.
+    """
+    # universal newlines, as the parser counts lines
+    stream = io.StringIO(code, newline=None)
+    pending: List[str] = []     # lines read since the last cut
+    start = 0                   # file line index of pending[0]
+
+    def readline() -> str:
+        line = stream.readline()
+        if line:
+            pending.append(line)
+        return line
+
+    depth = 0
+    line_start = True
+    decorated = False
+
+    for tok in tokenize.generate_tokens(readline):
+        kind = tok.type
+        if kind == tokenize.INDENT:
+            depth += 1
+        elif kind == tokenize.DEDENT:
+            depth -= 1
+        elif kind == tokenize.NEWLINE:
+            line_start = True
+        elif kind not in _SKIP and line_start:
+            # first token of a logical line
+            line_start = False
+            if depth:
+                continue
+
+            joined = decorated or tok.string in _CONTINUATIONS
+            decorated = tok.string == "@"
+            row = tok.start[0] - 1
+            if not joined and row - start >= target_lines:
+                yield Chunk(start, "".join(pending[:row - start]))
+                del pending[:row - start]
+                start = row
+
+    if pending:
+        yield Chunk(start, "".join(pending))
@@ -1,99 +1,107 @@
 # core/complexity_engine.py
 import ast
-from typing import List, Dict
+from typing import Dict, List, Optional
 
+from core.ast_summary import NodeSummary
+from core.deadline import CancellableVisitor
+from core.file_context import FileContext
+from core.finding import Finding
+from core.flat_ast import FlatTree
 
-def _issue(
-    rule_id: str,
-    severity: str,
-    category: str,
-    message: str,
-    confidence: str = "medium",
-) -> Dict:
-    return {
-        "rule_id": rule_id,
-        "severity": severity,
-        "category": category,
-        "message": message,
-        "confidence": confidence,
-    }
 
+def function_issues(node: ast.FunctionDef, complexity: int) -> List[Finding]:
+    """Findings for one function, given its cyclomatic complexity."""
+    issues: List[Finding] = []
+    param_count = len(node.args.args)
+    statement_count = len(node.body)
 
-class ComplexityVisitor(ast.NodeVisitor):
-    def __init__(self):
-        self.issues: List[Dict] = []
-
-    def visit_FunctionDef(self, node: ast.FunctionDef):
-        complexity = 1
-        param_count = len(node.args.args)
-        statement_count = len(node.body)
-
-        for n in ast.walk(node):
-            if isinstance(n, (ast.If, ast.For, ast.While, ast.Try, ast.ExceptHandler)):
-                complexity += 1
-            elif isinstance(n, ast.BoolOp):
-                complexity += len(n.values) - 1
-
-        if complexity > 12:
-            self.issues.append(
-                _issue(
-                    "COMPLEXITY_CYCLOMATIC_HIGH",
-                    "warning",
-                    "maintainability",
-                    f"High cyclomatic complexity in function '{node.name}' (score={complexity}).",
-                    "high",
-                )
+    if complexity > 12:
+        issues.append(
+            Finding(
+                "COMPLEXITY_CYCLOMATIC_HIGH",
+                "warning",
+                "maintainability",
+                f"High cyclomatic complexity in function '{node.name}' (score={complexity}).",
+                "high",
+                symbol=node.name,
             )
-        elif complexity > 7:
-            self.issues.append(
-                _issue(
-                    "COMPLEXITY_CYCLOMATIC_MODERATE",
-                    "warning",
-                    "maintainability",
-                    f"Moderate cyclomatic complexity in function '{node.name}' (score={complexity}).",
-                )
+        )
+    elif complexity > 7:
+        issues.append(
+            Finding(
+                "COMPLEXITY_CYCLOMATIC_MODERATE",
+                "warning",
+                "maintainability",
+                f"Moderate cyclomatic complexity in function '{node.name}' (score={complexity}).",
+                symbol=node.name,
             )
+        )
 
-        if param_count > 8:
-            self.issues.append(
-                _issue(
-                    "DESIGN_TOO_MANY_PARAMETERS",
-                    "warning",
-                    "design",
-                    f"Function '{node.name}' has too many parameters ({param_count}).",
-                    "high",
-                )
+    if param_count > 8:
+        issues.append(
+            Finding(
+                "DESIGN_TOO_MANY_PARAMETERS",
+                "warning",
+                "design",
+                f"Function '{node.name}' has too many parameters ({param_count}).",
+                "high",
+                symbol=node.name,
             )
-        elif param_count > 5:
-            self.issues.append(
-                _issue(
-                    "DESIGN_MANY_PARAMETERS",
-                    "warning",
-                    "design",
-                    f"Function '{node.name}' has many parameters ({param_count}).",
-                )
+        )
+    elif param_count > 5:
+        issues.append(
+            Finding(
+                "DESIGN_MANY_PARAMETERS",
+                "warning",
+                "design",
+                f"Function '{node.name}' has many parameters ({param_count}).",
+                symbol=node.name,
             )
+        )
 
-        if statement_count > 75:
-            self.issues.append(
-                _issue(
-                    "STRUCT_VERY_LARGE_FUNCTION",
-                    "warning",
-                    "maintainability",
-                    f"Function '{node.name}' is very large ({statement_count} statements).",
-                    "high",
-                )
+    if statement_count > 75:
+        issues.append(
+            Finding(
+                "STRUCT_VERY_LARGE_FUNCTION",
+                "warning",
+                "maintainability",
+                f"Function '{node.name}' is very large ({statement_count} statements).",
+                "high",
+                symbol=node.name,
             )
+        )
+
+    return issues
+
+
+class ComplexityVisitor(CancellableVisitor):
+    def __init__(self, summaries: Dict[ast.AST, NodeSummary]):
+        self.issues: List[Finding] = []
+        self.summaries = summaries
 
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self.issues.extend(function_issues(node, 1 + self.summaries[node].decision_points))
         self.generic_visit(node)
 
 
-def analyze_complexity(code: str) -> List[Dict]:
-    try:
-        tree = ast.parse(code)
-    except SyntaxError:
+def complexity_issues(flat: FlatTree) -> List[Finding]:
+    """ComplexityVisitor's findings, in its order, from the flat arrays."""
+    rows = flat.rows_of((ast.FunctionDef,))
+    issues: List[Finding] = []
+    for row, decisions in zip(rows.tolist(), flat.decision_points(rows).tolist()):
+        issues.extend(function_issues(flat.nodes[row], 1 + decisions))
+    return issues
+
+
+def analyze_complexity(code: str, ctx: Optional[FileContext] = None) -> List[Finding]:
+    ctx = ctx or FileContext(code)
+    if ctx.tree is None:
         return []
 
-    visitor = ComplexityVisitor()
-    visitor.visit(tree)
+    if ctx.flat is not None:
+        return complexity_issues(ctx.flat)
+
+    visitor = ComplexityVisitor(ctx.summaries)
+    visitor.deadline = ctx.deadline
+    visitor.visit(ctx.tree)
     return visitor.issues
@@ -0,0 +1,342 @@
+# core/dataflow.py
+import ast
+from typing import Dict, List, Set, Tuple
+
+from core.cfg_builder import FunctionCFG, SCOPE_NODES
+from core.deadline import NO_DEADLINE, Deadline
+
+COMPREHENSION_NODES = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+# -----------------------------
+# Item def / use extraction
+# -----------------------------
+def _expr_names(nodes: List[ast.AST], uses: List[str], defs: List[str]):
+    """
+    Collect Name loads / stores in evaluation-agnostic order.
+    Comprehension targets are local to the comprehension and skipped;
+    lambda bodies run later, like nested def bodies, and are skipped
+    (only their defaults are evaluated here).
+    """
+    stack = [n for n in nodes if n is not None]
+    local: Set[str] = set()
+
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, COMPREHENSION_NODES):
+            for gen in node.generators:
+                for t in ast.walk(gen.target):
+                    if isinstance(t, ast.Name):
+                        local.add(t.id)
+
+        if isinstance(node, ast.Lambda):
+            stack.extend(node.args.defaults)
+            stack.extend(d for d in node.args.kw_defaults if d is not None)
+            continue
+
+        if isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Load):
+                uses.append(node.id)
+            elif node.id not in local:
+                defs.append(node.id)
+            continue
+
+        stack.extend(ast.iter_child_nodes(node))
+
+    if local:
+        uses[:] = [u for u in uses if u not in local]
+
+
+def item_defs_uses(item: ast.AST) -> Tuple[List[str], List[str]]:
+    """
+    Names used and defined by one CFG item's *header*.
+    Bodies of compound statements are separate items.
+    Uses are evaluated before defs.
+    """
+    uses: List[str] = []
+    defs: List[str] = []
+
+    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        args = item.args
+        _expr_names(
+            item.decorator_list + args.defaults + [d for d in args.kw_defaults if d is not None],
+            uses,
+            defs,
+        )
+        defs.append(item.name)
+
+    elif isinstance(item, ast.ClassDef):
+        _expr_names(
+            item.decorator_list + item.bases + [k.value for k in item.keywords],
+            uses,
+            defs,
+        )
+        defs.append(item.name)
+
+    elif isinstance(item, (ast.If, ast.While)):
+        _expr_names([item.test], uses, defs)
+
+    elif isinstance(item, (ast.For, ast.AsyncFor)):
+        _expr_names([item.iter], uses, defs)
+        _expr_names([item.target], uses, defs)
+
+    elif isinstance(item, (ast.With, ast.AsyncWith)):
+        _expr_names([i.context_expr for i in item.items], uses, defs)
+        _expr_names([i.optional_vars for i in item.items], uses, defs)
+
+    elif isinstance(item, ast.Match):
+        _expr_names([item.subject], uses, defs)
+
+    elif isinstance(item, ast.match_case):
+        for node in ast.walk(item.pattern):
+            if isinstance(node, ast.MatchValue):
+                _expr_names([node.value], uses, defs)
+            name = getattr(node, "name", None) or getattr(node, "rest", None)
+            if isinstance(name, str):
+                defs.append(name)
+        _expr_names([item.guard], uses, defs)
+
+    elif isinstance(item, ast.ExceptHandler):
+        _expr_names([item.type], uses, defs)
+        if item.name:
+            defs.append(item.name)
+
+    elif isinstance(item, ast.Import):
+        for alias in item.names:
+            defs.append(alias.asname or alias.name.split(".")[0])
+
+    elif isinstance(item, ast.ImportFrom):
+        for alias in item.names:
+            if alias.name != "*":
+                defs.append(alias.asname or alias.name)
+
+    elif isinstance(item, ast.AugAssign):
+        _expr_names([item.value], uses, defs)
+        if isinstance(item.target, ast.Name):
+            uses.append(item.target.id)
+            defs.append(item.target.id)
+        else:
+            _expr_names([item.target], uses, defs)
+
+    elif isinstance(item, (ast.Try, ast.Global, ast.Nonlocal, ast.Pass)):
+        pass
+
+    elif isinstance(item, ast.stmt) and not isinstance(item, SCOPE_NODES):
+        _expr_names([item], uses, defs)
+
+    return uses, defs
+
+
+# -----------------------------
+# Bit-vector worklist solver
+# -----------------------------
+def solve(
+    cfg: FunctionCFG,
+    gen: List[int],
+    kill: List[int],
+    *,
+    forward: bool = True,
+    must: bool = False,
+    boundary: int = 0,
+    universe: int = 0,
+    deadline: Deadline = NO_DEADLINE,
+) -> Tuple[List[int], List[int]]:
+    """
+    Generic monotone dataflow over integer bitsets.
+
+    forward: IN[b] = meet(OUT[p]);  OUT[b] = gen[b] | (IN[b] & ~kill[b])
+    backward: OUT[b] = meet(IN[s]); IN[b] = gen[b] | (OUT[b] & ~kill[b])
+    meet is union (may) or intersection (must, seeded with `universe`).
+
+    Returns (IN, OUT) indexed by block id. Unreachable blocks keep
+    their initial value. Worklist in (reverse) post-order.
+    """
+    n = len(cfg.blocks)
+    init = universe if must else 0
+    ins = [init] * n
+    outs = [init] * n
+
+    post = cfg.postorder()
+    order = list(reversed(post)) if forward else post
+    reachable = set(post)
+
+    if forward:
+        ins[FunctionCFG.ENTRY] = boundary
+        edges_in = [[p for p in b.preds if p in reachable] for b in cfg.blocks]
+        edges_out = [b.succs for b in cfg.blocks]
+    else:
+        outs[FunctionCFG.EXIT] = boundary
+        edges_in = [b.succs for b in cfg.blocks]
+        edges_out = [[p for p in b.preds if p in reachable] for b in cfg.blocks]
+
+    src, dst = (ins, outs) if forward else (outs, ins)
+    anchor = FunctionCFG.ENTRY if forward else FunctionCFG.EXIT
+
+    worklist = list(reversed(order))
+    queued = set(worklist)
+
+    while worklist:
+        deadline.tick()
+        b = worklist.pop()
+        queued.discard(b)
+
+        if b != anchor and edges_in[b]:
+            if must:
+                acc = universe
+                for e in edges_in[b]:
+                    acc &= dst[e]
+            else:
+                acc = 0
+                for e in edges_in[b]:
+                    acc |= dst[e]
+            src[b] = acc
+
+        new = gen[b] | (src[b] & ~kill[b])
+        if new != dst[b]:
+            dst[b] = new
+            for e in edges_out[b]:
+                if e in reachable and e not in queued:
+                    queued.add(e)
+                    worklist.append(e)
+
+    return ins, outs
+
+
+class FunctionDataflow:
+    """
+    Name-level dataflow facts for one CFG bound to its items.
+
+    Variables and definitions are numbered once; every analysis is a
+    bitset problem solved by `solve`.
+    """
+
+    def __init__(self, cfg: FunctionCFG, items: List[ast.AST], deadline: Deadline = NO_DEADLINE):
+        self.cfg = cfg
+        self.items = items
+        self.deadline = deadline
+        self.item_facts = [item_defs_uses(item) for item in items]
+
+        self.var_index: Dict[str, int] = {}
+        for uses, defs in self.item_facts:
+            for name in uses:
+                self._var(name)
+            for name in defs:
+                self._var(name)
+
+    def _var(self, name: str) -> int:
+        idx = self.var_index.get(name)
+        if idx is None:
+            idx = self.var_index[name] = len(self.var_index)
+        return idx
+
+    def bits(self, names) -> int:
+        mask = 0
+        for name in names:
+            idx = self.var_index.get(name)
+            if idx is not None:
+                mask |= 1 << idx
+        return mask
+
+    def names(self, mask: int) -> Set[str]:
+        return {name for name, idx in self.var_index.items() if mask >> idx & 1}
+
+    # -----------------------------
+    # Liveness (backward, may)
+    # -----------------------------
+    def liveness(self) -> Tuple[List[int], List[int]]:
+        gen: List[int] = []
+        kill: List[int] = []
+        for block in self.cfg.blocks:
+            live_use = 0
+            defined = 0
+            for i in block.items:
+                uses, defs = self.item_facts[i]
+                live_use |= self.bits(uses) & ~defined
+                defined |= self.bits(defs)
+            gen.append(live_use)
+            kill.append(defined)
+        return solve(self.cfg, gen, kill, forward=False, deadline=self.deadline)
+
+    # -----------------------------
+    # Definite assignment (forward, must)
+    # -----------------------------
+    def definite_assignment(self, assigned_at_entry: Set[str] = frozenset()) -> Tuple[List[int], List[int]]:
+        gen = []
+        for block in self.cfg.blocks:
+            mask = 0
+            for i in block.items:
+                mask |= self.bits(self.item_facts[i][1])
+            gen.append(mask)
+        kill = [0] * len(gen)
+        universe = (1 << len(self.var_index)) - 1
+        return solve(
+            self.cfg,
+            gen,
+            kill,
+            forward=True,
+            must=True,
+            boundary=self.bits(assigned_at_entry),
+            universe=universe,
+            deadline=self.deadline,
+        )
+
+    def maybe_unassigned_uses(self, assigned_at_entry: Set[str] = frozenset()) -> List[Tuple[ast.AST, str]]:
+        """
+        (item, name) pairs where a local name is read on some path
+        before any assignment. Only names assigned somewhere in this
+        body are considered (others are globals / builtins).
+        """
+        local = set()
+        for _, defs in self.item_facts:
+            local.update(defs)
+
+        ins, _ = self.definite_assignment(assigned_at_entry)
+        reachable = set(self.cfg.postorder())
+        found: List[Tuple[ast.AST, str]] = []
+
+        for block in self.cfg.blocks:
+            if block.id not in reachable:
+                continue
+            assigned = ins[block.id]
+            for i in block.items:
+                uses, defs = self.item_facts[i]
+                for name in uses:
+                    if name in local and not assigned >> self.var_index[name] & 1:
+                        found.append((self.items[i], name))
+                assigned |= self.bits(defs)
+        return found
+
+    # -----------------------------
+    # Reaching definitions (forward, may)
+    # -----------------------------
+    def reaching_definitions(self) -> Tuple[List[Tuple[str, int]], List[int], List[int]]:
+        """
+        Definitions are (name, item index) pairs numbered in item order.
+        Returns (definitions, IN, OUT) with bitsets over definitions.
+        """
+        definitions: List[Tuple[str, int]] = []
+        defs_of: Dict[str, int] = {}
+        item_def_bits: Dict[int, List[Tuple[str, int]]] = {}
+
+        for i, (_, defs) in enumerate(self.item_facts):
+            for name in defs:
+                bit = 1 << len(definitions)
+                definitions.append((name, i))
+                defs_of[name] = defs_of.get(name, 0) | bit
+                item_def_bits.setdefault(i, []).append((name, bit))
+
+        gen: List[int] = []
+        kill: List[int] = []
+        for block in self.cfg.blocks:
+            g = 0
+            k = 0
+            for i in block.items:
+                for name, bit in item_def_bits.get(i, ()):
+                    g = (g & ~defs_of[name]) | bit
+                    k |= defs_of[name]
+            gen.append(g)
+            kill.append(k)
+
+        ins, outs = solve(self.cfg, gen, kill, forward=True, deadline=self.deadline)
+        return definitions, ins, outs
@@ -0,0 +1,90 @@
+# core/deadline.py
+import ast
+import os
+import time
+from typing import Optional
+
+
+def _optional_seconds(value: str) -> Optional[float]:
+    value = value.strip().lower()
+    return None if value in ("", "none", "off") else float(value)
+
+
+# Wall-clock budgets (seconds); overridable per deployment. Service
+# defaults: a slow review returns partial findings instead of holding
+# a worker. The per-analyzer slice only applies within a bounded review.
+REVIEW_DEADLINE_SECONDS = float(os.getenv("WISDOM_REVIEW_DEADLINE", "10"))
+ANALYZER_DEADLINE_SECONDS = float(os.getenv("WISDOM_ANALYZER_DEADLINE", "5"))
+
+# CI entry point (services/ci_review.py): unbounded by default, so a
+# verdict never depends on runner load; seconds, or "none"
+CI_DEADLINE_SECONDS = _optional_seconds(os.getenv("WISDOM_CI_DEADLINE", "none"))
+
+# tick() reads the clock once per this many calls (power of two)
+CHECK_INTERVAL = 256
+
+
+class AnalysisTimeout(Exception):
+    """Raised inside an analyzer when its deadline has passed."""
+
+
+class Deadline:
+    """
+    Cooperative cancellation token.
+
+    Traversal loops call tick() per node / statement; every
+    CHECK_INTERVAL ticks the monotonic clock is compared with the
+    expiry and AnalysisTimeout is raised once it has passed. Work is
+    abandoned at the next check, so caches only ever see complete
+    results.
+    """
+
+    __slots__ = ("expires_at", "_ticks")
+
+    def __init__(self, seconds: Optional[float] = None, expires_at: Optional[float] = None):
+        if expires_at is None and seconds is not None:
+            expires_at = time.monotonic() + seconds
+        self.expires_at = expires_at
+        self._ticks = 0
+
+    def child(self, seconds: Optional[float]) -> "Deadline":
+        """A sub-deadline that never outlives this one."""
+        if seconds is None:
+            return Deadline(expires_at=self.expires_at)
+        expires_at = time.monotonic() + seconds
+        if self.expires_at is not None and self.expires_at < expires_at:
+            expires_at = self.expires_at
+        return Deadline(expires_at=expires_at)
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self):
+        if self.expired():
+            raise AnalysisTimeout()
+
+    def tick(self):
+        if self.expires_at is None:
+            return
+        self._ticks += 1
+        if not self._ticks & (CHECK_INTERVAL - 1):
+            self.check()
+
+
+# Shared unbounded token (never expires, never raises)
+NO_DEADLINE = Deadline()
+
+
+class CancellableVisitor(ast.NodeVisitor):
+    """NodeVisitor that ticks its deadline on every node it visits."""
+
+    deadline: Deadline = NO_DEADLINE
+
+    def visit(self, node: ast.AST):
+        self.deadline.tick()
+        return super().visit(node)
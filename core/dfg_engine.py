@@ -1,42 +1,28 @@
 # core/dfg_engine.py
 import ast
 import builtins
-from typing import List, Dict, Set
+from typing import List, Optional
+
+from core.file_context import FileContext
+from core.finding import Finding
+from core.symbol_table import (
+    CLASS,
+    DIRECT,
+    FUNCTION,
+    IMPORTED,
+    MODULE_DUNDERS,
+    PARAM,
+    Scope,
+    Symbol,
+)
 
 BUILTINS = set(dir(builtins))
 
+# Fields holding nested statements; everything else is an item's header
+_BODY_FIELDS = {"body", "orelse", "finalbody", "handlers", "cases"}
 
-def _issue(
-    rule_id: str,
-    severity: str,
-    category: str,
-    message: str,
-    confidence: str = "medium",
-    *,
-    node: ast.AST | None = None,
-    source_lines: list[str] | None = None,
-) -> Dict:
-    issue = {
-        "rule_id": rule_id,
-        "severity": severity,
-        "category": category,
-        "message": message,
-        "confidence": confidence,
-    }
-
-    if node is not None and hasattr(node, "lineno"):
-        issue["location"] = {
-            "line": node.lineno,
-            "column": getattr(node, "col_offset", None),
-        }
-
-        if source_lines and 1 <= node.lineno <= len(source_lines):
-            issue["code_snippet"] = source_lines[node.lineno - 1].rstrip()
-
-    return issue
-
-
-class DFGVisitor(ast.NodeVisitor):
+
+class DFGVisitor:
     """
     SMART REALISTIC DFG ENGINE
     Designed for real dev experience (Cursor-like)
@@ -48,175 +34,126 @@ class DFGVisitor(ast.NodeVisitor):
     - loop variable false flags
     - import usage false flags
     - class/function scope confusion
-    """
-
-    def __init__(self, source_lines: list[str]):
-        self.issues: List[Dict] = []
-        self.source_lines = source_lines
-
-        self.scope_stack: List[Set[str]] = [set()]
-        self.assigned_stack: List[Set[str]] = [set()]
-        self.used_stack: List[Set[str]] = [set()]
-
-        self.imported: Set[str] = set()
-        self.defined_funcs: Set[str] = set()
-        self.defined_classes: Set[str] = set()
-
-    # -------------------------
-    # scope helpers
-    # -------------------------
-    def enter_scope(self):
-        self.scope_stack.append(set())
-        self.assigned_stack.append(set())
-        self.used_stack.append(set())
-
-    def exit_scope(self):
-        assigned = self.assigned_stack.pop()
-        used = self.used_stack.pop()
-        self.scope_stack.pop()
-
-        # detect real unused vars
-        for var in assigned:
-            if var not in used:
-                if var.startswith("_"):
-                    continue
-                if var in self.imported:
-                    continue
-                if var in self.defined_funcs:
-                    continue
-                if var in self.defined_classes:
-                    continue
-
-                self.issues.append(
-                    _issue(
-                        "DFG_UNUSED_VARIABLE",
-                        "warning",
-                        "maintainability",
-                        f"Variable '{var}' is assigned but never used.",
-                        "medium",
-                    )
-                )
 
-    def declare(self, name: str):
-        self.scope_stack[-1].add(name)
-        self.assigned_stack[-1].add(name)
-
-    def mark_used(self, name: str):
-        for used in reversed(self.used_stack):
-            used.add(name)
-            break
-
-    def is_declared(self, name: str) -> bool:
-        return any(name in scope for scope in self.scope_stack)
-
-    # -------------------------
-    # imports
-    # -------------------------
-    def visit_Import(self, node: ast.Import):
-        for alias in node.names:
-            name = alias.asname or alias.name.split(".")[0]
-            self.declare(name)
-            self.imported.add(name)
-
-    def visit_ImportFrom(self, node: ast.ImportFrom):
-        for alias in node.names:
-            name = alias.asname or alias.name
-            self.declare(name)
-
-    # -------------------------
-    # class
-    # -------------------------
-    def visit_ClassDef(self, node: ast.ClassDef):
-        self.declare(node.name)
-        self.defined_classes.add(node.name)
+    Name resolution comes from the shared per-file symbol table;
+    ordering questions (read before write) from the scope's dataflow.
+    """
 
-        self.enter_scope()
-        for stmt in node.body:
-            self.visit(stmt)
-        self.exit_scope()
+    def __init__(self, ctx: FileContext):
+        self.ctx = ctx
+        self.symbols = ctx.symbols
+        self.issues: List[Finding] = []
+
+    def run(self) -> List[Finding]:
+        self.check_undefined()
+        for scope in self.symbols.scopes:
+            self.ctx.deadline.tick()
+            if scope.kind in ("module", "function"):
+                self.check_unassigned_reads(scope)
+            if scope.kind in ("function", "class"):
+                self.check_unused(scope)
+        return self.issues
+
+    def _use_before_assign(self, node: ast.Name):
+        self.issues.append(
+            Finding(
+                "DFG_USE_BEFORE_ASSIGN",
+                "warning",
+                "logic",
+                f"Variable '{node.id}' may be used before assignment.",
+                "low",
+                symbol=node.id,
+            ).at(node, self.ctx.source_lines)
+        )
 
     # -------------------------
-    # function
+    # names bound nowhere
     # -------------------------
-    def visit_FunctionDef(self, node: ast.FunctionDef):
-        self.declare(node.name)
-        self.defined_funcs.add(node.name)
-
-        self.enter_scope()
-
-        for arg in node.args.args:
-            self.declare(arg.arg)
+    def check_undefined(self):
+        # A star import may bind anything
+        if self.symbols.module.star_import:
+            return
 
-        for stmt in node.body:
-            self.visit(stmt)
-
-        self.exit_scope()
+        for node in self.symbols.unresolved:
+            if node.id in BUILTINS or node.id in MODULE_DUNDERS:
+                continue
+            self._use_before_assign(node)
 
     # -------------------------
-    # with open() as f
+    # locals read before any write
     # -------------------------
-    def visit_With(self, node: ast.With):
-        for item in node.items:
-            if isinstance(item.optional_vars, ast.Name):
-                self.declare(item.optional_vars.id)
-        self.generic_visit(node)
-
-    # -------------------------
-    # assignment
-    # -------------------------
-    def visit_Assign(self, node: ast.Assign):
-        for target in node.targets:
-            if isinstance(target, ast.Name):
-                self.declare(target.id)
-        self.generic_visit(node)
-
-    def visit_For(self, node: ast.For):
-        if isinstance(node.target, ast.Name):
-            self.declare(node.target.id)
-        self.generic_visit(node)
+    def check_unassigned_reads(self, scope: Scope):
+        node = scope.node
+        if scope.kind == "module":
+            if scope.star_import:
+                return
+            entry = MODULE_DUNDERS
+        else:
+            entry = {n for n, s in scope.symbols.items() if s.flags & PARAM}
+
+        for item, name in self.ctx.dataflow(node).maybe_unassigned_uses(entry):
+            sym = scope.symbols.get(name)
+            if sym is None:
+                # global / nonlocal: bound elsewhere
+                continue
+            load = self._header_load(item, sym)
+            if load is not None:
+                self._use_before_assign(load)
+
+    def _header_load(self, item: ast.AST, sym: Symbol) -> Optional[ast.Name]:
+        header = []
+        for field, value in ast.iter_fields(item):
+            if field in _BODY_FIELDS:
+                continue
+            if isinstance(value, list):
+                header.extend(v for v in value if isinstance(v, ast.AST))
+            elif isinstance(value, ast.AST):
+                header.append(value)
+
+        # `a += 1` reads `a` first, through its Store-context target
+        aug_target = item.target if isinstance(item, ast.AugAssign) else None
+
+        # pre-order, left to right
+        stack = header[::-1]
+        while stack:
+            self.ctx.deadline.tick()
+            node = stack.pop()
+            if (
+                isinstance(node, ast.Name)
+                and self.symbols.resolve(node) is sym
+                and (isinstance(node.ctx, ast.Load) or node is aug_target)
+            ):
+                return node
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+        return None
 
     # -------------------------
-    # usage
+    # bindings never read
     # -------------------------
-    def visit_Name(self, node: ast.Name):
-        if isinstance(node.ctx, ast.Load):
-            name = node.id
+    def check_unused(self, scope: Scope):
+        for var, sym in scope.symbols.items():
+            if sym.uses or var.startswith("_"):
+                continue
+            if not sym.flags & (DIRECT | PARAM):
+                continue
+            if sym.flags & (IMPORTED | FUNCTION | CLASS):
+                continue
 
-            if name in BUILTINS:
-                return
-
-            if self.is_declared(name):
-                self.mark_used(name)
-                return
-
-            if name in self.defined_funcs or name in self.defined_classes:
-                return
-
-            if name in self.imported:
-                return
-
-            # real undefined only
             self.issues.append(
-                _issue(
-                    "DFG_USE_BEFORE_ASSIGN",
+                Finding(
+                    "DFG_UNUSED_VARIABLE",
                     "warning",
-                    "logic",
-                    f"Variable '{name}' may be used before assignment.",
-                    "low",
-                    node=node,
-                    source_lines=self.source_lines,
+                    "maintainability",
+                    f"Variable '{var}' is assigned but never used.",
+                    "medium",
+                    symbol=var,
                 )
             )
 
-        self.generic_visit(node)
-
 
-def analyze_dfg(code: str) -> List[Dict]:
-    try:
-        tree = ast.parse(code)
-    except SyntaxError:
+def analyze_dfg(code: str, ctx: Optional[FileContext] = None) -> List[Finding]:
+    ctx = ctx or FileContext(code)
+    if ctx.tree is None:
         return []
 
-    visitor = DFGVisitor(code.splitlines())
-    visitor.visit(tree)
-    return visitor.issues
\ No newline at end of file
+    return DFGVisitor(ctx).run()
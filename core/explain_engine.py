@@ -1,6 +1,11 @@
 # core/explain_engine.py
 
-from typing import Dict, List
+import hashlib
+import json
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
+
+from core.finding import Finding
 
 
 # ------------------------------------------------------------------
@@ -124,6 +129,191 @@ RULE_METADATA: Dict[str, Dict[str, Dict]] = {
             "example_before": "utils.py  # 2000 lines, mixed logic",
             "example_after": "io_utils.py\nmath_utils.py\ncore_logic.py"
         }
+    },
+
+    "ARCH_IMPORT_CYCLE": {
+        "explanation": {
+            "summary": "Import cycle.",
+            "detail": "Modules import each other directly or through a chain.",
+            "remediation": "Break the cycle by moving shared code into a lower-level module."
+        },
+        "trace": {
+            "reasoning": "Strongly connected component in the project import graph.",
+            "engine": "architecture_engine",
+            "confidence_basis": "Project-wide import graph."
+        },
+        "playbook": {
+            "goal": "Keep the dependency graph acyclic.",
+            "steps": [
+                "Find the code each module needs from the other.",
+                "Move it into a module both can import.",
+                "Or defer the import to the function that needs it."
+            ],
+            "example_before": "a.py: import b\nb.py: import a",
+            "example_after": "a.py: import common\nb.py: import common"
+        }
+    },
+
+    "ARCH_LAYER_VIOLATION": {
+        "explanation": {
+            "summary": "Forbidden layer dependency.",
+            "detail": "A module imports from a layer the org policy does not allow.",
+            "remediation": "Depend on a lower layer or invert the dependency."
+        },
+        "trace": {
+            "reasoning": "Import edge crosses layers against the declared order.",
+            "engine": "architecture_engine",
+            "confidence_basis": "Org policy layer map."
+        },
+        "playbook": {
+            "goal": "Preserve the declared architecture layers.",
+            "steps": [
+                "Locate the import crossing the layer boundary.",
+                "Move the needed code down a layer or pass it in as a parameter.",
+                "Re-run the project check."
+            ],
+            "example_before": "core/engine.py: from services.api import handler",
+            "example_after": "services/api.py: from core.engine import run"
+        }
+    },
+
+    "ARCH_DEPENDENCY_HOTSPOT": {
+        "explanation": {
+            "summary": "Dependency hotspot.",
+            "detail": "The module has both unusually many importers and many imports.",
+            "remediation": "Split the module or narrow its interface."
+        },
+        "trace": {
+            "reasoning": "Fan-in and fan-out both above the configured thresholds.",
+            "engine": "architecture_engine",
+            "confidence_basis": "Project-wide import graph degrees."
+        },
+        "playbook": {
+            "goal": "Limit how far a single change can ripple.",
+            "steps": [
+                "Check which importers use which parts of the module.",
+                "Split it along those lines.",
+                "Re-run the project check."
+            ],
+            "example_before": "utils.py  # imported by 300 modules",
+            "example_after": "text_utils.py\npath_utils.py"
+        }
+    },
+
+    # ================= ENGINE =================
+    "ANALYSIS_TIMEOUT": {
+        "explanation": {
+            "summary": "Analysis stopped at its deadline.",
+            "detail": "One or more analyzers ran past their time budget and were cancelled; their findings are missing.",
+            "remediation": "Split very large or generated files, or exclude them from review."
+        },
+        "trace": {
+            "reasoning": "Per-request or per-analyzer deadline expired during traversal.",
+            "engine": "review_brain",
+            "confidence_basis": "Cooperative cancellation token."
+        },
+        "playbook": {
+            "goal": "Get a complete review of the file.",
+            "steps": [
+                "Check which analyzers are listed as incomplete.",
+                "Split the file or move generated code out of review scope.",
+                "Re-run the review."
+            ],
+            "example_before": "generated_tables.py  # 200k lines",
+            "example_after": "generated/ excluded from review"
+        }
+    },
+
+    "ANALYSIS_DEPTH_LIMIT": {
+        "explanation": {
+            "summary": "Syntax tree too deep to analyze.",
+            "detail": "Expression or statement nesting exceeds the analyzers' recursion limit; their findings are missing.",
+            "remediation": "Flatten deeply nested expressions."
+        },
+        "trace": {
+            "reasoning": "RecursionError while traversing the syntax tree.",
+            "engine": "review_brain",
+            "confidence_basis": "Interpreter recursion limit."
+        },
+        "playbook": {
+            "goal": "Keep code within analyzable nesting depth.",
+            "steps": [
+                "Locate the deeply nested expression.",
+                "Break it into intermediate variables.",
+                "Re-run the review."
+            ],
+            "example_before": "x = 1 + (1 + (1 + (...)))",
+            "example_after": "parts = [...]\nx = sum(parts)"
+        }
+    },
+
+    "ANALYSIS_SHORT_CIRCUIT": {
+        "explanation": {
+            "summary": "Analysis stopped once the policy verdict was decided.",
+            "detail": "A verdict-only review skips the remaining analyzers when no further finding can change the policy status; their findings are missing.",
+            "remediation": "Request a full review to see every finding."
+        },
+        "trace": {
+            "reasoning": "Incremental policy evaluation reached a final failing status.",
+            "engine": "review_brain",
+            "confidence_basis": "Monotone policy counts."
+        },
+        "playbook": {
+            "goal": "Get the complete findings list when fixing a failed gate.",
+            "steps": [
+                "Fix the findings reported so far.",
+                "Re-run without verdict_only for the full list.",
+                "Re-run the gate."
+            ],
+            "example_before": "POST /review?verdict_only=true",
+            "example_after": "POST /review"
+        }
+    },
+
+    "POLICY_RULES_INVALID": {
+        "explanation": {
+            "summary": "Org policy rules are invalid.",
+            "detail": "The org policy's \"rules\" block does not compile; its rules were not applied and only the built-in rules ran.",
+            "remediation": "Fix the rule named in the message and re-sign the policy."
+        },
+        "trace": {
+            "reasoning": "RuleSpecError while compiling the org rule set.",
+            "engine": "rule_dsl",
+            "confidence_basis": "Rule spec validation."
+        },
+        "playbook": {
+            "goal": "Get the org's rules enforced again.",
+            "steps": [
+                "Read the rule id and constraint named in the message.",
+                "Fix the spec (see Custom rules in the README).",
+                "Re-sign the policy and re-run the review."
+            ],
+            "example_before": "{\"id\": \"ORG_X\", \"severity\": \"fatal\", \"call\": \"eval\"}",
+            "example_after": "{\"id\": \"ORG_X\", \"severity\": \"error\", \"call\": \"eval\"}"
+        }
+    },
+
+    "ANALYSIS_ABORTED": {
+        "explanation": {
+            "summary": "Analysis worker aborted.",
+            "detail": "The isolated analysis worker hit its memory or CPU limit, or crashed; no findings were produced for the file.",
+            "remediation": "Reduce the file's size or nesting, or raise the worker limits."
+        },
+        "trace": {
+            "reasoning": "Worker process exited or reported a resource limit while analyzing.",
+            "engine": "analysis_pool",
+            "confidence_basis": "Process exit status and RLIMIT signals."
+        },
+        "playbook": {
+            "goal": "Get the file analyzed within the worker limits.",
+            "steps": [
+                "Check which limit the message names.",
+                "Split the file, or raise WISDOM_WORKER_MEMORY_MB / WISDOM_WORKER_CPU_SECONDS.",
+                "Re-run the review."
+            ],
+            "example_before": "bundle.py  # 50 MB generated",
+            "example_after": "bundle/ excluded from review"
+        }
     }
 }
 
@@ -132,28 +322,55 @@ RULE_METADATA: Dict[str, Dict[str, Dict]] = {
 # Public API
 # ------------------------------------------------------------------
 
-def explain_results(results: List[Dict]) -> List[Dict]:
+def explain_results(
+    results: List[Union[Finding, Dict]],
+    *,
+    compact: bool = False,
+) -> List[Dict]:
     """
     Attach explanation, trace, and remediation playbooks.
     Deterministic. No execution. No guessing.
+
+    Response boundary: Finding records are serialized here, once.
+
+    compact=True:
+    - findings reference metadata by rule_id only
+    - clients resolve it from the rule catalog (see rule_catalog)
     """
 
     explained: List[Dict] = []
 
     for r in results:
-        rule_id = r.get("rule_id")
-        meta = RULE_METADATA.get(rule_id)
+        enriched = r.to_dict() if isinstance(r, Finding) else dict(r)
+        if compact:
+            explained.append(enriched)
+            continue
 
-        enriched = dict(r)
+        meta = RULE_METADATA.get(enriched.get("rule_id"))
 
         if meta:
             enriched["explanation"] = meta.get("explanation")
             enriched["trace"] = meta.get("trace")
             enriched["remediation_playbook"] = meta.get("playbook")
 
-        if "location" in r:
-            enriched["location"] = r["location"]
-
         explained.append(enriched)
 
     return explained
+
+
+@lru_cache(maxsize=1)
+def rule_catalog() -> Tuple[bytes, str]:
+    """
+    Serialized rule metadata catalog + strong ETag.
+
+    RULE_METADATA is static per engine build, so the body is
+    serialized once per process and the ETag is its SHA-256.
+    """
+    body = json.dumps(
+        {"rules": RULE_METADATA},
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    etag = '"' + hashlib.sha256(body).hexdigest() + '"'
+    return body, etag
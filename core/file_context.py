@@ -0,0 +1,200 @@
+# core/file_context.py
+import ast
+import threading
+import tokenize
+from functools import cached_property
+from typing import Callable, Dict, Iterable, List, Optional
+
+from core.ast_summary import NodeSummary, summarize
+from core.cfg_builder import BoundCFG, body_hash, cached_cfg
+from core.chunking import Chunk
+from core.dataflow import FunctionDataflow
+from core.deadline import NO_DEADLINE, Deadline
+from core.flat_ast import FlatTree, flatten
+from core.scope_mapper import ScopeIndex
+from core.symbol_table import SymbolTable
+
+
+class FileContext:
+    """
+    Per-file shared analysis state.
+
+    The source is parsed once; derived indexes (subtree summaries,
+    scope index, symbol table, ...) are computed on first use and
+    shared by every analyzer that runs on the same file.
+
+    `deadline` is the cancellation token of whichever analyzer is
+    currently running; index builds and traversals tick it. Analyzers
+    running in parallel each get a view (`with_deadline`) that shares
+    everything but the token.
+
+    Large files may be parsed in top-level chunks (`from_chunks`): the
+    tree is the concatenation of the chunk trees, and `chunks` keeps a
+    context per chunk for analyzers that only look inside statements.
+    """
+
+    def __init__(
+        self,
+        code: str,
+        deadline: Deadline = NO_DEADLINE,
+        line_offset: int = 0,
+        chunks: Optional[List["FileContext"]] = None,
+    ):
+        self.code = code
+        self.deadline = deadline
+        self.syntax_error: Optional[SyntaxError] = None
+        self.chunks: List[FileContext] = chunks or []
+        self._cfgs: Dict[int, BoundCFG] = {}
+        self._body_hashes: Dict[int, str] = {}
+        self._dataflow: Dict[int, FunctionDataflow] = {}
+        # CFG / dataflow builds, shared by parallel analyzers (cfg, dfg)
+        self._build_lock = threading.RLock()
+
+        if self.chunks:
+            # statements never span chunks: same tree as one parse
+            body = [stmt for chunk in self.chunks for stmt in chunk.tree.body]
+            self.tree = ast.Module(body=body, type_ignores=[])
+            return
+
+        try:
+            # a chunk is parsed behind blank lines, so node positions
+            # are file positions (cheaper than ast.increment_lineno)
+            self.tree: Optional[ast.Module] = ast.parse("\n" * line_offset + code)
+        except SyntaxError as e:
+            self.tree = None
+            self.syntax_error = e
+        except RecursionError:
+            # parser limit on pathological nesting
+            self.tree = None
+            self.syntax_error = SyntaxError("expression nesting too deep to parse")
+        except MemoryError:
+            # parser stack overflow, or the input exhausts memory limits
+            self.tree = None
+            self.syntax_error = SyntaxError("input too large or too deeply nested to parse")
+
+    @classmethod
+    def from_chunks(
+        cls,
+        code: str,
+        chunks: Iterable[Chunk],
+        map_fn: Callable = map,
+    ) -> "FileContext":
+        """
+        Parse `chunks` of `code` (see core/chunking.py) independently —
+        `map_fn` may be an executor's map — and join them. Input the
+        splitter rejects, or any chunk that fails to parse, is parsed
+        whole instead, so syntax errors read exactly as before.
+        """
+        try:
+            parts = list(map_fn(lambda c: cls(c.text, line_offset=c.line_offset), chunks))
+        except (SyntaxError, tokenize.TokenError):
+            return cls(code)
+        if len(parts) < 2 or any(p.tree is None for p in parts):
+            return cls(code)
+
+        ctx = cls(code, chunks=parts)
+        for part in parts:
+            # chunk trees carry file line numbers; snippets index the file
+            part.__dict__["source_lines"] = ctx.source_lines
+        return ctx
+
+    def with_deadline(self, deadline: Deadline) -> "FileContext":
+        """
+        Same file with its own cancellation token: the tree, computed
+        indexes and CFG / dataflow tables are shared. Indexes computed
+        later through a view stay in that view, so compute shared ones
+        (see `prepare_shared`) before creating views.
+        """
+        view = object.__new__(FileContext)
+        view.__dict__.update(self.__dict__)
+        view.deadline = deadline
+        return view
+
+    def prepare_shared(self):
+        """Compute the indexes most analyzers use, once, up front."""
+        self.source_lines
+        self.summaries
+        self.symbols
+        if not self.chunks:
+            self.flat
+        for chunk in self.chunks:
+            # read by the chunk-local analyzers through their views
+            chunk.deadline = self.deadline
+            try:
+                chunk.flat
+            finally:
+                chunk.deadline = NO_DEADLINE
+
+    @cached_property
+    def source_lines(self) -> List[str]:
+        return self.code.splitlines()
+
+    @cached_property
+    def summaries(self) -> Dict[ast.AST, NodeSummary]:
+        if self.tree is None:
+            return {}
+        if not self.chunks:
+            flat = self.flat
+            return flat.summaries() if flat is not None else summarize(self.tree, self.deadline)
+
+        # only statements are summarized, and each lies in one chunk:
+        # the file's table is the union; chunk contexts keep theirs
+        merged: Dict[ast.AST, NodeSummary] = {}
+        for chunk in self.chunks:
+            chunk.deadline = self.deadline
+            try:
+                merged.update(chunk.summaries)
+            finally:
+                chunk.deadline = NO_DEADLINE
+        return merged
+
+    @cached_property
+    def flat(self) -> Optional[FlatTree]:
+        """
+        Array form of the tree for the metric analyzers (structure,
+        complexity, module counts); None without NumPy, when
+        WISDOM_FLAT_METRICS=off, or for an unparsable file.
+        """
+        return flatten(self.tree, self.deadline)
+
+    @cached_property
+    def scope_index(self) -> ScopeIndex:
+        if self.tree is None:
+            return ScopeIndex([], [])
+        return ScopeIndex.from_tree(self.tree, self.deadline)
+
+    @cached_property
+    def symbols(self) -> SymbolTable:
+        if self.tree is None:
+            return SymbolTable.empty()
+        return SymbolTable.from_tree(self.tree, self.deadline)
+
+    def body_hash(self, scope: ast.AST) -> str:
+        """Structural hash of a scope body; key of the cross-file caches."""
+        key = self._body_hashes.get(id(scope))
+        if key is None:
+            key = self._body_hashes[id(scope)] = body_hash(scope)
+        return key
+
+    def cfg(self, scope: ast.AST) -> BoundCFG:
+        """
+        Basic-block CFG of a function / class / module body.
+        Built on first request; shared across files by body hash.
+        """
+        bound = self._cfgs.get(id(scope))
+        if bound is None:
+            with self._build_lock:
+                bound = self._cfgs.get(id(scope))
+                if bound is None:
+                    bound = self._cfgs[id(scope)] = cached_cfg(scope, self.body_hash(scope), self.deadline)
+        return bound
+
+    def dataflow(self, scope: ast.AST) -> FunctionDataflow:
+        facts = self._dataflow.get(id(scope))
+        if facts is None:
+            with self._build_lock:
+                facts = self._dataflow.get(id(scope))
+                if facts is None:
+                    bound = self.cfg(scope)
+                    facts = self._dataflow[id(scope)] = FunctionDataflow(bound.cfg, bound.items, self.deadline)
+        return facts
@@ -0,0 +1,94 @@
+# core/finding.py
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Longer lines (minified / generated single-line files) are cut to a
+# window around the finding's column; otherwise every finding on the
+# line would carry a full copy of it
+MAX_SNIPPET_CHARS = 200
+
+
+def snippet_of(line: str, column: Optional[int] = None) -> str:
+    if len(line) <= MAX_SNIPPET_CHARS:
+        return line.rstrip()
+
+    start = max(0, min((column or 0) - MAX_SNIPPET_CHARS // 4, len(line) - MAX_SNIPPET_CHARS))
+    end = start + MAX_SNIPPET_CHARS
+    window = line[start:end].rstrip()
+    return ("..." if start else "") + window + ("..." if end < len(line) else "")
+
+
+@dataclass(slots=True)
+class Finding:
+    """
+    Canonical deterministic finding.
+
+    Slotted record shared by every analyzer. Rule / severity / category /
+    confidence codes are interned, so thousands of findings share one
+    string object per code.
+
+    Structured fields (symbol, line, column, scope) replace re-parsing
+    of the human-readable message. The wire-format dict is produced only
+    at the response boundary via to_dict().
+    """
+
+    rule_id: str
+    severity: str
+    category: str
+    message: str
+    confidence: str = "medium"
+    symbol: Optional[str] = None
+    line: Optional[int] = None
+    column: Optional[int] = None
+    code_snippet: Optional[str] = None
+    fix: Optional[Dict] = None
+    scope: Optional[Dict] = None
+
+    def __post_init__(self):
+        self.rule_id = sys.intern(self.rule_id)
+        self.severity = sys.intern(self.severity)
+        self.category = sys.intern(self.category)
+        self.confidence = sys.intern(self.confidence)
+
+    def at(self, node, source_lines: Optional[List[str]] = None) -> "Finding":
+        """
+        Attach location (and snippet, when source is available) from an AST node.
+        """
+        lineno = getattr(node, "lineno", None)
+        if lineno is None:
+            return self
+
+        self.line = lineno
+        self.column = getattr(node, "col_offset", None)
+
+        if source_lines and 1 <= lineno <= len(source_lines):
+            self.code_snippet = snippet_of(source_lines[lineno - 1], self.column)
+
+        return self
+
+    def to_dict(self) -> Dict:
+        """
+        Serialize to the public JSON shape (schema 1.2).
+        """
+        out = {
+            "rule_id": self.rule_id,
+            "severity": self.severity,
+            "category": self.category,
+            "message": self.message,
+            "confidence": self.confidence,
+        }
+
+        if self.line is not None:
+            out["location"] = {"line": self.line, "column": self.column}
+
+        if self.code_snippet is not None:
+            out["code_snippet"] = self.code_snippet
+
+        if self.fix is not None:
+            out["fix"] = self.fix
+
+        if self.scope is not None:
+            out["scope"] = dict(self.scope)
+
+        return out
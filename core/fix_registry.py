@@ -1,8 +1,14 @@
 # core/fix_registry.py
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
+from core.finding import Finding
 
-def fix_use_before_assign(issue: Dict, full_code: str) -> Optional[Dict]:
+# An inline before / after pair quotes the whole line twice; beyond
+# this (minified / single-line files) no inline fix is offered
+MAX_FIX_LINE_CHARS = 1000
+
+
+def fix_use_before_assign(issue: Finding, lines: List[str]) -> Optional[Dict]:
     """
     Deterministic fix for DFG_USE_BEFORE_ASSIGN.
 
@@ -17,18 +23,18 @@ def fix_use_before_assign(issue: Dict, full_code: str) -> Optional[Dict]:
     - No execution
     """
 
-    location = issue.get("location")
-    if not location:
+    if issue.line is None or not issue.symbol:
         return None
 
-    var_name = issue["message"].split("'")[1]
-    lines = full_code.splitlines()
+    var_name = issue.symbol
 
-    use_line_idx = location["line"] - 1
+    use_line_idx = issue.line - 1
     if use_line_idx < 0 or use_line_idx >= len(lines):
         return None
 
     before_snippet = lines[use_line_idx]
+    if len(before_snippet) > MAX_FIX_LINE_CHARS:
+        return None
 
     # Preserve indentation
     indent = before_snippet[: len(before_snippet) - len(before_snippet.lstrip())]
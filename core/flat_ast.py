@@ -0,0 +1,221 @@
+# core/flat_ast.py
+import ast
+import os
+from typing import Dict, List, Optional, Sequence
+
+from core.ast_summary import BLOCK_NODES, DECISION_NODES, NodeSummary
+from core.deadline import NO_DEADLINE, Deadline
+
+# Optional, and imported on first use (~100 ms, off the start-up
+# path); without NumPy the analyzers keep their visitors
+np = None
+_numpy_missing = False
+
+# "auto": flat metrics whenever NumPy is installed; "off": never
+FLAT_METRICS = os.getenv("WISDOM_FLAT_METRICS", "auto").strip().lower()
+
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Node class → small integer id; classes the running Python adds
+# later get ids on first sight
+_TYPE_IDS: Dict[type, int] = {}
+
+
+def type_id(cls: type) -> int:
+    tid = _TYPE_IDS.get(cls)
+    if tid is None:
+        tid = _TYPE_IDS.setdefault(cls, len(_TYPE_IDS))
+    return tid
+
+
+for _cls in vars(ast).values():
+    if isinstance(_cls, type) and issubclass(_cls, ast.AST):
+        type_id(_cls)
+
+STATEMENT_NODES = tuple(cls for cls in _TYPE_IDS if issubclass(cls, ast.stmt))
+
+
+def type_ids(classes: Sequence[type]) -> List[int]:
+    return [type_id(cls) for cls in classes]
+
+
+def enabled() -> bool:
+    global np, _numpy_missing
+    if FLAT_METRICS in ("off", "0", "false"):
+        return False
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            _numpy_missing = True
+    return np is not None
+
+
+class FlatTree:
+    """
+    The tree as parallel arrays, one row per node in pre-order (the
+    order NodeVisitor visits), so a subtree is the row range
+    [i, subtree_end[i]) and per-subtree totals are prefix-sum
+    differences.
+
+    types:       node class id (see type_id)
+    parent:      parent row, -1 for the root
+    depth:       tree depth, 0 for the root
+    lineno / end_lineno: 0 where the node has none
+    function:    row of the nearest enclosing def, -1 outside any
+    nesting:     If / For / While / Try / With nodes on the path from
+                 the root, the node included (structure rules)
+    max_nesting: largest `nesting` in the node's subtree
+    child_count: direct children (BoolOp operands, import aliases)
+
+    `nodes` keeps the AST objects for attributes the arrays do not
+    carry (names, argument lists).
+    """
+
+    __slots__ = (
+        "nodes", "types", "parent", "depth", "lineno", "end_lineno",
+        "function", "nesting", "max_nesting", "is_block", "child_count",
+        "subtree_end",
+    )
+
+    def __init__(self, tree: ast.AST, deadline: Deadline = NO_DEADLINE):
+        tick = deadline.tick
+        nodes: List[ast.AST] = []
+        parents: List[int] = []
+        depths: List[int] = []
+
+        # Iterative pre-order walk, children left to right (the fields
+        # loop is ast.iter_child_nodes, inlined: this walk is the only
+        # per-node Python work)
+        stack = [(tree, -1, 0)]
+        while stack:
+            tick()
+            node, parent, depth = stack.pop()
+            row = len(nodes)
+            nodes.append(node)
+            parents.append(parent)
+            depths.append(depth)
+
+            children = []
+            for name in node._fields:
+                value = getattr(node, name, None)
+                if isinstance(value, ast.AST):
+                    children.append((value, row, depth + 1))
+                elif isinstance(value, list):
+                    for item in value:
+                        if isinstance(item, ast.AST):
+                            children.append((item, row, depth + 1))
+            children.reverse()
+            stack.extend(children)
+
+        ids = _TYPE_IDS
+        types = [ids[cls] if cls in ids else type_id(cls) for cls in map(type, nodes)]
+        linenos = [getattr(node, "lineno", 0) for node in nodes]
+        ends = [getattr(node, "end_lineno", None) or 0 for node in nodes]
+
+        self.nodes = nodes
+        self.types = np.array(types, dtype=np.int16)
+        self.parent = np.array(parents, dtype=np.int32)
+        self.depth = np.array(depths, dtype=np.int32)
+        self.lineno = np.array(linenos, dtype=np.int32)
+        self.end_lineno = np.array(ends, dtype=np.int32)
+
+        n = len(nodes)
+        has_parent = self.parent >= 0
+        self.child_count = np.bincount(self.parent[has_parent], minlength=n).astype(np.int32)
+
+        # Top-down columns, one vectorized step per tree level: every
+        # parent's row is final before its children's
+        levels = _levels(self.depth)
+        is_block = self.is_any(BLOCK_NODES)
+        is_function = self.is_any(FUNCTION_NODES)
+        self.nesting = is_block.astype(np.int32)
+        self.function = np.full(n, -1, dtype=np.int32)
+        for rows in levels[1:]:
+            tick()
+            up = self.parent[rows]
+            self.nesting[rows] += self.nesting[up]
+            self.function[rows] = np.where(is_function[up], up, self.function[up])
+
+        # Bottom-up, deepest level first: subtree sizes, and the deepest
+        # nesting below each node
+        size = np.ones(n, dtype=np.int32)
+        self.max_nesting = self.nesting.copy()
+        for rows in reversed(levels[1:]):
+            tick()
+            up = self.parent[rows]
+            np.add.at(size, up, size[rows])
+            np.maximum.at(self.max_nesting, up, self.max_nesting[rows])
+        self.subtree_end = np.arange(n, dtype=np.int32) + size
+        self.is_block = is_block
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def is_any(self, classes: Sequence[type]):
+        """Boolean row mask: node is one of `classes`."""
+        return np.isin(self.types, type_ids(classes))
+
+    def rows_of(self, classes: Sequence[type]):
+        """Rows of nodes of `classes`, in pre-order."""
+        return np.flatnonzero(self.is_any(classes))
+
+    def subtree_sums(self, weights, rows):
+        """Sum of `weights` over the subtree of each row in `rows`."""
+        totals = np.concatenate(([0], np.cumsum(weights, dtype=np.int64)))
+        return totals[self.subtree_end[rows]] - totals[rows]
+
+    def decision_points(self, rows):
+        """
+        Branches in each subtree, counted as core/ast_summary.py does:
+        one per If / For / While / Try / handler, and one per extra
+        operand of a BoolOp (children: the operator, then operands).
+        """
+        weights = self.is_any(DECISION_NODES).astype(np.int32)
+        bool_ops = self.types == type_id(ast.BoolOp)
+        weights[bool_ops] = self.child_count[bool_ops] - 2
+        return self.subtree_sums(weights, rows)
+
+    def summaries(self) -> Dict[ast.AST, NodeSummary]:
+        """
+        Same table as core.ast_summary.summarize, from subtree
+        reductions instead of a second walk.
+        """
+        rows = self.rows_of(STATEMENT_NODES)
+        has_break = self.subtree_sums(self.types == type_id(ast.Break), rows) > 0
+        has_return = self.subtree_sums(self.types == type_id(ast.Return), rows) > 0
+        has_raise = self.subtree_sums(self.types == type_id(ast.Raise), rows) > 0
+        decisions = self.decision_points(rows)
+        # block levels from the node down: deepest absolute nesting in
+        # the subtree minus the levels above the node
+        nesting = self.max_nesting[rows] - (self.nesting[rows] - self.is_block[rows])
+        statements = self.subtree_sums(self.is_any(STATEMENT_NODES), rows)
+
+        nodes = self.nodes
+        return {
+            nodes[row]: NodeSummary(*facts)
+            for row, *facts in zip(
+                rows.tolist(),
+                has_break.tolist(),
+                has_return.tolist(),
+                has_raise.tolist(),
+                decisions.tolist(),
+                nesting.tolist(),
+                statements.tolist(),
+            )
+        }
+
+
+def _levels(depth) -> List:
+    """Rows grouped by depth, each group in pre-order."""
+    order = np.argsort(depth, kind="stable")
+    bounds = np.cumsum(np.bincount(depth))
+    return np.split(order, bounds[:-1])
+
+
+def flatten(tree: Optional[ast.AST], deadline: Deadline = NO_DEADLINE) -> Optional[FlatTree]:
+    """FlatTree of `tree`; None when disabled or NumPy is missing."""
+    if tree is None or not enabled():
+        return None
+    return FlatTree(tree, deadline)
@@ -0,0 +1,44 @@
+# core/lru.py
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Bounded LRU map for the cross-request caches (CFGs, taint
+    summaries, compiled rule sets).
+
+    Shared by request threads and, in threaded analyzer mode, by
+    analyzers of the same request; every operation holds the lock, so
+    it stays consistent without the GIL. Values are computed by the
+    caller outside the lock: two threads may build the same entry and
+    the later put() wins, which is fine for deterministic values.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -1,5 +1,7 @@
 # core/policy_engine.py
-from typing import List, Dict
+from typing import Dict, Iterable, List, Union
+
+from core.finding import Finding
 
 SUPPORTED_POLICY_VERSIONS = ["v1"]
 SUPPORTED_PROFILES = ["balanced", "strict", "permissive"]
@@ -20,6 +22,83 @@ def evaluate_policy(
     - strict / balanced / permissive profiles
     - configurable thresholds
     """
+    error_count = sum(1 for i in issues if i["severity"] == "error")
+    warning_count = sum(1 for i in issues if i["severity"] == "warning")
+
+    return policy_verdict(
+        error_count,
+        warning_count,
+        policy_version=policy_version,
+        profile=profile,
+        warning_threshold=warning_threshold,
+    )
+
+
+class PolicyEvaluator:
+    """
+    evaluate_policy, fed as findings arrive (verdict-only reviews).
+
+    Counts only grow and every profile fails on a minimum count, so
+    once `decided` is True no later finding can change the status and
+    analysis can stop. A pass is only known at the end.
+    """
+
+    def __init__(
+        self,
+        *,
+        policy_version: str = "v1",
+        profile: str = "balanced",
+        warning_threshold: int = 5
+    ):
+        self.policy_version = policy_version
+        self.profile = profile
+        self.warning_threshold = warning_threshold
+        self.error_count = 0
+        self.warning_count = 0
+
+    def add(self, issues: Iterable[Union[Finding, Dict]]) -> bool:
+        """Count `issues`; returns `decided`."""
+        for i in issues:
+            severity = i["severity"] if isinstance(i, dict) else i.severity
+            if severity == "error":
+                self.error_count += 1
+            elif severity == "warning":
+                self.warning_count += 1
+        return self.decided
+
+    @property
+    def decided(self) -> bool:
+        if self.policy_version not in SUPPORTED_POLICY_VERSIONS:
+            return True
+        if self.profile not in SUPPORTED_PROFILES:
+            return True
+        if self.error_count > 0:
+            return True
+        if self.profile == "strict":
+            return self.warning_count > 0
+        if self.profile == "balanced":
+            return self.warning_count > self.warning_threshold
+        return False
+
+    def result(self) -> Dict:
+        return policy_verdict(
+            self.error_count,
+            self.warning_count,
+            policy_version=self.policy_version,
+            profile=self.profile,
+            warning_threshold=self.warning_threshold,
+        )
+
+
+def policy_verdict(
+    error_count: int,
+    warning_count: int,
+    *,
+    policy_version: str = "v1",
+    profile: str = "balanced",
+    warning_threshold: int = 5
+) -> Dict:
+    """Policy result from issue counts."""
 
     # ------------------------------
     # Validate version
@@ -39,12 +118,6 @@ def evaluate_policy(
             "profile": profile,
         }
 
-    # ------------------------------
-    # Count issues
-    # ------------------------------
-    error_count = sum(1 for i in issues if i["severity"] == "error")
-    warning_count = sum(1 for i in issues if i["severity"] == "warning")
-
     # ------------------------------
     # STRICT PROFILE
     # ------------------------------
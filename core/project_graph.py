@@ -0,0 +1,145 @@
+# core/project_graph.py
+from array import array
+from typing import Dict, List, Optional
+
+from core.project_index import ProjectIndex
+
+
+class ModuleGraph:
+    """
+    Compact integer-ID view of the project import graph.
+
+    Modules are numbered 0..n-1 in sorted order; edges are stored as
+    CSR adjacency arrays (`offsets`, `targets`) for both directions,
+    so every algorithm here is O(V + E) over flat int arrays.
+    """
+
+    __slots__ = ("names", "ids", "offsets", "targets", "rev_offsets", "rev_targets")
+
+    def __init__(self, names: List[str], edges: Dict[str, set]):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        n = len(names)
+
+        out_degree = array("i", bytes(4 * n))
+        in_degree = array("i", bytes(4 * n))
+        adjacency: List[List[int]] = []
+        for name in names:
+            row = sorted(self.ids[d] for d in edges.get(name, ()) if d in self.ids)
+            adjacency.append(row)
+
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        for v, row in enumerate(adjacency):
+            self.targets.extend(row)
+            self.offsets.append(len(self.targets))
+            out_degree[v] = len(row)
+            for w in row:
+                in_degree[w] += 1
+
+        # reverse CSR by counting sort
+        self.rev_offsets = array("i", [0]) * (n + 1)
+        for v in range(n):
+            self.rev_offsets[v + 1] = self.rev_offsets[v] + in_degree[v]
+        fill = array("i", self.rev_offsets[:n])
+        self.rev_targets = array("i", bytes(4 * len(self.targets)))
+        for v in range(n):
+            for i in range(self.offsets[v], self.offsets[v + 1]):
+                w = self.targets[i]
+                self.rev_targets[fill[w]] = v
+                fill[w] += 1
+
+    @classmethod
+    def from_index(cls, index: ProjectIndex) -> "ModuleGraph":
+        return cls(sorted(index.modules), index.dependencies)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def successors(self, v: int) -> array:
+        return self.targets[self.offsets[v]:self.offsets[v + 1]]
+
+    def fan_out(self, v: int) -> int:
+        return self.offsets[v + 1] - self.offsets[v]
+
+    def fan_in(self, v: int) -> int:
+        return self.rev_offsets[v + 1] - self.rev_offsets[v]
+
+    # -----------------------------
+    # Strongly connected components
+    # -----------------------------
+    def strongly_connected(self) -> List[List[int]]:
+        """
+        Iterative Tarjan. Components come out in reverse topological
+        order; safe on arbitrarily deep import chains.
+        """
+        n = len(self.names)
+        offsets, targets = self.offsets, self.targets
+
+        index = array("i", [-1]) * n
+        low = array("i", [0]) * n
+        on_stack = bytearray(n)
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [[root, offsets[root]]]
+
+            while work:
+                frame = work[-1]
+                v, i = frame
+                if i < offsets[v + 1]:
+                    frame[1] = i + 1
+                    w = targets[i]
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        work.append([w, offsets[w]])
+                    elif on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                    continue
+
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+
+        return components
+
+    def cycle_through(self, start: int, members: set) -> Optional[List[int]]:
+        """Shortest cycle start → … → start staying inside `members` (BFS)."""
+        parent = {start: -1}
+        queue = [start]
+        for v in queue:
+            for w in self.successors(v):
+                if w == start:
+                    path = [v]
+                    while parent[path[-1]] != -1:
+                        path.append(parent[path[-1]])
+                    path.reverse()
+                    return path + [start]
+                if w in members and w not in parent:
+                    parent[w] = v
+                    queue.append(w)
+        return None
@@ -0,0 +1,404 @@
+# core/project_index.py
+import argparse
+import ast
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_PATH = ".wisdom/project_index.json"
+
+SKIP_DIRS = {"__pycache__", "venv", "node_modules", "build", "dist", "site-packages"}
+
+
+@dataclass(slots=True)
+class ImportRecord:
+    """One imported module; `names` is empty for a plain `import x`."""
+
+    module: str
+    names: List[str]
+    line: int
+
+
+@dataclass(slots=True)
+class ModuleRecord:
+    path: str
+    module: str
+    is_package: bool
+    size: int
+    mtime_ns: int
+    digest: str
+    parse_error: bool = False
+    exports: List[str] = field(default_factory=list)
+    imports: List[ImportRecord] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ModuleRecord":
+        d = dict(d)
+        d["imports"] = [ImportRecord(**i) for i in d.get("imports", [])]
+        return cls(**d)
+
+
+# -----------------------------
+# Per-file extraction
+# -----------------------------
+def module_name(rel_path: str) -> str:
+    parts = list(Path(rel_path).with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _absolute(module: str, is_package: bool, level: int, target: Optional[str]) -> str:
+    """Resolve a relative import against the importing module."""
+    if not level:
+        return target or ""
+    package = module.split(".") if is_package else module.split(".")[:-1]
+    if level > 1:
+        package = package[: len(package) - (level - 1)]
+    if target:
+        package = package + [target]
+    return ".".join(package)
+
+
+def _statements(body: List[ast.stmt], toplevel: bool):
+    """
+    Yield (stmt, toplevel) over nested statement lists only — imports
+    are statements, so expressions never need to be walked.
+    `toplevel` stays True through if / try / with / for blocks.
+    """
+    stack = [(stmt, toplevel) for stmt in reversed(body)]
+    while stack:
+        stmt, top = stack.pop()
+        yield stmt, top
+
+        nested = top and not isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        children = []
+        for name in ("body", "orelse", "finalbody"):
+            children.extend(getattr(stmt, name, None) or ())
+        for handler in getattr(stmt, "handlers", None) or ():
+            children.extend(handler.body)
+        for case in getattr(stmt, "cases", None) or ():
+            children.extend(case.body)
+        stack.extend((child, nested) for child in reversed(children))
+
+
+def _bound_names(stmt: ast.stmt) -> List[str]:
+    if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return [stmt.name]
+    if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+        return [
+            a.asname or a.name.split(".")[0]
+            for a in stmt.names
+            if a.name != "*"
+        ]
+    targets = []
+    if isinstance(stmt, ast.Assign):
+        targets = stmt.targets
+    elif isinstance(stmt, (ast.AnnAssign, ast.AugAssign, ast.For, ast.AsyncFor)):
+        targets = [stmt.target]
+    elif isinstance(stmt, (ast.With, ast.AsyncWith)):
+        targets = [i.optional_vars for i in stmt.items if i.optional_vars is not None]
+    return [
+        n.id
+        for t in targets
+        for n in ast.walk(t)
+        if isinstance(n, ast.Name)
+    ]
+
+
+def _literal_all(stmt: ast.stmt) -> Optional[List[str]]:
+    if not isinstance(stmt, ast.Assign):
+        return None
+    if not any(isinstance(t, ast.Name) and t.id == "__all__" for t in stmt.targets):
+        return None
+    value = stmt.value
+    if isinstance(value, (ast.List, ast.Tuple)) and all(
+        isinstance(e, ast.Constant) and isinstance(e.value, str) for e in value.elts
+    ):
+        return [e.value for e in value.elts]
+    return None
+
+
+def extract(record: ModuleRecord, code: str):
+    """Fill exports / imports of a record from its source."""
+    record.exports = []
+    record.imports = []
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        record.parse_error = True
+        return
+    record.parse_error = False
+
+    public: Dict[str, None] = {}
+    declared_all = None
+
+    for stmt, toplevel in _statements(tree.body, True):
+        if isinstance(stmt, ast.Import):
+            for alias in stmt.names:
+                record.imports.append(ImportRecord(alias.name, [], stmt.lineno))
+        elif isinstance(stmt, ast.ImportFrom):
+            target = _absolute(record.module, record.is_package, stmt.level or 0, stmt.module)
+            if target:
+                names = [a.name for a in stmt.names]
+                record.imports.append(ImportRecord(target, names, stmt.lineno))
+
+        if toplevel:
+            declared = _literal_all(stmt)
+            if declared is not None:
+                declared_all = declared
+            for name in _bound_names(stmt):
+                if not name.startswith("_"):
+                    public[name] = None
+
+    # A literal __all__ wins; otherwise every public top-level binding
+    record.exports = declared_all if declared_all is not None else list(public)
+
+
+# -----------------------------
+# Project index
+# -----------------------------
+class ProjectIndex:
+    """
+    Module path → file map with each file's exports and imports, plus
+    forward / reverse dependency graphs over the project's own modules.
+
+    Persisted as JSON; `update()` only re-reads files whose size or
+    mtime changed and only re-parses those whose content digest did.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+        self.modules: Dict[str, ModuleRecord] = {}
+        self.by_path: Dict[str, str] = {}
+
+        self.dependencies: Dict[str, Set[str]] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+
+    # -----------------------------
+    # persistence
+    # -----------------------------
+    @classmethod
+    def load(cls, root: str, index_path: Optional[str] = None) -> "ProjectIndex":
+        index = cls(root)
+        path = Path(index_path or index.root / DEFAULT_INDEX_PATH)
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return index
+
+        # stale format → start over
+        if data.get("version") != INDEX_VERSION:
+            return index
+
+        for raw in data.get("modules", []):
+            record = ModuleRecord.from_dict(raw)
+            index.modules[record.module] = record
+            index.by_path[record.path] = record.module
+
+        index._link(index.modules)
+        return index
+
+    def save(self, index_path: Optional[str] = None):
+        path = Path(index_path or self.root / DEFAULT_INDEX_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        data = {
+            "version": INDEX_VERSION,
+            "modules": [asdict(self.modules[m]) for m in sorted(self.modules)],
+        }
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+    # -----------------------------
+    # incremental update
+    # -----------------------------
+    def scan(self) -> List[str]:
+        found = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(
+                d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")
+            )
+            for name in sorted(filenames):
+                if name.endswith(".py"):
+                    full = Path(dirpath) / name
+                    found.append(full.relative_to(self.root).as_posix())
+        return found
+
+    def update(self, paths: Optional[Iterable[str]] = None) -> Set[str]:
+        """
+        Refresh the index. With `paths` only those files (relative to
+        root, e.g. from `git diff --name-only`) are checked; otherwise
+        the whole tree is scanned. Returns changed module names,
+        including removed ones.
+        """
+        if paths is None:
+            candidates = self.scan()
+            removed = set(self.by_path) - set(candidates)
+        else:
+            candidates = [Path(p).as_posix() for p in paths if p.endswith(".py")]
+            removed = {p for p in candidates if p in self.by_path and not (self.root / p).exists()}
+
+        changed: Set[str] = set()
+
+        for rel in removed:
+            module = self.by_path.pop(rel)
+            self.modules.pop(module, None)
+            changed.add(module)
+
+        for rel in candidates:
+            if rel in removed:
+                continue
+            full = self.root / rel
+            try:
+                st = full.stat()
+            except OSError:
+                continue
+
+            module = module_name(rel)
+            record = self.modules.get(module)
+            if record is not None and record.path == rel and record.size == st.st_size and record.mtime_ns == st.st_mtime_ns:
+                continue
+
+            data = full.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+
+            if record is not None and record.path == rel and record.digest == digest:
+                # touched, not modified
+                record.size, record.mtime_ns = st.st_size, st.st_mtime_ns
+                continue
+
+            record = ModuleRecord(
+                path=rel,
+                module=module,
+                is_package=rel.endswith("__init__.py"),
+                size=st.st_size,
+                mtime_ns=st.st_mtime_ns,
+                digest=digest,
+            )
+            extract(record, data.decode("utf-8", errors="replace"))
+
+            self.modules[module] = record
+            self.by_path[rel] = module
+            changed.add(module)
+
+        # New / removed modules can change how other files' imports resolve
+        reshaped = any(m not in self.modules or m not in self.dependencies for m in changed)
+        self._link(set(self.modules) | changed if reshaped else changed)
+
+        return changed
+
+    # -----------------------------
+    # graph
+    # -----------------------------
+    def resolve(self, imp: ImportRecord) -> List[str]:
+        """Project modules an import refers to (`from pkg import mod` → pkg.mod)."""
+        targets = []
+        for name in imp.names:
+            sub = f"{imp.module}.{name}"
+            if sub in self.modules:
+                targets.append(sub)
+        if imp.module in self.modules and len(targets) < max(len(imp.names), 1):
+            targets.append(imp.module)
+        return targets
+
+    def _link(self, modules: Iterable[str]):
+        for module in list(modules):
+            for dep in self.dependencies.pop(module, ()):
+                self.dependents.get(dep, set()).discard(module)
+
+            record = self.modules.get(module)
+            if record is None:
+                self.dependents.pop(module, None)
+                continue
+
+            deps = set()
+            for imp in record.imports:
+                deps.update(self.resolve(imp))
+            deps.discard(module)
+
+            self.dependencies[module] = deps
+            self.dependents.setdefault(module, set())
+            for dep in deps:
+                self.dependents.setdefault(dep, set()).add(module)
+
+    def module_for_path(self, path: Optional[str]) -> Optional[str]:
+        if not path:
+            return None
+        p = Path(path)
+        if p.is_absolute():
+            try:
+                p = p.resolve().relative_to(self.root)
+            except ValueError:
+                return None
+        return self.by_path.get(p.as_posix())
+
+    def affected(self, modules: Iterable[str]) -> Set[str]:
+        """Modules that (transitively) import any of `modules`."""
+        seen = set(modules)
+        stack = list(seen)
+        while stack:
+            for dependent in self.dependents.get(stack.pop(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return seen
+
+    def imported_names(self, module: str) -> Set[str]:
+        """Names other project modules import from `module`."""
+        names = set()
+        for dependent in self.dependents.get(module, ()):
+            for imp in self.modules[dependent].imports:
+                if imp.module == module:
+                    names.update(imp.names)
+        return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build / update the project index")
+    parser.add_argument("root", nargs="?", default=".")
+    parser.add_argument("--index", default=None, help=f"index file (default: <root>/{DEFAULT_INDEX_PATH})")
+    parser.add_argument("--paths", nargs="*", default=None, help="only re-check these files")
+    parser.add_argument("--check", action="store_true", help="run project-wide architecture rules")
+    parser.add_argument("--org", default=None, help="org policy supplying layer rules")
+    parser.add_argument("--sarif", default=None, help="also write --check findings here as SARIF")
+    args = parser.parse_args()
+
+    index = ProjectIndex.load(args.root, args.index)
+    changed = index.update(args.paths)
+    index.save(args.index)
+
+    report = {
+        "modules": len(index.modules),
+        "edges": sum(len(d) for d in index.dependencies.values()),
+        "changed": sorted(changed),
+        "affected": sorted(index.affected(changed)),
+    }
+
+    if args.check:
+        from core.architecture_engine import analyze_project
+        from core.org_policy_loader import load_org_policy
+
+        config = load_org_policy(args.org).get("architecture") if args.org else None
+        report["findings"] = {
+            path: [f.to_dict() for f in findings]
+            for path, findings in analyze_project(index, config).items()
+        }
+
+        if args.sarif:
+            from core.sarif_exporter import write_sarif
+
+            with open(args.sarif, "w") as f:
+                write_sarif(report["findings"].items(), f)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
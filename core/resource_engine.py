@@ -1,41 +1,37 @@
 # core/resource_engine.py
 import ast
-from typing import List, Dict, Set
-
-
-def _issue(
-    rule_id: str,
-    severity: str,
-    category: str,
-    message: str,
-    confidence: str = "medium",
-) -> Dict:
-    return {
-        "rule_id": rule_id,
-        "severity": severity,
-        "category": category,
-        "message": message,
-        "confidence": confidence,
-    }
-
-
-class ResourceVisitor(ast.NodeVisitor):
+from typing import Dict, List, Set, Optional
+
+from core.deadline import CancellableVisitor
+from core.file_context import FileContext
+from core.finding import Finding
+from core.symbol_table import Symbol, SymbolTable
+
+OPEN_CALLS = {"open", "io.open"}
+
+
+class ResourceVisitor(CancellableVisitor):
     """
     Phase C.4 — Resource Semantics (Conservative)
 
     Detects:
     - open() used outside of `with`
     - open() without explicit close()
+
+    Variables are tracked per binding (symbol table), so `f` in two
+    functions are two different files.
     """
 
-    def __init__(self):
-        self.issues: List[Dict] = []
+    def __init__(self, symbols: SymbolTable, source_lines: List[str]):
+        self.issues: List[Finding] = []
+        self.symbols = symbols
+        self.source_lines = source_lines
 
-        # track variables assigned from open()
-        self.opened_files: Set[str] = set()
+        # track variables assigned from open() (insertion-ordered)
+        self.opened_files: Dict[Symbol, ast.AST] = {}
 
         # track variables that get closed
-        self.closed_files: Set[str] = set()
+        self.closed_files: Set[Symbol] = set()
 
         # track open() used inside with
         self.with_open_lines: Set[int] = set()
@@ -46,9 +42,8 @@ class ResourceVisitor(ast.NodeVisitor):
     def visit_With(self, node: ast.With):
         for item in node.items:
             if isinstance(item.context_expr, ast.Call):
-                if isinstance(item.context_expr.func, ast.Name):
-                    if item.context_expr.func.id == "open":
-                        self.with_open_lines.add(node.lineno)
+                if self.symbols.qualified_name(item.context_expr.func) in OPEN_CALLS:
+                    self.with_open_lines.add(node.lineno)
         self.generic_visit(node)
 
     # -----------------------------
@@ -56,10 +51,11 @@ class ResourceVisitor(ast.NodeVisitor):
     # -----------------------------
     def visit_Assign(self, node: ast.Assign):
         if isinstance(node.value, ast.Call):
-            if isinstance(node.value.func, ast.Name) and node.value.func.id == "open":
+            if self.symbols.qualified_name(node.value.func) in OPEN_CALLS:
                 for target in node.targets:
-                    if isinstance(target, ast.Name):
-                        self.opened_files.add(target.id)
+                    sym = self.symbols.resolve(target)
+                    if sym is not None:
+                        self.opened_files.setdefault(sym, target)
         self.generic_visit(node)
 
     # -----------------------------
@@ -68,8 +64,9 @@ class ResourceVisitor(ast.NodeVisitor):
     def visit_Call(self, node: ast.Call):
         if isinstance(node.func, ast.Attribute):
             if node.func.attr == "close":
-                if isinstance(node.func.value, ast.Name):
-                    self.closed_files.add(node.func.value.id)
+                sym = self.symbols.resolve(node.func.value)
+                if sym is not None:
+                    self.closed_files.add(sym)
         self.generic_visit(node)
 
     # -----------------------------
@@ -78,25 +75,27 @@ class ResourceVisitor(ast.NodeVisitor):
     def visit_Module(self, node: ast.Module):
         self.generic_visit(node)
 
-        for var in self.opened_files:
-            if var not in self.closed_files:
+        for sym, target in self.opened_files.items():
+            if sym not in self.closed_files:
+                var = sym.name
                 self.issues.append(
-                    _issue(
+                    Finding(
                         "RESOURCE_FILE_NOT_CLOSED",
                         "warning",
                         "resource",
                         f"File object '{var}' opened but never closed.",
                         "medium",
-                    )
+                        symbol=var,
+                    ).at(target, self.source_lines)
                 )
 
 
-def analyze_resources(code: str) -> List[Dict]:
-    try:
-        tree = ast.parse(code)
-    except SyntaxError:
+def analyze_resources(code: str, ctx: Optional[FileContext] = None) -> List[Finding]:
+    ctx = ctx or FileContext(code)
+    if ctx.tree is None:
         return []
 
-    visitor = ResourceVisitor()
-    visitor.visit(tree)
+    visitor = ResourceVisitor(ctx.symbols, ctx.source_lines)
+    visitor.deadline = ctx.deadline
+    visitor.visit(ctx.tree)
     return visitor.issues
@@ -0,0 +1,404 @@
+# core/rule_dsl.py
+import ast
+import hashlib
+import json
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.file_context import FileContext
+from core.finding import Finding
+from core.lru import LRUCache
+
+SEVERITIES = {"error", "warning", "info"}
+CONFIDENCES = {"high", "medium", "low"}
+
+RULESET_CACHE_SIZE = 64
+
+# Parent-context bits for "inside" / "not_inside"
+CONTEXT_BITS = {
+    "function": 1,
+    "class": 2,
+    "loop": 4,
+    "try": 8,
+    "except": 16,
+    "with": 32,
+    "lambda": 64,
+    "comprehension": 128,
+}
+
+_NODE_CONTEXT = {
+    ast.FunctionDef: CONTEXT_BITS["function"],
+    ast.AsyncFunctionDef: CONTEXT_BITS["function"],
+    ast.ClassDef: CONTEXT_BITS["class"],
+    ast.For: CONTEXT_BITS["loop"],
+    ast.AsyncFor: CONTEXT_BITS["loop"],
+    ast.While: CONTEXT_BITS["loop"],
+    ast.Try: CONTEXT_BITS["try"],
+    ast.ExceptHandler: CONTEXT_BITS["except"],
+    ast.With: CONTEXT_BITS["with"],
+    ast.AsyncWith: CONTEXT_BITS["with"],
+    ast.Lambda: CONTEXT_BITS["lambda"],
+    ast.ListComp: CONTEXT_BITS["comprehension"],
+    ast.SetComp: CONTEXT_BITS["comprehension"],
+    ast.DictComp: CONTEXT_BITS["comprehension"],
+    ast.GeneratorExp: CONTEXT_BITS["comprehension"],
+}
+if hasattr(ast, "TryStar"):
+    _NODE_CONTEXT[ast.TryStar] = CONTEXT_BITS["try"]
+
+Predicate = Callable[[object], bool]
+
+
+class RuleSpecError(ValueError):
+    pass
+
+
+# -----------------------------
+# Value constraints
+# -----------------------------
+def _node_types(rule_id: str, names) -> Tuple[type, ...]:
+    """AST class names → concrete node classes (abstract ones expanded)."""
+    if isinstance(names, str):
+        names = [names]
+
+    types: List[type] = []
+    for name in names:
+        cls = getattr(ast, name, None)
+        if not (isinstance(cls, type) and issubclass(cls, ast.AST)):
+            raise RuleSpecError(f"[RULES] {rule_id}: unknown node type '{name}'")
+
+        stack = [cls]
+        while stack:
+            c = stack.pop()
+            subclasses = c.__subclasses__()
+            if c._fields or not subclasses:
+                types.append(c)
+            stack.extend(subclasses)
+    return tuple(dict.fromkeys(types))
+
+
+def _compile_value(rule_id: str, spec) -> Predicate:
+    """
+    One constraint on an argument / field value. Keys are ANDed:
+
+      {"const": v}           literal equal to v (same type)
+      {"contains": [s, ...]} string literal containing any of s
+      {"literal": bool}      is / is not a constant
+      {"type": "JoinedStr"}  node type (name or list of names)
+      {"only": "Pass"}       list of exactly one node of that type
+      {"is": null}           absent / None
+      {"present": bool}      given / not given
+    A bare JSON scalar is shorthand for {"const": ...}.
+    """
+    if not isinstance(spec, dict):
+        spec = {"const": spec}
+
+    checks: List[Predicate] = []
+
+    for key, expected in spec.items():
+        if key == "const":
+            checks.append(
+                lambda v, e=expected: isinstance(v, ast.Constant)
+                and type(v.value) is type(e)
+                and v.value == e
+            )
+        elif key == "contains":
+            needles = [expected] if isinstance(expected, str) else list(expected)
+            checks.append(
+                lambda v, n=needles: isinstance(v, ast.Constant)
+                and isinstance(v.value, str)
+                and any(s in v.value for s in n)
+            )
+        elif key == "literal":
+            checks.append(lambda v, e=bool(expected): isinstance(v, ast.Constant) is e)
+        elif key == "type":
+            types = _node_types(rule_id, expected)
+            checks.append(lambda v, t=types: isinstance(v, t))
+        elif key == "only":
+            types = _node_types(rule_id, expected)
+            checks.append(
+                lambda v, t=types: isinstance(v, list) and len(v) == 1 and isinstance(v[0], t)
+            )
+        elif key == "is":
+            if expected is not None:
+                raise RuleSpecError(f"[RULES] {rule_id}: 'is' only accepts null")
+            checks.append(lambda v: v is None)
+        elif key == "present":
+            checks.append(lambda v, e=bool(expected): (v is not None and v != []) is e)
+        else:
+            raise RuleSpecError(f"[RULES] {rule_id}: unknown constraint '{key}'")
+
+    if len(checks) == 1:
+        return checks[0]
+    return lambda v: all(check(v) for check in checks)
+
+
+def _context_mask(rule_id: str, names) -> int:
+    if isinstance(names, str):
+        names = [names]
+    mask = 0
+    for name in names:
+        if name not in CONTEXT_BITS:
+            raise RuleSpecError(f"[RULES] {rule_id}: unknown context '{name}'")
+        mask |= CONTEXT_BITS[name]
+    return mask
+
+
+# -----------------------------
+# Compiled rule
+# -----------------------------
+class CompiledRule:
+    """
+    One declarative rule, reduced to flat checks:
+    context bitmasks, positional / keyword / field predicates and
+    subtree facts (from the shared NodeSummary pass).
+    """
+
+    __slots__ = (
+        "rule_id", "severity", "category", "message", "confidence",
+        "inside", "not_inside", "min_args", "args", "kwargs", "fields", "subtree",
+    )
+
+    def __init__(self, spec: dict):
+        rule_id = spec.get("id")
+        if not isinstance(rule_id, str) or not rule_id:
+            raise RuleSpecError("[RULES] rule without 'id'")
+
+        self.rule_id = rule_id
+        self.severity = spec.get("severity", "warning")
+        self.category = spec.get("category", "policy")
+        self.message = spec.get("message") or f"Rule {rule_id} matched."
+        self.confidence = spec.get("confidence", "medium")
+
+        if self.severity not in SEVERITIES:
+            raise RuleSpecError(f"[RULES] {rule_id}: invalid severity '{self.severity}'")
+        if self.confidence not in CONFIDENCES:
+            raise RuleSpecError(f"[RULES] {rule_id}: invalid confidence '{self.confidence}'")
+
+        self.inside = _context_mask(rule_id, spec.get("inside", ()))
+        self.not_inside = _context_mask(rule_id, spec.get("not_inside", ()))
+
+        self.min_args = int(spec.get("min_args", 0))
+        self.args = [
+            (int(i), _compile_value(rule_id, v)) for i, v in (spec.get("args") or {}).items()
+        ]
+        self.kwargs = [
+            (k, _compile_value(rule_id, v)) for k, v in (spec.get("kwargs") or {}).items()
+        ]
+        self.fields = [
+            (f, _compile_value(rule_id, v)) for f, v in (spec.get("fields") or {}).items()
+        ]
+        self.subtree = list((spec.get("subtree") or {}).items())
+
+        if self.args or self.kwargs or self.min_args:
+            if "call" not in spec:
+                raise RuleSpecError(f"[RULES] {rule_id}: 'args' / 'kwargs' need a 'call' pattern")
+
+    def matches(self, node: ast.AST, mask: int, summaries) -> bool:
+        if self.inside and mask & self.inside != self.inside:
+            return False
+        if mask & self.not_inside:
+            return False
+
+        if self.min_args or self.args or self.kwargs:
+            args = node.args
+            if len(args) < self.min_args:
+                return False
+            for i, check in self.args:
+                if not check(args[i] if i < len(args) else None):
+                    return False
+            if self.kwargs:
+                given = {k.arg: k.value for k in node.keywords if k.arg}
+                for name, check in self.kwargs:
+                    if not check(given.get(name)):
+                        return False
+
+        for name, check in self.fields:
+            if not check(getattr(node, name, None)):
+                return False
+
+        if self.subtree:
+            summary = summaries.get(node)
+            if summary is None:
+                return False
+            for fact, expected in self.subtree:
+                if getattr(summary, fact) != expected:
+                    return False
+
+        return True
+
+    def finding(self, node: ast.AST, call_name: Optional[str], source_lines: List[str]) -> Finding:
+        message = self.message
+        if call_name is not None:
+            message = message.replace("{call}", call_name)
+        return Finding(
+            self.rule_id,
+            self.severity,
+            self.category,
+            message,
+            self.confidence,
+            symbol=call_name,
+        ).at(node, source_lines)
+
+
+# -----------------------------
+# Rule set (dispatch tables)
+# -----------------------------
+class RuleSet:
+    """
+    Rules compiled into per-node-type dispatch tables.
+
+    - `by_type`:  node class → rules on that node type
+    - `calls`:    import-resolved dotted name → call rules
+    - `prefixes`: "pkg.mod" → rules written as "pkg.mod.*"
+
+    One walk over the tree serves every rule: each node costs a dict
+    hit on its type, and a Call one qualified-name lookup, regardless
+    of how many rules are loaded.
+    """
+
+    def __init__(self, specs: Sequence[dict]):
+        self.by_type: Dict[type, List[CompiledRule]] = {}
+        self.calls: Dict[str, List[CompiledRule]] = {}
+        self.prefixes: Dict[str, List[CompiledRule]] = {}
+        self.uses_summaries = False
+        self.size = 0
+
+        for spec in specs:
+            if not isinstance(spec, dict):
+                raise RuleSpecError("[RULES] each rule must be an object")
+            rule = CompiledRule(spec)
+            self.size += 1
+            self.uses_summaries |= bool(rule.subtree)
+
+            if "call" in spec:
+                names = spec["call"]
+                for name in [names] if isinstance(names, str) else names:
+                    if name.endswith(".*"):
+                        self.prefixes.setdefault(name[:-2], []).append(rule)
+                    else:
+                        self.calls.setdefault(name, []).append(rule)
+            elif "node" in spec:
+                for cls in _node_types(rule.rule_id, spec["node"]):
+                    self.by_type.setdefault(cls, []).append(rule)
+            else:
+                raise RuleSpecError(f"[RULES] {rule.rule_id}: needs a 'call' or 'node' pattern")
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _call_rules(self, name: str) -> List[CompiledRule]:
+        rules = self.calls.get(name, [])
+        if self.prefixes:
+            dot = name.find(".")
+            while dot != -1:
+                extra = self.prefixes.get(name[:dot])
+                if extra:
+                    rules = rules + extra
+                dot = name.find(".", dot + 1)
+        return rules
+
+    def run(self, ctx: FileContext) -> List[Finding]:
+        if ctx.tree is None or not self.size:
+            return []
+
+        by_type = self.by_type
+        has_calls = bool(self.calls or self.prefixes)
+        symbols = ctx.symbols if has_calls else None
+        summaries = ctx.summaries if self.uses_summaries else None
+        source_lines = ctx.source_lines
+        tick = ctx.deadline.tick
+
+        issues: List[Finding] = []
+
+        # Breadth-first, same order as ast.walk
+        queue = deque([(ctx.tree, 0)])
+        while queue:
+            tick()
+            node, mask = queue.popleft()
+            cls = type(node)
+
+            for rule in by_type.get(cls, ()):
+                if rule.matches(node, mask, summaries):
+                    issues.append(rule.finding(node, None, source_lines))
+
+            if has_calls and cls is ast.Call:
+                name = symbols.qualified_name(node.func)
+                if name is not None:
+                    for rule in self._call_rules(name):
+                        if rule.matches(node, mask, summaries):
+                            issues.append(rule.finding(node, name, source_lines))
+
+            child_mask = mask | _NODE_CONTEXT.get(cls, 0)
+            for child in ast.iter_child_nodes(node):
+                queue.append((child, child_mask))
+
+        return issues
+
+
+# -----------------------------
+# Loading / caching
+# -----------------------------
+_RULESET_CACHE = LRUCache(RULESET_CACHE_SIZE)   # rules hash → RuleSet
+
+
+def rule_specs(rules) -> List[dict]:
+    """
+    A policy's "rules" block as a list of specs (None: no rules). Any
+    other container raises RuleSpecError, as a malformed spec does.
+    """
+    if rules is None:
+        return []
+    if not isinstance(rules, (list, tuple)):
+        raise RuleSpecError(f"[RULES] rules block must be a list of rule specs, not {type(rules).__name__}")
+    return list(rules)
+
+
+def rules_hash(specs: Sequence[dict]) -> str:
+    canonical = json.dumps(list(specs), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def compile_rules(specs: Sequence[dict]) -> RuleSet:
+    """
+    Compile rule specs, cached by the SHA-256 of their canonical JSON:
+    a signed org policy is compiled once per process, not per request.
+    Any malformed spec raises RuleSpecError.
+    """
+    key = rules_hash(specs)
+    ruleset = _RULESET_CACHE.get(key)
+    if ruleset is not None:
+        return ruleset
+
+    try:
+        ruleset = RuleSet(specs)
+    except RuleSpecError:
+        raise
+    except (ValueError, TypeError, AttributeError) as e:
+        raise RuleSpecError(f"[RULES] invalid rule spec: {e}") from e
+    _RULESET_CACHE.put(key, ruleset)
+    return ruleset
+
+
+def load_rule_file(path: str) -> List[dict]:
+    """Rule specs from a JSON (or, with PyYAML installed, YAML) file."""
+    p = Path(path)
+    text = p.read_text(encoding="utf-8")
+
+    if p.suffix in (".yaml", ".yml"):
+        # Optional, and imported here: only YAML rule files need it
+        try:
+            import yaml
+        except ImportError:
+            raise RuleSpecError(f"[RULES] PyYAML is required to load {path}")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    # either a bare list or {"rules": [...]}
+    if isinstance(data, dict):
+        data = data.get("rules", [])
+    if not isinstance(data, list):
+        raise RuleSpecError(f"[RULES] {path}: expected a list of rules")
+    return data
@@ -1,27 +1,101 @@
 # core/sarif_exporter.py
 
-from typing import List, Dict
+import json
+from typing import Dict, Iterable, Iterator, List, TextIO, Tuple
 from datetime import datetime
 
+from core.explain_engine import RULE_METADATA
 
-def to_sarif(issues: List[Dict], file_path: str) -> Dict:
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+
+TOOL_NAME = "WISDOM AI Sandbox"
+TOOL_URI = "https://wisdom-ai-fn24.onrender.com"
+TOOL_VERSION = "wisdom-1.0"
+
+
+class SarifBuilder:
     """
-    Convert wisdom-ai issues into SARIF 2.1.0 format.
-    Deterministic-only. CI-safe.
+    Incremental SARIF 2.1.0 run builder.
+
+    - rules interned into one deduplicated table (ruleIndex)
+    - many files per run (artifactIndex)
+    - results converted one at a time, so callers may stream them
+
+    Memory held by the builder is O(distinct rules + artifacts),
+    never O(results).
     """
 
-    sarif_results = []
+    def __init__(self):
+        self.rules: List[Dict] = []
+        self.rule_index: Dict[str, int] = {}
+
+        self.artifacts: List[Dict] = []
+        self.artifact_index: Dict[str, int] = {}
+
+    # -----------------------------
+    # Interning
+    # -----------------------------
+    def intern_rule(self, issue: Dict) -> int:
+        rule_id = issue["rule_id"]
+        idx = self.rule_index.get(rule_id)
+        if idx is not None:
+            return idx
 
-    for issue in issues:
+        meta = RULE_METADATA.get(rule_id) or {}
+        explanation = meta.get("explanation") or {}
+
+        rule = {
+            "id": rule_id,
+            "shortDescription": {
+                "text": explanation.get("summary") or rule_id
+            },
+            "properties": {
+                "category": issue.get("category")
+            }
+        }
+
+        if explanation.get("detail"):
+            rule["fullDescription"] = {"text": explanation["detail"]}
+
+        if explanation.get("remediation"):
+            rule["help"] = {"text": explanation["remediation"]}
+
+        idx = len(self.rules)
+        self.rules.append(rule)
+        self.rule_index[rule_id] = idx
+        return idx
+
+    def intern_artifact(self, file_path: str) -> int:
+        idx = self.artifact_index.get(file_path)
+        if idx is not None:
+            return idx
+
+        idx = len(self.artifacts)
+        self.artifacts.append({"location": {"uri": file_path}})
+        self.artifact_index[file_path] = idx
+        return idx
+
+    # -----------------------------
+    # Results
+    # -----------------------------
+    def result(self, issue: Dict, file_path: str) -> Dict:
         loc = issue.get("location") or {}
-        line = loc.get("line", 1)
-        column = loc.get("column", 1)
+        line = loc.get("line") or 1
+        column = loc.get("column")
 
         severity = issue.get("severity", "warning")
         level = "error" if severity == "error" else "note"
 
-        sarif_results.append({
+        region = {"startLine": line}
+        if column is not None:
+            # AST col_offset is 0-based; SARIF columns start at 1
+            region["startColumn"] = column + 1
+
+        return {
             "ruleId": issue["rule_id"],
+            "ruleIndex": self.intern_rule(issue),
             "level": level,
             "message": {
                 "text": issue["message"]
@@ -30,12 +104,10 @@ def to_sarif(issues: List[Dict], file_path: str) -> Dict:
                 {
                     "physicalLocation": {
                         "artifactLocation": {
-                            "uri": file_path
+                            "uri": file_path,
+                            "index": self.intern_artifact(file_path),
                         },
-                        "region": {
-                            "startLine": line,
-                            "startColumn": column
-                        }
+                        "region": region
                     }
                 }
             ],
@@ -43,39 +115,103 @@ def to_sarif(issues: List[Dict], file_path: str) -> Dict:
                 "category": issue.get("category"),
                 "confidence": issue.get("confidence"),
             }
-        })
+        }
+
+    # -----------------------------
+    # Run envelope
+    # -----------------------------
+    def tool(self) -> Dict:
+        return {
+            "driver": {
+                "name": TOOL_NAME,
+                "informationUri": TOOL_URI,
+                "version": TOOL_VERSION,
+                "rules": self.rules,
+            }
+        }
 
-    return {
-        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
-        "version": "2.1.0",
-        "runs": [
+    def invocations(self) -> List[Dict]:
+        return [
             {
-                "tool": {
-                    "driver": {
-                        "name": "WISDOM AI Sandbox",
-                        "informationUri": "https://wisdom-ai-fn24.onrender.com",
-                        "version": "wisdom-1.0",
-                        "rules": [
-                            {
-                                "id": issue["rule_id"],
-                                "shortDescription": {
-                                    "text": issue["message"]
-                                },
-                                "properties": {
-                                    "category": issue.get("category")
-                                }
-                            }
-                            for issue in issues
-                        ]
-                    }
-                },
-                "results": sarif_results,
-                "invocations": [
-                    {
-                        "executionSuccessful": True,
-                        "endTimeUtc": datetime.utcnow().isoformat() + "Z"
-                    }
-                ]
+                "executionSuccessful": True,
+                "endTimeUtc": datetime.utcnow().isoformat() + "Z"
             }
         ]
-    }
+
+    def build(self, results: List[Dict]) -> Dict:
+        return {
+            "$schema": SARIF_SCHEMA,
+            "version": SARIF_VERSION,
+            "runs": [
+                {
+                    "tool": self.tool(),
+                    "artifacts": self.artifacts,
+                    "results": results,
+                    "invocations": self.invocations(),
+                }
+            ]
+        }
+
+
+def to_sarif(issues: List[Dict], file_path: str) -> Dict:
+    """
+    Convert wisdom-ai issues into SARIF 2.1.0 format.
+    Deterministic-only. CI-safe.
+    """
+    return to_sarif_multi([(file_path, issues)])
+
+
+def to_sarif_multi(file_issues: Iterable[Tuple[str, List[Dict]]]) -> Dict:
+    """
+    One SARIF run covering many files.
+    """
+    builder = SarifBuilder()
+    results = [
+        builder.result(issue, file_path)
+        for file_path, issues in file_issues
+        for issue in issues
+    ]
+    return builder.build(results)
+
+
+def iter_sarif(file_issues: Iterable[Tuple[str, List[Dict]]]) -> Iterator[str]:
+    """
+    Stream one SARIF run as JSON text chunks.
+
+    Results are serialized as soon as each file's issues arrive;
+    the rule and artifact tables are emitted after the results
+    (JSON member order is not significant in SARIF).
+
+    Suitable for StreamingResponse or any file-like sink.
+    """
+    builder = SarifBuilder()
+    dump = json.dumps
+
+    yield '{"$schema":%s,"version":%s,"runs":[{"results":[' % (
+        dump(SARIF_SCHEMA),
+        dump(SARIF_VERSION),
+    )
+
+    first = True
+    for file_path, issues in file_issues:
+        for issue in issues:
+            chunk = dump(builder.result(issue, file_path))
+            yield chunk if first else "," + chunk
+            first = False
+
+    yield '],"tool":%s,"artifacts":%s,"invocations":%s}]}' % (
+        dump(builder.tool()),
+        dump(builder.artifacts),
+        dump(builder.invocations()),
+    )
+
+
+def write_sarif(
+    file_issues: Iterable[Tuple[str, List[Dict]]],
+    fp: TextIO,
+) -> None:
+    """
+    Write a SARIF run to an open text file in bounded memory.
+    """
+    for chunk in iter_sarif(file_issues):
+        fp.write(chunk)
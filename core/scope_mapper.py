@@ -1,17 +1,24 @@
 # core/scope_mapper.py
 import ast
-from typing import List, Dict
+from typing import List, Dict, Optional
 
+from core.deadline import NO_DEADLINE, CancellableVisitor, Deadline
 
-class ScopeMapper(ast.NodeVisitor):
+
+class ScopeMapper(CancellableVisitor):
     """
     Deterministic scope mapper.
     Maps line numbers → class / function.
+
+    Scopes are recorded in pre-order, so a nested scope always
+    appears after its enclosing scope.
     """
 
     def __init__(self):
         self.scopes: List[Dict] = []
+        self.resolved: List[Dict] = []
         self.class_stack: List[str] = []
+        self.function_stack: List[Dict] = []
 
     def visit_ClassDef(self, node: ast.ClassDef):
         self.class_stack.append(node.name)
@@ -22,20 +29,83 @@ class ScopeMapper(ast.NodeVisitor):
             "start": node.lineno,
             "end": getattr(node, "end_lineno", node.lineno),
         })
+        # Preference: function > class
+        if self.function_stack:
+            self.resolved.append(self.function_stack[-1])
+        else:
+            self.resolved.append({"class": node.name, "function": None})
 
         self.generic_visit(node)
         self.class_stack.pop()
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
+        cls = self.class_stack[-1] if self.class_stack else None
+
         self.scopes.append({
             "type": "function",
             "name": node.name,
-            "class": self.class_stack[-1] if self.class_stack else None,
+            "class": cls,
             "start": node.lineno,
             "end": getattr(node, "end_lineno", node.lineno),
         })
+        resolved = {"class": cls, "function": node.name}
+        self.resolved.append(resolved)
 
+        self.function_stack.append(resolved)
         self.generic_visit(node)
+        self.function_stack.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+
+class ScopeIndex:
+    """
+    Line → innermost scope index, built once per file.
+
+    Dense per-line table: pre-order fill lets nested scopes overwrite
+    their parents, so resolve() is a single O(1) list lookup.
+    Reusable by scope annotation, fixes and SARIF export.
+
+    Returned scope dicts are shared; treat them as read-only.
+    """
+
+    __slots__ = ("scopes", "_resolved", "_line_scope")
+
+    def __init__(self, scopes: List[Dict], resolved: List[Dict]):
+        self.scopes = scopes
+        self._resolved = resolved
+
+        last_line = max((s["end"] for s in scopes), default=0)
+        table = [-1] * (last_line + 1)
+
+        for idx, s in enumerate(scopes):
+            start, end = s["start"], s["end"]
+            table[start:end + 1] = [idx] * (end - start + 1)
+
+        self._line_scope = table
+
+    @classmethod
+    def from_tree(cls, tree: ast.AST, deadline: Deadline = NO_DEADLINE) -> "ScopeIndex":
+        mapper = ScopeMapper()
+        mapper.deadline = deadline
+        mapper.visit(tree)
+        return cls(mapper.scopes, mapper.resolved)
+
+    @classmethod
+    def from_code(cls, code: str) -> "ScopeIndex":
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return cls([], [])
+        return cls.from_tree(tree)
+
+    def resolve(self, line: Optional[int]) -> Dict:
+        if line is not None and 0 < line < len(self._line_scope):
+            idx = self._line_scope[line]
+            if idx >= 0:
+                return self._resolved[idx]
+
+        return {"class": None, "function": None}
 
 
 def map_scopes(code: str) -> List[Dict]:
@@ -51,27 +121,34 @@ def map_scopes(code: str) -> List[Dict]:
 
 def resolve_scope(line: int, scopes: List[Dict]) -> Dict:
     """
-    Resolve innermost scope for a line.
+    Resolve innermost scope for a single line.
     Preference: function > class.
+
+    Linear scan — for many lookups build a ScopeIndex instead.
     """
-    matches = [
-        s for s in scopes
-        if s["start"] <= line <= s["end"]
-    ]
+    function = None
+    cls = None
 
-    for s in matches:
+    # pre-order: later matches are nested deeper
+    for s in scopes:
+        if not s["start"] <= line <= s["end"]:
+            continue
         if s["type"] == "function":
-            return {
-                "class": s.get("class"),
-                "function": s["name"]
-            }
-
-    for s in matches:
-        if s["type"] == "class":
-            return {
-                "class": s["name"],
-                "function": None
-            }
+            function = s
+        elif function is None:
+            cls = s
+
+    if function is not None:
+        return {
+            "class": function.get("class"),
+            "function": function["name"]
+        }
+
+    if cls is not None:
+        return {
+            "class": cls["name"],
+            "function": None
+        }
 
     return {
         "class": None,
@@ -2,21 +2,43 @@
 from pathlib import Path
 import os
 import hashlib
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.exceptions import InvalidSignature
 
 POLICY_DIR = Path("core/org_policies")
 
+# SHA-256 of (public key, policy, signature) that verified OK. Keyed by
+# content, so an edited policy or signature is always re-verified; the
+# service warm-up fills it before the first request.
+_VERIFIED = set()
+
+
+def _verified_digest(public_key_pem: str, data: bytes, signature: bytes) -> str:
+    h = hashlib.sha256()
+    for part in (public_key_pem.encode(), data, signature):
+        h.update(hashlib.sha256(part).digest())
+    return h.hexdigest()
+
+
 def verify_policy_signature(org: str) -> bool:
     """
     Verifies org policy signature using PUBLIC KEY from ENV.
     """
 
-    print("\n====== POLICY VERIFY DEBUG ======")
-
     policy_path = POLICY_DIR / f"{org}.json"
     sig_path = POLICY_DIR / f"{org}.sig"
+    public_key_pem = os.getenv("POLICY_PUBLIC_KEY")
+
+    # Same bytes as an earlier successful verification: nothing to redo
+    if public_key_pem and policy_path.exists() and sig_path.exists():
+        digest = _verified_digest(public_key_pem, policy_path.read_bytes(), sig_path.read_bytes())
+        if digest in _VERIFIED:
+            return True
+
+    # imported on first verification: keeps cryptography off the cold start
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding
+    from cryptography.exceptions import InvalidSignature
+
+    print("\n====== POLICY VERIFY DEBUG ======")
 
     print("ORG:", org)
     print("POLICY PATH:", policy_path.resolve())
@@ -24,8 +46,6 @@ def verify_policy_signature(org: str) -> bool:
     print("POLICY EXISTS:", policy_path.exists())
     print("SIG EXISTS:", sig_path.exists())
 
-    public_key_pem = os.getenv("POLICY_PUBLIC_KEY")
-
     if not public_key_pem:
         raise Exception("POLICY_PUBLIC_KEY missing in Render env")
 
@@ -65,6 +85,7 @@ def verify_policy_signature(org: str) -> bool:
         )
         print("SIGNATURE VALID")
         print("=================================\n")
+        _VERIFIED.add(_verified_digest(public_key_pem, data, signature))
         return True
 
     except InvalidSignature:
@@ -1,69 +1,88 @@
 #   core/structure_analyzer.py
 import ast
-from typing import List, Dict
-
-
-def _issue(
-    rule_id: str,
-    severity: str,
-    category: str,
-    message: str,
-    confidence: str = "medium",
-) -> Dict:
-    return {
-        "rule_id": rule_id,
-        "severity": severity,
-        "category": category,
-        "message": message,
-        "confidence": confidence,
-    }
-
-
-class StructureVisitor(ast.NodeVisitor):
+from typing import List, Optional
+
+from core.ast_summary import BLOCK_NODES
+from core.deadline import CancellableVisitor
+from core.file_context import FileContext
+from core.finding import Finding
+from core.flat_ast import FlatTree
+
+MAX_FUNCTION_STATEMENTS = 40
+MAX_NESTING = 4
+
+
+def _large_function(node: ast.FunctionDef) -> Finding:
+    return Finding(
+        "STRUCT_LARGE_FUNCTION",
+        "warning",
+        "maintainability",
+        f"Function '{node.name}' is too long ({len(node.body)} statements). Consider refactoring.",
+        "high",
+        symbol=node.name,
+    )
+
+
+def _deep_nesting(depth: int) -> Finding:
+    return Finding(
+        "STRUCT_DEEP_NESTING",
+        "warning",
+        "maintainability",
+        f"Deep nesting detected (depth={depth}). Code may be hard to read.",
+        "medium",
+    )
+
+
+class StructureVisitor(CancellableVisitor):
     def __init__(self):
-        self.issues: List[Dict] = []
+        self.issues: List[Finding] = []
         self.nesting_depth = 0
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
-        length = len(node.body)
-        if length > 40:
-            self.issues.append(
-                _issue(
-                    "STRUCT_LARGE_FUNCTION",
-                    "warning",
-                    "maintainability",
-                    f"Function '{node.name}' is too long ({length} statements). Consider refactoring.",
-                    "high",
-                )
-            )
+        if len(node.body) > MAX_FUNCTION_STATEMENTS:
+            self.issues.append(_large_function(node))
         self.generic_visit(node)
 
     def generic_visit(self, node):
-        is_block = isinstance(node, (ast.If, ast.For, ast.While, ast.Try, ast.With))
+        is_block = isinstance(node, BLOCK_NODES)
         if is_block:
             self.nesting_depth += 1
-            if self.nesting_depth > 4:
-                self.issues.append(
-                    _issue(
-                        "STRUCT_DEEP_NESTING",
-                        "warning",
-                        "maintainability",
-                        f"Deep nesting detected (depth={self.nesting_depth}). Code may be hard to read.",
-                        "medium",
-                    )
-                )
+            if self.nesting_depth > MAX_NESTING:
+                self.issues.append(_deep_nesting(self.nesting_depth))
             super().generic_visit(node)
             self.nesting_depth -= 1
         else:
             super().generic_visit(node)
 
 
-def analyze_structure(code: str) -> List[Dict]:
-    try:
-        tree = ast.parse(code)
-    except SyntaxError:
+def structure_issues(flat: FlatTree) -> List[Finding]:
+    """StructureVisitor's findings, in its order, from the flat arrays."""
+    functions = flat.rows_of((ast.FunctionDef,))
+    large = [
+        row for row in functions.tolist()
+        if len(flat.nodes[row].body) > MAX_FUNCTION_STATEMENTS
+    ]
+    deep = flat.is_any(BLOCK_NODES) & (flat.nesting > MAX_NESTING)
+
+    issues: List[Finding] = []
+    for row in sorted(large + deep.nonzero()[0].tolist()):
+        node = flat.nodes[row]
+        if isinstance(node, ast.FunctionDef):
+            issues.append(_large_function(node))
+        else:
+            issues.append(_deep_nesting(int(flat.nesting[row])))
+    return issues
+
+
+def analyze_structure(code: str, ctx: Optional[FileContext] = None) -> List[Finding]:
+    ctx = ctx or FileContext(code)
+    if ctx.tree is None:
         return []
 
+    if ctx.flat is not None:
+        return structure_issues(ctx.flat)
+
     visitor = StructureVisitor()
-    visitor.visit(tree)
+    visitor.deadline = ctx.deadline
+    visitor.visit(ctx.tree)
     return visitor.issues
@@ -0,0 +1,413 @@
+# core/symbol_table.py
+import ast
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.deadline import NO_DEADLINE, CancellableVisitor, Deadline
+
+# Binding flags
+PARAM = 1
+ASSIGNED = 2
+DIRECT = 4      # sole Name target of Assign / For / With item
+IMPORTED = 8
+FUNCTION = 16
+CLASS = 32
+
+SCOPE_KINDS = ("module", "function", "class", "lambda", "comprehension")
+COMPREHENSION_NODES = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+# Names every module has without binding them
+MODULE_DUNDERS = {
+    "__name__", "__file__", "__doc__", "__spec__", "__loader__",
+    "__package__", "__builtins__", "__path__", "__annotations__",
+    "__dict__", "__cached__",
+}
+
+
+class Symbol:
+    """
+    One binding of a name in one scope.
+
+    defs: binding nodes (Name / arg / alias / def / handler / pattern)
+    uses: Name loads that resolve to this binding, from any scope
+    qualified: dotted import target for imported names
+    imported_from: module of a from-import (`..pkg` for relative ones)
+    """
+
+    __slots__ = ("name", "scope", "flags", "defs", "uses", "qualified", "imported_from")
+
+    def __init__(self, name: str, scope: "Scope"):
+        self.name = name
+        self.scope = scope
+        self.flags = 0
+        self.defs: List[ast.AST] = []
+        self.uses: List[ast.Name] = []
+        self.qualified: Optional[str] = None
+        self.imported_from: Optional[str] = None
+
+    def def_sites(self) -> List[Tuple[int, int]]:
+        return [(n.lineno, n.col_offset) for n in self.defs if hasattr(n, "lineno")]
+
+    def use_sites(self) -> List[Tuple[int, int]]:
+        return [(n.lineno, n.col_offset) for n in self.uses]
+
+
+class Scope:
+    """
+    A module / function / class / lambda / comprehension scope.
+    `symbols` holds every name bound anywhere in the scope; lookups
+    follow the parent chain with Python's rules (class bodies are not
+    visible from nested scopes).
+    """
+
+    __slots__ = ("kind", "node", "parent", "module", "symbols", "globals", "nonlocals", "star_import")
+
+    def __init__(self, kind: str, node: ast.AST, parent: Optional["Scope"]):
+        self.kind = kind
+        self.node = node
+        self.parent = parent
+        self.module: "Scope" = parent.module if parent else self
+        self.symbols: Dict[str, Symbol] = {}
+        self.globals: Set[str] = set()
+        self.nonlocals: Set[str] = set()
+        self.star_import = False
+
+    def lookup(self, name: str) -> Optional[Symbol]:
+        if name in self.globals:
+            return self.module.symbols.get(name)
+
+        if name not in self.nonlocals:
+            sym = self.symbols.get(name)
+            if sym is not None:
+                return sym
+
+        scope = self.parent
+        while scope is not None:
+            if scope.kind != "class":
+                if name in scope.globals:
+                    return self.module.symbols.get(name)
+                sym = scope.symbols.get(name)
+                if sym is not None:
+                    return sym
+            scope = scope.parent
+        return None
+
+
+class SymbolTableBuilder(CancellableVisitor):
+    """
+    Single pass: bindings are collected per scope while Name loads are
+    queued, then every load is resolved once the whole file is known
+    (a function may use a global defined further down).
+    """
+
+    def __init__(self, tree: ast.AST):
+        self.module = Scope("module", tree, None)
+        self.scopes: List[Scope] = [self.module]
+        self.by_node: Dict[ast.AST, Scope] = {tree: self.module}
+        self.scope = self.module
+
+        self.resolution: Dict[ast.AST, Symbol] = {}
+        self.unresolved: List[ast.Name] = []
+
+        self._loads: List[Tuple[ast.Name, Scope]] = []
+        self._nonlocal_binds: List[Tuple[Scope, ast.AST, str, int]] = []
+        self._direct: Set[ast.AST] = set()
+
+    # -----------------------------
+    # scope helpers
+    # -----------------------------
+    def push(self, kind: str, node: ast.AST) -> Scope:
+        scope = Scope(kind, node, self.scope)
+        self.scopes.append(scope)
+        self.by_node[node] = scope
+        self.scope = scope
+        return scope
+
+    def pop(self):
+        self.scope = self.scope.parent
+
+    def bind(self, name: str, node: ast.AST, flags: int, scope: Optional[Scope] = None) -> Optional[Symbol]:
+        scope = scope or self.scope
+
+        if name in scope.nonlocals:
+            self._nonlocal_binds.append((scope, node, name, flags))
+            return None
+        if name in scope.globals:
+            scope = scope.module
+
+        sym = scope.symbols.get(name)
+        if sym is None:
+            sym = scope.symbols[name] = Symbol(name, scope)
+        sym.flags |= flags
+        sym.defs.append(node)
+        self.resolution[node] = sym
+        return sym
+
+    def visit_all(self, nodes):
+        for node in nodes:
+            if node is not None:
+                self.visit(node)
+
+    # -----------------------------
+    # definitions
+    # -----------------------------
+    def _visit_arguments(self, args: ast.arguments, kind: str):
+        self.visit_all(args.defaults)
+        self.visit_all(args.kw_defaults)
+        params = args.posonlyargs + args.args + args.kwonlyargs
+        if args.vararg:
+            params.append(args.vararg)
+        if args.kwarg:
+            params.append(args.kwarg)
+        if kind == "function":
+            self.visit_all(p.annotation for p in params)
+        return params
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self.visit_all(node.decorator_list)
+        params = self._visit_arguments(node.args, "function")
+        self.visit_all([node.returns])
+        self.bind(node.name, node, FUNCTION)
+
+        self.push("function", node)
+        for p in params:
+            self.bind(p.arg, p, PARAM)
+        self.visit_all(node.body)
+        self.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node: ast.Lambda):
+        params = self._visit_arguments(node.args, "lambda")
+
+        self.push("lambda", node)
+        for p in params:
+            self.bind(p.arg, p, PARAM)
+        self.visit(node.body)
+        self.pop()
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.visit_all(node.decorator_list)
+        self.visit_all(node.bases)
+        self.visit_all(node.keywords)
+        self.bind(node.name, node, CLASS)
+
+        self.push("class", node)
+        self.visit_all(node.body)
+        self.pop()
+
+    def _visit_comprehension(self, node: ast.AST):
+        # The first iterable is evaluated in the enclosing scope
+        first = node.generators[0]
+        self.visit(first.iter)
+
+        self.push("comprehension", node)
+        for i, gen in enumerate(node.generators):
+            if i:
+                self.visit(gen.iter)
+            self.visit(gen.target)
+            self.visit_all(gen.ifs)
+
+        if isinstance(node, ast.DictComp):
+            self.visit(node.key)
+            self.visit(node.value)
+        else:
+            self.visit(node.elt)
+        self.pop()
+
+    visit_ListComp = _visit_comprehension
+    visit_SetComp = _visit_comprehension
+    visit_DictComp = _visit_comprehension
+    visit_GeneratorExp = _visit_comprehension
+
+    # -----------------------------
+    # imports
+    # -----------------------------
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.asname:
+                sym = self.bind(alias.asname, alias, IMPORTED)
+                qualified = alias.name
+            else:
+                local = alias.name.split(".")[0]
+                sym = self.bind(local, alias, IMPORTED)
+                qualified = local
+            if sym is not None and sym.qualified is None:
+                sym.qualified = qualified
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        base = "." * (node.level or 0) + (node.module or "")
+        sep = "." if node.module else ""
+
+        for alias in node.names:
+            if alias.name == "*":
+                self.scope.star_import = True
+                continue
+            sym = self.bind(alias.asname or alias.name, alias, IMPORTED)
+            if sym is not None and sym.qualified is None:
+                sym.qualified = f"{base}{sep}{alias.name}"
+                sym.imported_from = base
+
+    def visit_Global(self, node: ast.Global):
+        self.scope.globals.update(node.names)
+
+    def visit_Nonlocal(self, node: ast.Nonlocal):
+        self.scope.nonlocals.update(node.names)
+
+    # -----------------------------
+    # assignments
+    # -----------------------------
+    def _mark_direct(self, target: Optional[ast.AST]):
+        if isinstance(target, ast.Name):
+            self._direct.add(target)
+
+    def visit_Assign(self, node: ast.Assign):
+        for target in node.targets:
+            self._mark_direct(target)
+        self.generic_visit(node)
+
+    def visit_For(self, node: ast.For):
+        self._mark_direct(node.target)
+        self.generic_visit(node)
+
+    visit_AsyncFor = visit_For
+
+    def visit_With(self, node: ast.With):
+        for item in node.items:
+            self._mark_direct(item.optional_vars)
+        self.generic_visit(node)
+
+    visit_AsyncWith = visit_With
+
+    def visit_NamedExpr(self, node: ast.NamedExpr):
+        self.visit(node.value)
+
+        # Walrus inside a comprehension binds in the enclosing scope
+        scope = self.scope
+        while scope.kind == "comprehension":
+            scope = scope.parent
+        self.bind(node.target.id, node.target, ASSIGNED, scope)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        self.visit_all([node.type])
+        if node.name:
+            self.bind(node.name, node, ASSIGNED)
+        self.visit_all(node.body)
+
+    def _visit_capture(self, node: ast.AST):
+        name = getattr(node, "name", None) or getattr(node, "rest", None)
+        if name:
+            self.bind(name, node, ASSIGNED)
+        self.generic_visit(node)
+
+    visit_MatchAs = _visit_capture
+    visit_MatchStar = _visit_capture
+    visit_MatchMapping = _visit_capture
+
+    def visit_Name(self, node: ast.Name):
+        if isinstance(node.ctx, ast.Load):
+            self._loads.append((node, self.scope))
+        elif isinstance(node.ctx, ast.Store):
+            flags = ASSIGNED | DIRECT if node in self._direct else ASSIGNED
+            self.bind(node.id, node, flags)
+        else:
+            self.bind(node.id, node, 0)
+
+    # -----------------------------
+    # resolution
+    # -----------------------------
+    def _enclosing_binding(self, scope: Scope, name: str) -> Optional[Symbol]:
+        outer = scope.parent
+        while outer is not None and outer.kind != "module":
+            if outer.kind != "class" and name in outer.symbols:
+                return outer.symbols[name]
+            outer = outer.parent
+        return None
+
+    def finish(self):
+        tick = self.deadline.tick
+        for scope, node, name, flags in self._nonlocal_binds:
+            sym = self._enclosing_binding(scope, name)
+            if sym is not None:
+                sym.flags |= flags
+                sym.defs.append(node)
+                self.resolution[node] = sym
+
+        for node, scope in self._loads:
+            tick()
+            if node.id in scope.nonlocals:
+                sym = self._enclosing_binding(scope, node.id)
+            else:
+                sym = scope.lookup(node.id)
+
+            if sym is None:
+                self.unresolved.append(node)
+            else:
+                sym.uses.append(node)
+                self.resolution[node] = sym
+
+        self._loads = []
+        self._nonlocal_binds = []
+        self._direct = set()
+
+
+class SymbolTable:
+    """
+    Per-file symbol table and use-def index.
+
+    Built in one pass; afterwards every lookup is a dict hit:
+    - resolve(name_node)      → Symbol the Name binds / reads (or None)
+    - scope_of(scope_node)    → Scope of a module / def / class / lambda / comprehension
+    - qualified_name(expr)    → dotted name with import aliases expanded
+    """
+
+    __slots__ = ("module", "scopes", "unresolved", "_by_node", "_resolution")
+
+    def __init__(self, builder: SymbolTableBuilder):
+        self.module = builder.module
+        self.scopes = builder.scopes
+        self.unresolved = builder.unresolved
+        self._by_node = builder.by_node
+        self._resolution = builder.resolution
+
+    @classmethod
+    def from_tree(cls, tree: ast.AST, deadline: Deadline = NO_DEADLINE) -> "SymbolTable":
+        builder = SymbolTableBuilder(tree)
+        builder.deadline = deadline
+        builder.visit_all(tree.body)
+        builder.finish()
+        return cls(builder)
+
+    @classmethod
+    def empty(cls) -> "SymbolTable":
+        return cls.from_tree(ast.Module(body=[], type_ignores=[]))
+
+    def scope_of(self, node: ast.AST) -> Optional[Scope]:
+        return self._by_node.get(node)
+
+    def resolve(self, node: ast.AST) -> Optional[Symbol]:
+        return self._resolution.get(node)
+
+    def qualified_name(self, node: ast.AST) -> Optional[str]:
+        """
+        `np.linalg.norm` → "numpy.linalg.norm" after `import numpy as np`.
+        Unbound names (builtins / globals from elsewhere) keep their own
+        name; attributes of local objects return None.
+        """
+        attrs: List[str] = []
+        while isinstance(node, ast.Attribute):
+            attrs.append(node.attr)
+            node = node.value
+
+        if not isinstance(node, ast.Name):
+            return None
+
+        sym = self._resolution.get(node)
+        if sym is None:
+            root = node.id
+        elif sym.qualified is not None:
+            root = sym.qualified
+        else:
+            return None
+
+        attrs.append(root)
+        return ".".join(reversed(attrs))
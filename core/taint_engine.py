@@ -1,75 +1,499 @@
 # core/taint_engine.py
 import ast
-from typing import List, Dict, Set
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from core.file_context import FileContext
+from core.finding import Finding
+from core.lru import LRUCache
+from core.symbol_table import FUNCTION, Scope, Symbol, SymbolTable
 
 TAINT_SOURCES = {"input"}
 TAINT_SINKS = {"eval", "exec", "os.system"}
 
+SUMMARY_CACHE_SIZE = 4096
+MAX_PASSES = 16
+
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+COMPREHENSION_NODES = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+# ("source", None) | ("param", index) | ("global", name)
+Label = Tuple[str, object]
+SOURCE_LABEL: Label = ("source", None)
+
+
+@dataclass(frozen=True)
+class TaintConfig:
+    """
+    Source / sink sets, matched on import-resolved dotted names.
+
+    Org policies may extend the defaults:
+        "taint": {"sources": ["flask.request.args.get"], "sinks": ["subprocess.call"]}
+    """
+
+    sources: FrozenSet[str]
+    sinks: FrozenSet[str]
+
+    @classmethod
+    def from_policy(cls, cfg: Optional[dict]) -> "TaintConfig":
+        if not cfg:
+            return DEFAULT_TAINT_CONFIG
+        return cls(
+            sources=frozenset(TAINT_SOURCES) | frozenset(cfg.get("sources") or ()),
+            sinks=frozenset(TAINT_SINKS) | frozenset(cfg.get("sinks") or ()),
+        )
+
 
-def _issue(rule_id, severity, category, message, confidence="high"):
-    return {
-        "rule_id": rule_id,
-        "severity": severity,
-        "category": category,
-        "message": message,
-        "confidence": confidence,
-    }
+DEFAULT_TAINT_CONFIG = TaintConfig(frozenset(TAINT_SOURCES), frozenset(TAINT_SINKS))
 
 
-class TaintVisitor(ast.NodeVisitor):
+@dataclass(frozen=True)
+class FunctionSummary:
+    """
+    What a function does with its inputs, independent of call site.
+
+    returns: labels whose data may flow to the return value
+    sinks:   (label, sink, call ordinal) — data reaching a sink call;
+             the ordinal indexes Call nodes of the body in walk order,
+             so a cached summary maps back onto any identical body.
+    """
+
+    params: Tuple[str, ...]
+    returns: FrozenSet[Label]
+    sinks: Tuple[Tuple[Label, str, int], ...]
+
+
+# body hash + params + name resolution + config + callee summaries
+# → summary (LRU)
+_SUMMARY_CACHE = LRUCache(SUMMARY_CACHE_SIZE)
+
+
+def _param_names(node: ast.AST) -> Tuple[str, ...]:
+    args = node.args
+    return tuple(a.arg for a in args.posonlyargs + args.args + args.kwonlyargs)
+
+
+def _body_refs(node: ast.AST) -> Tuple[List[ast.Call], List[ast.Name]]:
+    calls: List[ast.Call] = []
+    names: List[ast.Name] = []
+    for stmt in node.body:
+        for n in ast.walk(stmt):
+            if isinstance(n, ast.Call):
+                calls.append(n)
+            elif isinstance(n, ast.Name):
+                names.append(n)
+    return calls, names
+
+
+class TaintVisitor:
     """
     REALISTIC TAINT ENGINE
     Only warns when input reaches dangerous sink.
     Not spammy.
+
+    Flow-insensitive, per binding, to a fixpoint per scope. Taint
+    follows assignments, containers, f-strings, attribute / subscript
+    access and unknown calls (arguments → result). Calls to functions
+    defined in the file apply that function's summary instead; each
+    summary is computed once and memoized by body hash.
+    """
+
+    def __init__(self, ctx: FileContext, config: TaintConfig = DEFAULT_TAINT_CONFIG):
+        self.ctx = ctx
+        self.symbols: SymbolTable = ctx.symbols
+        self.config = config
+        self.issues: List[Finding] = []
+
+        self.summaries: Dict[ast.AST, Optional[FunctionSummary]] = {}
+        self.body_calls: Dict[ast.AST, List[ast.Call]] = {}
+        self._in_progress: Set[ast.AST] = set()
+        self._reported: Set[Tuple[int, str]] = set()
+
+    def run(self) -> List[Finding]:
+        functions = [s.node for s in self.symbols.scopes if s.kind == "function"]
+        for fn in functions:
+            self.summary_of(fn)
+
+        module = ScopeTaint(self, self.symbols.module)
+        module.run(self.ctx.tree.body)
+        for (call, sink), mask in module.hits.items():
+            if mask & 1:
+                self.report(call, sink)
+
+        for fn in functions:
+            summary = self.summaries[fn]
+            calls = self.body_calls[fn]
+            for (kind, value), sink, ordinal in summary.sinks:
+                if kind == "source":
+                    self.report(calls[ordinal], sink)
+                elif kind == "global" and module.global_mask(value) & 1:
+                    self.report(calls[ordinal], sink)
+
+        self.issues.sort(key=lambda f: (f.line or 0, f.column or 0))
+        return self.issues
+
+    def report(self, call: ast.Call, sink: str):
+        key = (id(call), sink)
+        if key in self._reported:
+            return
+        self._reported.add(key)
+        self.issues.append(
+            Finding(
+                "TAINT_SINK_REACHED",
+                "error",
+                "security",
+                f"Tainted input reaches dangerous sink '{sink}'.",
+                "high",
+                symbol=sink,
+            ).at(call, self.ctx.source_lines)
+        )
+
+    # -----------------------------
+    # Summaries
+    # -----------------------------
+    def callee(self, func: ast.AST) -> Optional[ast.AST]:
+        """Local function a call resolves to, if unambiguous."""
+        if not isinstance(func, ast.Name):
+            return None
+        sym = self.symbols.resolve(func)
+        if sym is None or not sym.flags & FUNCTION or len(sym.defs) != 1:
+            return None
+        node = sym.defs[0]
+        return node if isinstance(node, FUNCTION_NODES) else None
+
+    def summary_of(self, fn: ast.AST) -> Optional[FunctionSummary]:
+        if fn in self.summaries:
+            return self.summaries[fn]
+        if fn in self._in_progress:
+            # recursion: treated as an unknown call
+            return None
+        self._in_progress.add(fn)
+
+        calls, names = _body_refs(fn)
+        self.body_calls[fn] = calls
+        callees = set()
+        for call in calls:
+            target = self.callee(call.func)
+            if target is not None and target is not fn:
+                callees.add((call.func.id, self.summary_of(target)))
+
+        key = (
+            self.ctx.body_hash(fn),
+            _param_names(fn),
+            self.resolution_key(fn, calls, names),
+            self.config,
+            tuple(sorted(callees, key=repr)),
+        )
+        summary = _SUMMARY_CACHE.get(key)
+        if summary is None:
+            summary = self._compute_summary(fn, calls)
+            _SUMMARY_CACHE.put(key, summary)
+
+        self._in_progress.discard(fn)
+        self.summaries[fn] = summary
+        return summary
+
+    def resolution_key(self, fn: ast.AST, calls: List[ast.Call], names: List[ast.Name]) -> Tuple:
+        """
+        How the body's names resolve in this file: the import-resolved
+        name of every call (sources / sinks match on it) and the scope
+        each free name binds in. The same body under other imports or
+        globals gets its own summary.
+        """
+        scope = self.symbols.scope_of(fn)
+        free = set()
+        for name in names:
+            sym = self.symbols.resolve(name)
+            if sym is None:
+                free.add((name.id, None))
+            elif sym.scope is not scope:
+                free.add((name.id, sym.scope.kind))
+        return (
+            tuple(self.symbols.qualified_name(call.func) for call in calls),
+            tuple(sorted(free, key=repr)),
+        )
+
+    def _compute_summary(self, fn: ast.AST, calls: List[ast.Call]) -> FunctionSummary:
+        scope = self.symbols.scope_of(fn)
+        params = _param_names(fn)
+
+        state = ScopeTaint(self, scope)
+        for idx, name in enumerate(params):
+            sym = scope.symbols.get(name)
+            if sym is not None:
+                state.env[sym] = state.label_bit(("param", idx))
+        state.run(fn.body)
+
+        ordinal = {id(call): i for i, call in enumerate(calls)}
+        sinks = set()
+        for (call, sink), mask in state.hits.items():
+            for label in state.labels_of(mask):
+                sinks.add((label, sink, ordinal[id(call)]))
+
+        return FunctionSummary(
+            params=params,
+            returns=frozenset(state.labels_of(state.returns)),
+            sinks=tuple(sorted(sinks, key=repr)),
+        )
+
+
+class ScopeTaint:
     """
+    Taint state of one module / function body.
+    Bit i of a mask stands for labels[i]; bit 0 is the taint source.
+    """
+
+    def __init__(self, analyzer: TaintVisitor, scope: Scope):
+        self.analyzer = analyzer
+        self.symbols = analyzer.symbols
+        self.config = analyzer.config
+        self.scope = scope
+        self.tick = analyzer.ctx.deadline.tick
+
+        self.labels: List[Label] = [SOURCE_LABEL]
+        self.bit_of: Dict[Label, int] = {SOURCE_LABEL: 1}
+
+        self.env: Dict[Symbol, int] = {}
+        self.hits: Dict[Tuple[ast.Call, str], int] = {}
+        self.returns = 0
+        self.changed = False
+
+    def label_bit(self, label: Label) -> int:
+        bit = self.bit_of.get(label)
+        if bit is None:
+            bit = self.bit_of[label] = 1 << len(self.labels)
+            self.labels.append(label)
+        return bit
+
+    def labels_of(self, mask: int) -> List[Label]:
+        return [label for i, label in enumerate(self.labels) if mask >> i & 1]
+
+    def global_mask(self, name: str) -> int:
+        if self.scope.kind == "module":
+            sym = self.scope.symbols.get(name)
+            return self.env.get(sym, 0) if sym is not None else 0
+        return self.label_bit(("global", name))
+
+    def run(self, body: List[ast.stmt]):
+        for _ in range(MAX_PASSES):
+            self.changed = False
+            self.stmts(body)
+            if not self.changed:
+                break
+
+    # -----------------------------
+    # state updates (monotone)
+    # -----------------------------
+    def _taint(self, sym: Optional[Symbol], mask: int):
+        if sym is None or not mask:
+            return
+        old = self.env.get(sym, 0)
+        if old | mask != old:
+            self.env[sym] = old | mask
+            self.changed = True
+
+    def hit(self, call: ast.Call, sink: str, mask: int):
+        if not mask:
+            return
+        old = self.hits.get((call, sink), 0)
+        if old | mask != old:
+            self.hits[(call, sink)] = old | mask
+            self.changed = True
+
+    def assign(self, target: ast.AST, mask: int):
+        if isinstance(target, ast.Name):
+            self._taint(self.symbols.resolve(target), mask)
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            for elt in target.elts:
+                self.assign(elt, mask)
+        elif isinstance(target, ast.Starred):
+            self.assign(target.value, mask)
+        elif isinstance(target, (ast.Attribute, ast.Subscript)):
+            # field-insensitive: the whole object becomes tainted
+            self.expr(target.value)
+            if isinstance(target, ast.Subscript):
+                self.expr(target.slice)
+            base = target.value
+            while isinstance(base, (ast.Attribute, ast.Subscript)):
+                base = base.value
+            if isinstance(base, ast.Name):
+                self._taint(self.symbols.resolve(base), mask)
+
+    # -----------------------------
+    # statements
+    # -----------------------------
+    def stmts(self, body: List[ast.stmt]):
+        for node in body:
+            self.stmt(node)
+
+    def stmt(self, node: ast.stmt):
+        self.tick()
+        if isinstance(node, FUNCTION_NODES):
+            # defaults / decorators run here; the body has its own summary
+            args = node.args
+            for expr in node.decorator_list + args.defaults + args.kw_defaults:
+                self.expr(expr)
+
+        elif isinstance(node, ast.ClassDef):
+            for expr in node.decorator_list + node.bases:
+                self.expr(expr)
+            self.stmts(node.body)
+
+        elif isinstance(node, ast.Assign):
+            mask = self.expr(node.value)
+            for target in node.targets:
+                self.assign(target, mask)
+
+        elif isinstance(node, (ast.AugAssign, ast.AnnAssign)):
+            if node.value is not None:
+                self.assign(node.target, self.expr(node.value))
+
+        elif isinstance(node, (ast.For, ast.AsyncFor)):
+            self.assign(node.target, self.expr(node.iter))
+            self.stmts(node.body)
+            self.stmts(node.orelse)
+
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            for item in node.items:
+                mask = self.expr(item.context_expr)
+                if item.optional_vars is not None:
+                    self.assign(item.optional_vars, mask)
+            self.stmts(node.body)
+
+        elif isinstance(node, ast.Return):
+            if node.value is not None:
+                mask = self.expr(node.value)
+                if self.returns | mask != self.returns:
+                    self.returns |= mask
+                    self.changed = True
+
+        elif isinstance(node, ast.Match):
+            mask = self.expr(node.subject)
+            for case in node.cases:
+                for pattern in ast.walk(case.pattern):
+                    if isinstance(pattern, (ast.MatchAs, ast.MatchStar, ast.MatchMapping)):
+                        self._taint(self.symbols.resolve(pattern), mask)
+                self.expr(case.guard)
+                self.stmts(case.body)
+
+        else:
+            # If / While / Try / Expr / Raise / Assert / ...
+            for field, value in ast.iter_fields(node):
+                if isinstance(value, ast.expr):
+                    self.expr(value)
+                elif isinstance(value, list):
+                    for child in value:
+                        if isinstance(child, ast.stmt):
+                            self.stmt(child)
+                        elif isinstance(child, ast.ExceptHandler):
+                            self.expr(child.type)
+                            self.stmts(child.body)
+                        elif isinstance(child, ast.expr):
+                            self.expr(child)
+
+    # -----------------------------
+    # expressions
+    # -----------------------------
+    def expr(self, node: Optional[ast.AST]) -> int:
+        if node is None or isinstance(node, (ast.Constant, ast.Lambda)):
+            return 0
+        self.tick()
+
+        if isinstance(node, ast.Name):
+            sym = self.symbols.resolve(node)
+            if sym is None:
+                return 0
+            if sym.scope.kind == "module" and self.scope.kind != "module":
+                return self.global_mask(sym.name)
+            return self.env.get(sym, 0)
+
+        if isinstance(node, ast.Call):
+            return self.call(node)
+
+        if isinstance(node, ast.NamedExpr):
+            mask = self.expr(node.value)
+            self.assign(node.target, mask)
+            return mask
+
+        if isinstance(node, COMPREHENSION_NODES):
+            mask = 0
+            for gen in node.generators:
+                self.assign(gen.target, self.expr(gen.iter))
+                for cond in gen.ifs:
+                    self.expr(cond)
+            if isinstance(node, ast.DictComp):
+                mask |= self.expr(node.key) | self.expr(node.value)
+            else:
+                mask |= self.expr(node.elt)
+            return mask
+
+        mask = 0
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.keyword):
+                child = child.value
+            if isinstance(child, ast.expr):
+                mask |= self.expr(child)
+
+        # comparisons yield booleans
+        return 0 if isinstance(node, ast.Compare) else mask
+
+    def call(self, node: ast.Call) -> int:
+        name = self.symbols.qualified_name(node.func)
+
+        positional = [self.expr(a) for a in node.args]
+        keywords = {k.arg: self.expr(k.value) for k in node.keywords}
+        receiver = self.expr(node.func.value) if isinstance(node.func, ast.Attribute) else 0
+
+        everything = receiver
+        for mask in positional:
+            everything |= mask
+        for mask in keywords.values():
+            everything |= mask
+
+        if name in self.config.sinks:
+            self.hit(node, name, everything)
+
+        if name in self.config.sources:
+            return 1
+
+        target = self.analyzer.callee(node.func)
+        summary = self.analyzer.summary_of(target) if target is not None else None
+        if summary is None:
+            # unknown call: arguments flow into the result
+            return everything
+
+        # map arguments onto parameters
+        unpacked = any(isinstance(a, ast.Starred) for a in node.args) or None in keywords
+        param_masks = []
+        for idx, param in enumerate(summary.params):
+            if unpacked:
+                param_masks.append(everything)
+            else:
+                mask = positional[idx] if idx < len(positional) else 0
+                param_masks.append(mask | keywords.get(param, 0))
+
+        for (kind, value), sink, _ in summary.sinks:
+            if kind == "param":
+                self.hit(node, sink, param_masks[value])
+
+        result = 0
+        for kind, value in summary.returns:
+            if kind == "source":
+                result |= 1
+            elif kind == "param":
+                result |= param_masks[value]
+            else:
+                result |= self.global_mask(value)
+        return result
+
 
-    def __init__(self):
-        self.issues: List[Dict] = []
-        self.tainted: Set[str] = set()
-
-    def visit_Assign(self, node: ast.Assign):
-        if isinstance(node.value, ast.Call):
-            if isinstance(node.value.func, ast.Name):
-                if node.value.func.id in TAINT_SOURCES:
-                    for t in node.targets:
-                        if isinstance(t, ast.Name):
-                            self.tainted.add(t.id)
-        self.generic_visit(node)
-
-    def visit_Call(self, node: ast.Call):
-        sink = None
-
-        if isinstance(node.func, ast.Name):
-            if node.func.id in TAINT_SINKS:
-                sink = node.func.id
-
-        if isinstance(node.func, ast.Attribute):
-            if isinstance(node.func.value, ast.Name):
-                full = f"{node.func.value.id}.{node.func.attr}"
-                if full in TAINT_SINKS:
-                    sink = full
-
-        if sink:
-            for arg in node.args:
-                if isinstance(arg, ast.Name) and arg.id in self.tainted:
-                    self.issues.append(
-                        _issue(
-                            "TAINT_SINK_REACHED",
-                            "error",
-                            "security",
-                            f"Tainted input reaches dangerous sink '{sink}'.",
-                        )
-                    )
-
-        self.generic_visit(node)
-
-
-def analyze_taint(code: str) -> List[Dict]:
-    try:
-        tree = ast.parse(code)
-    except SyntaxError:
+def analyze_taint(
+    code: str,
+    ctx: Optional[FileContext] = None,
+    config: Optional[TaintConfig] = None,
+) -> List[Finding]:
+    ctx = ctx or FileContext(code)
+    if ctx.tree is None:
         return []
 
-    visitor = TaintVisitor()
-    visitor.visit(tree)
-    return visitor.issues
\ No newline at end of file
+    return TaintVisitor(ctx, config or DEFAULT_TAINT_CONFIG).run()
@@ -1,16 +1,18 @@
 # llmexplainer/llm_wrapper.py
 import os
-import requests
 from .prompt_contract import build_prompt
 
 API_KEY = os.getenv("LLM_API_KEY")
-API_URL = "https://api.groq.com/openai/v1/chat/completions"
+API_URL = os.getenv("LLM_API_URL", "https://api.groq.com/openai/v1/chat/completions")
 
 def explain_with_llm(findings: list[dict]) -> str:
     # Hard fail early if key missing (prevents silent crashes)
     if not API_KEY:
         return "LLM API key is not configured."
 
+    # imported on first use: keeps `requests` off the service cold start
+    import requests
+
     prompt = build_prompt(findings)
 
     response = requests.post(
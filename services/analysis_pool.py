@@ -0,0 +1,303 @@
+# services/analysis_pool.py
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+from core.deadline import REVIEW_DEADLINE_SECONDS
+from core.finding import Finding
+
+# POSIX only; limits are skipped where unavailable
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ANALYSIS_WORKERS = int(os.getenv("WISDOM_ANALYSIS_WORKERS", "0"))
+WORKER_MEMORY_MB = int(os.getenv("WISDOM_WORKER_MEMORY_MB", "1024"))
+WORKER_CPU_SECONDS = int(os.getenv("WISDOM_WORKER_CPU_SECONDS", "30"))
+
+# Watchdog: cooperative deadline + this much before a worker is killed
+WATCHDOG_GRACE_SECONDS = 5.0
+
+# Sources at least this large go through shared memory, not the pipe
+SHM_THRESHOLD = 64 * 1024
+
+
+# -----------------------------
+# Worker process
+# -----------------------------
+def _apply_memory_limit(memory_mb: int):
+    if resource is None or not memory_mb:
+        return
+    limit = memory_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _arm_cpu_limit(cpu_seconds: int):
+    """
+    RLIMIT_CPU counts the whole process lifetime, so the soft limit is
+    moved to "CPU used so far + budget" before every job. Exceeding it
+    raises SIGXCPU, which terminates the worker.
+    """
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + cpu_seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _read_code(ref: Tuple) -> str:
+    if ref[0] == "inline":
+        return ref[1]
+
+    _, name, size = ref
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(shm.buf[:size]).decode("utf-8")
+    finally:
+        shm.close()
+
+
+def _worker_main(conn, memory_mb: int, cpu_seconds: int):
+    # The server owns Ctrl-C; workers are stopped through the pipe
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _apply_memory_limit(memory_mb)
+
+    from services.review_brain import ReviewBrain
+    brain = ReviewBrain()
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+
+        payload, ref = job
+        try:
+            payload["code"] = _read_code(ref)
+            _arm_cpu_limit(cpu_seconds)
+            findings = brain.review_code(payload)
+            # stage timings the brain wrote into this copy of the payload
+            conn.send(("ok", (findings, payload.get("timings"))))
+        except MemoryError:
+            # heap state is suspect after a failed allocation: report and exit
+            try:
+                conn.send(("memory", None))
+            finally:
+                return
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+# -----------------------------
+# Parent side
+# -----------------------------
+def _aborted(reason: str) -> Finding:
+    return Finding(
+        "ANALYSIS_ABORTED",
+        "warning",
+        "reliability",
+        f"{reason}; no findings are available for this file.",
+        "high",
+    )
+
+
+def _killed_by_watchdog() -> Finding:
+    return Finding(
+        "ANALYSIS_TIMEOUT",
+        "warning",
+        "reliability",
+        "Analysis worker exceeded its deadline and was restarted; no findings are available for this file.",
+        "high",
+    )
+
+
+class _Slot:
+    """
+    One worker process plus the dispatcher thread that feeds it.
+    The thread doubles as the worker's watchdog: it waits on the pipe
+    with a timeout and kills / respawns the process on expiry or death.
+    """
+
+    def __init__(self, pool: "AnalysisPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.thread = threading.Thread(
+            target=self.loop, name=f"wisdom-dispatch-{index}", daemon=True,
+        )
+
+    def spawn(self):
+        ctx = self.pool.mp
+        parent_conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.pool.memory_mb, self.pool.cpu_seconds),
+            name=f"wisdom-analysis-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+    def kill(self):
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+        if self.process is not None:
+            self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+        self.process = self.conn = None
+
+    def respawn(self):
+        self.kill()
+        self.spawn()
+        self.pool.restarts += 1
+
+    def loop(self):
+        while True:
+            item = self.pool.jobs.get()
+            if item is None:
+                return
+            payload, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.run(payload))
+            except Exception as e:
+                future.set_exception(e)
+
+    def run(self, payload: dict) -> List[Finding]:
+        if self.process is None or not self.process.is_alive():
+            self.respawn()
+
+        payload = dict(payload)
+        code = payload.pop("code", "")
+        data = code.encode("utf-8")
+
+        shm = None
+        if len(data) >= SHM_THRESHOLD:
+            shm = shared_memory.SharedMemory(create=True, size=len(data))
+            shm.buf[:len(data)] = data
+            ref = ("shm", shm.name, len(data))
+        else:
+            ref = ("inline", code)
+
+        deadline = payload.get("deadline", REVIEW_DEADLINE_SECONDS)
+        timeout = None if deadline is None else deadline + WATCHDOG_GRACE_SECONDS
+
+        try:
+            try:
+                self.conn.send((payload, ref))
+            except OSError:
+                self.respawn()
+                self.conn.send((payload, ref))
+
+            if not self.conn.poll(timeout):
+                self.respawn()
+                return [_killed_by_watchdog()]
+
+            try:
+                status, result = self.conn.recv()
+            except (EOFError, OSError):
+                self.process.join(1)
+                exitcode = self.process.exitcode
+                self.respawn()
+                if hasattr(signal, "SIGXCPU") and exitcode == -signal.SIGXCPU:
+                    return [_aborted(f"Analysis exceeded the {self.pool.cpu_seconds}s CPU limit")]
+                return [_aborted(f"Analysis worker crashed (exit code {exitcode})")]
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+        if status == "ok":
+            findings, timings = result
+            # the caller's dict (shallow copy above); the worker filled its own
+            if timings and payload.get("timings") is not None:
+                payload["timings"].update(timings)
+            return findings
+        if status == "memory":
+            self.respawn()
+            return [_aborted(f"Analysis exceeded the {self.pool.memory_mb} MB memory limit")]
+        return [_aborted(f"Analysis failed ({result})")]
+
+
+class AnalysisPool:
+    """
+    Pre-spawned analysis subprocesses.
+
+    Each worker runs its own ReviewBrain under RLIMIT_AS / RLIMIT_CPU.
+    Jobs go through one queue; a runaway parse, a stack overflow or an
+    out-of-memory input only costs a worker restart, never the server
+    process. Large sources are handed over in shared memory.
+
+    Drop-in for ReviewBrain: `pool.review_code(payload)`.
+    """
+
+    def __init__(
+        self,
+        workers: int = ANALYSIS_WORKERS,
+        memory_mb: int = WORKER_MEMORY_MB,
+        cpu_seconds: int = WORKER_CPU_SECONDS,
+    ):
+        self.workers = max(1, workers)
+        self.memory_mb = memory_mb
+        self.cpu_seconds = cpu_seconds
+        # spawn: safe to start from a threaded server
+        self.mp = multiprocessing.get_context("spawn")
+        self.jobs: "queue.Queue[Optional[Tuple[dict, Future]]]" = queue.Queue()
+        self.slots = [_Slot(self, i) for i in range(self.workers)]
+        self.restarts = 0
+        self.started = False
+
+    def start(self):
+        if self.started:
+            return
+        for slot in self.slots:
+            slot.spawn()
+            slot.thread.start()
+        self.started = True
+        print(f"[AnalysisPool] {self.workers} workers ({self.memory_mb} MB, {self.cpu_seconds}s CPU)")
+
+    def submit(self, payload: dict) -> Future:
+        if not self.started:
+            self.start()
+        future: Future = Future()
+        self.jobs.put((payload, future))
+        return future
+
+    def review_code(self, payload: dict) -> List[Finding]:
+        return self.submit(payload).result()
+
+    def shutdown(self):
+        if not self.started:
+            return
+        for _ in self.slots:
+            self.jobs.put(None)
+        for slot in self.slots:
+            slot.thread.join()
+            if slot.conn is not None:
+                try:
+                    slot.conn.send(None)
+                except OSError:
+                    pass
+            if slot.process is not None:
+                slot.process.join(5)
+            slot.kill()
+        self.started = False
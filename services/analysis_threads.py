@@ -0,0 +1,76 @@
+# services/analysis_threads.py
+import os
+import sys
+import sysconfig
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from core.analyzer_plan import ANALYZERS
+
+# Analyzer fan-out within one review:
+#   "auto" — a thread per analyzer when the interpreter runs without
+#            the GIL (CPython 3.13t+), serial otherwise
+#   "0"    — always serial
+#   N      — N threads even with the GIL (benchmarks / tests; no
+#            speedup, analyzers are pure Python)
+ANALYZER_THREADS = os.getenv("WISDOM_ANALYZER_THREADS", "auto").strip().lower()
+
+FREE_THREADED_BUILD = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+
+
+def gil_disabled() -> bool:
+    """
+    True when running without the GIL. Checked per call: a
+    free-threaded build turns the GIL back on at runtime when an
+    extension that does not support free threading is imported.
+    """
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_enabled is not None and not is_enabled()
+
+
+def analyzer_threads(setting: Optional[str] = None, analyzers: int = 8) -> int:
+    """Threads to fan `analyzers` out on; 0 means serial."""
+    setting = ANALYZER_THREADS if setting is None else str(setting).strip().lower()
+    if setting in ("", "auto"):
+        return min(analyzers, os.cpu_count() or 1) if gil_disabled() else 0
+    if setting in ("off", "false", "serial"):
+        return 0
+    return max(0, int(setting))
+
+
+# -----------------------------
+# Shared executor
+# -----------------------------
+# One pool per process, sized on first use for any plan (a thread
+# per analyzer, or a larger WISDOM_ANALYZER_THREADS); request threads
+# submit their analyzers to it and wait. Analyzer tasks never submit
+# tasks, so a full pool only queues, never deadlocks.
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_size = 0
+_executor_lock = threading.Lock()
+
+
+def get_executor(threads: int) -> ThreadPoolExecutor:
+    global _executor, _executor_size
+    with _executor_lock:
+        if _executor is None or _executor_size < threads:
+            # grow only, never shut the old pool down: another request
+            # may still be submitting to it. Once unreferenced, its
+            # threads exit after their queued work.
+            _executor_size = max(threads, len(ANALYZERS))
+            _executor = ThreadPoolExecutor(_executor_size, thread_name_prefix="wisdom-analyzer")
+        return _executor
+
+
+def _reset_after_fork():
+    # worker threads do not survive fork (pre-fork workers, analysis
+    # pool); the child builds its own pool on first use
+    global _executor, _executor_size, _executor_lock
+    _executor = None
+    _executor_size = 0
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,238 @@
+# services/capture.py
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from core.finding import Finding
+
+# Opt-in per org: signed org policy `"capture": {"enabled": true,
+# "sample_rate": 0.1}`, or the operator list below (incident response)
+CAPTURE_DIR = Path(os.getenv("WISDOM_CAPTURE_DIR", "captures"))
+CAPTURE_ORGS = {o.strip() for o in os.getenv("WISDOM_CAPTURE_ORGS", "").split(",") if o.strip()}
+
+# Records are buffered and written as one gzip member per flush
+CAPTURE_FLUSH_RECORDS = int(os.getenv("WISDOM_CAPTURE_FLUSH", "32"))
+
+# v2: "policy" is the effective policy (after the org override) and
+# "verdict_policy" marks verdict-only reviews
+CAPTURE_VERSION = 2
+
+
+# -----------------------------
+# Redaction
+# -----------------------------
+# Secret-looking spans are masked with same-length filler: line and
+# column positions, and therefore findings, are unchanged on replay
+SECRET_PATTERNS = [
+    re.compile(r"-----BEGIN [A-Z ]*PRIVATE KEY-----.*?-----END [A-Z ]*PRIVATE KEY-----", re.S),
+    re.compile(r"\bAKIA[0-9A-Z]{16}\b"),
+    re.compile(r"\bgh[pousr]_[A-Za-z0-9]{36,}\b"),
+    re.compile(r"\bsk-[A-Za-z0-9_-]{20,}\b"),
+    re.compile(r"\bxox[abprs]-[A-Za-z0-9-]{10,}\b"),
+    re.compile(r"\beyJ[A-Za-z0-9_-]{8,}\.[A-Za-z0-9_-]{8,}\.[A-Za-z0-9_-]{8,}\b"),
+    re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"),
+]
+
+# Literal assigned to a secret-named key: password = "...", "api_key": '...'
+ASSIGNED_SECRET = re.compile(
+    r"""(?i)((?:passw(?:or)?d|secret|token|api[_-]?key|access[_-]?key|credential)\w*["']?\s*[:=]\s*[rbuf]{0,2})(["'])([^"'\n]{4,})\2"""
+)
+
+
+def _mask(text: str) -> str:
+    return re.sub(r"[^\n]", "x", text)
+
+
+def redact(code: str) -> Tuple[str, int]:
+    """Mask secrets in place. Returns (redacted code, spans masked)."""
+    count = 0
+
+    def assigned(m: re.Match) -> str:
+        nonlocal count
+        count += 1
+        return m.group(1) + m.group(2) + _mask(m.group(3)) + m.group(2)
+
+    code = ASSIGNED_SECRET.sub(assigned, code)
+
+    def span(m: re.Match) -> str:
+        nonlocal count
+        count += 1
+        return _mask(m.group(0))
+
+    for pattern in SECRET_PATTERNS:
+        code = pattern.sub(span, code)
+    return code, count
+
+
+# -----------------------------
+# Opt-in
+# -----------------------------
+def should_capture(org: Optional[str], org_policy: Optional[dict]) -> bool:
+    if not org:
+        return False
+    if org in CAPTURE_ORGS:
+        return True
+
+    config = (org_policy or {}).get("capture") or {}
+    if not config.get("enabled"):
+        return False
+    return random.random() < float(config.get("sample_rate", 1.0))
+
+
+def finding_key(finding: Finding) -> List:
+    """Identity of a finding for replay diffs."""
+    return [finding.rule_id, finding.line, finding.column, finding.symbol]
+
+
+def findings_digest(keys: Iterable[List]) -> str:
+    data = json.dumps(list(keys), separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+# -----------------------------
+# Archive
+# -----------------------------
+class CaptureWriter:
+    """
+    Append-only archives: <dir>/<org>/<date>-<pid>.jsonl.gz
+
+    One file per process, so uvicorn workers never interleave writes.
+    Each distinct (redacted) source is stored once per file; later
+    records reference it by SHA-256.
+    """
+
+    def __init__(self, root: Path = CAPTURE_DIR, flush_records: int = CAPTURE_FLUSH_RECORDS):
+        self.root = Path(root)
+        self.flush_records = max(1, flush_records)
+        self.lock = threading.Lock()
+        self.buffers: Dict[Path, List[str]] = {}
+        self.stored: Dict[Path, Set[str]] = {}
+
+    def _archive(self, org: str) -> Path:
+        day = datetime.utcnow().strftime("%Y-%m-%d")
+        return self.root / org / f"{day}-{os.getpid()}.jsonl.gz"
+
+    def write(self, org: str, record: dict, code: str):
+        path = self._archive(org)
+        digest = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        record["code_sha256"] = digest
+
+        with self.lock:
+            stored = self.stored.setdefault(path, set())
+            if digest not in stored:
+                record["code"] = code
+                stored.add(digest)
+
+            buffer = self.buffers.setdefault(path, [])
+            buffer.append(json.dumps(record, separators=(",", ":")))
+            if len(buffer) >= self.flush_records:
+                self._flush(path)
+
+    def _flush(self, path: Path):
+        lines = self.buffers.pop(path, None)
+        if not lines:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+        with open(path, "ab") as f:
+            f.write(data)
+
+    def flush(self):
+        with self.lock:
+            for path in list(self.buffers):
+                self._flush(path)
+
+
+_writer: Optional[CaptureWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> CaptureWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = CaptureWriter()
+        return _writer
+
+
+def flush_captures():
+    if _writer is not None:
+        _writer.flush()
+
+
+def capture_request(
+    org: str,
+    endpoint: str,
+    payload: dict,
+    findings: List[Finding],
+    *,
+    policy: Optional[dict] = None,
+    status: Optional[int] = None,
+    timings: Optional[Dict[str, float]] = None,
+):
+    """
+    Store one redacted request with its outcome. `payload` is the
+    analysis payload (code, language, file, scope, org analyzer
+    settings, verdict-only policy), so a replay reproduces the exact
+    analysis input. `policy` is the policy the verdict was given under.
+    """
+    code, redactions = redact(payload.get("code", ""))
+    keys = [finding_key(f) for f in findings]
+
+    record = {
+        "v": CAPTURE_VERSION,
+        "id": str(uuid.uuid4()),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "org": org,
+        "endpoint": endpoint,
+        "file": payload.get("file"),
+        "language": payload.get("language"),
+        "scope": payload.get("scope"),
+        "taint": payload.get("taint"),
+        "rules": payload.get("rules"),
+        "select": payload.get("select"),
+        "verdict_policy": payload.get("verdict_policy"),
+        "policy": policy,
+        "bytes": len(code.encode("utf-8")),
+        "redactions": redactions,
+        "result": {
+            "status": status,
+            "findings": keys,
+            "digest": findings_digest(keys),
+        },
+        "timings": {k: round(v, 6) for k, v in (timings or {}).items()},
+    }
+    get_writer().write(org, record, code)
+
+
+def iter_captures(paths: Iterable[Path]) -> Iterator[dict]:
+    """
+    Records of the given archives (files or directories), with code
+    references resolved.
+    """
+    files: List[Path] = []
+    for path in paths:
+        path = Path(path)
+        files.extend(sorted(path.rglob("*.jsonl.gz")) if path.is_dir() else [path])
+
+    for file in files:
+        sources: Dict[str, str] = {}
+        with gzip.open(file, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "code" in record:
+                    sources[record["code_sha256"]] = record["code"]
+                else:
+                    record["code"] = sources.get(record["code_sha256"])
+                record["archive"] = str(file)
+                yield record
@@ -0,0 +1,140 @@
+# services/ci_review.py
+"""
+Review files for a CI gate.
+
+Runs each file through ReviewBrain + explain, as POST /review does,
+plus the project-wide architecture rules (--project) for the reviewed
+files. The gate is the policy over all their findings together.
+Unlike the service, reviews have no deadline by default
+(WISDOM_CI_DEADLINE, --deadline): a timeout would drop findings
+depending on runner load, so the same commit could get a different
+verdict.
+
+Prints a JSON report; exits 1 when the policy fails.
+
+Usage:
+    python -m services.ci_review examples --project .
+    python -m services.ci_review src/app.py src/db.py --org devsync --sarif wisdom.sarif
+"""
+import argparse
+import contextlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.architecture_engine import analyze_project
+from core.deadline import CI_DEADLINE_SECONDS
+from core.explain_engine import explain_results
+from core.org_policy_loader import load_org_policy
+from core.policy_engine import evaluate_policy
+from core.project_index import ProjectIndex
+from core.sarif_exporter import write_sarif
+from services.review_brain import ReviewBrain, analysis_payload
+
+
+def python_files(paths: List[str]) -> List[str]:
+    """Files as given; directories expanded to their *.py files."""
+    found: List[str] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(str(p) for p in sorted(path.rglob("*.py")))
+        else:
+            found.append(str(path))
+    return found
+
+
+def review_files(
+    brain: ReviewBrain,
+    paths: List[str],
+    org_policy: dict,
+    deadline: Optional[float],
+    project: Optional[ProjectIndex] = None,
+) -> Iterator[Tuple[str, List[Dict]]]:
+    """(path, explained findings) per file, in order."""
+    for path in paths:
+        payload = analysis_payload(
+            path,
+            "python",
+            Path(path).read_text(encoding="utf-8", errors="replace"),
+            scope="ci",
+            org_policy=org_policy,
+        )
+        payload["deadline"] = deadline
+        payload["project"] = project
+        yield path, explain_results(brain.review_code(payload))
+
+
+def project_findings(project: ProjectIndex, paths: List[str], org_policy: dict) -> Dict[str, List[Dict]]:
+    """Project-wide rule findings (cycles, layers, hotspots) on `paths`."""
+    reviewed: Dict[str, str] = {}
+    for path in paths:
+        try:
+            reviewed[Path(path).resolve().relative_to(project.root).as_posix()] = path
+        except ValueError:
+            continue
+
+    return {
+        reviewed[rel]: explain_results(findings)
+        for rel, findings in analyze_project(project, org_policy.get("architecture")).items()
+        if rel in reviewed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Python files or directories to review")
+    parser.add_argument("--org", default=None, help="signed org policy to apply")
+    parser.add_argument("--project", default=None, help="project root: index it and run project-wide rules")
+    parser.add_argument("--profile", default="balanced")
+    parser.add_argument("--warning-threshold", type=int, default=5)
+    parser.add_argument(
+        "--deadline", type=float, default=CI_DEADLINE_SECONDS,
+        help="per-file review deadline in seconds (default: WISDOM_CI_DEADLINE, none)",
+    )
+    parser.add_argument("--sarif", default=None, help="also write findings here as SARIF")
+    args = parser.parse_args()
+
+    paths = python_files(args.paths)
+    files: Dict[str, List[Dict]] = {}
+
+    # stdout carries the JSON report only
+    with contextlib.redirect_stdout(sys.stderr):
+        org_policy = load_org_policy(args.org) if args.org else {}
+        policy = {
+            "policy_version": org_policy.get("policy_version", "v1"),
+            "profile": org_policy.get("profile", args.profile),
+            "warning_threshold": org_policy.get("warning_threshold", args.warning_threshold),
+        }
+
+        # cached between runs; only changed files are re-parsed
+        project = None
+        if args.project:
+            project = ProjectIndex.load(args.project)
+            project.update()
+            project.save()
+
+        brain = ReviewBrain()
+        for path, explained in review_files(brain, paths, org_policy, args.deadline, project):
+            files[path] = explained
+
+        if project:
+            for path, explained in project_findings(project, paths, org_policy).items():
+                files[path].extend(explained)
+
+    if args.sarif:
+        with open(args.sarif, "w") as f:
+            write_sarif(files.items(), f)
+
+    result = evaluate_policy([i for issues in files.values() for i in issues], **policy)
+    report = {
+        "deadline": args.deadline,
+        "policy": result,
+        "files": files,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if result["status"] == "fail" else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+# services/prefork.py
+"""
+Pre-fork launcher for services.wisdom_service (POSIX).
+
+`uvicorn --workers N` starts N fresh interpreters, and each one imports
+the app and builds its own rule tables, policy cache and rule catalog.
+Here the master builds all of that once (import + warm-up) and calls
+gc.freeze(). It then binds the socket and forks N uvicorn workers that
+share those pages copy-on-write. gc.freeze() moves the preloaded
+objects out of the collector's generations, so collections in a
+worker do not write to their GC headers and copy the pages.
+
+The master restarts dead workers and logs each worker's memory:
+- rss:    resident pages, shared ones included
+- pss:    shared pages split between the processes that map them
+- uss:    pages private to the worker
+- shared: resident pages shared with other processes
+The cost of one more worker is roughly its USS.
+
+--measure forks the workers without a server, runs one review in each
+and prints the memory report. --spawn measures fresh interpreters
+instead, i.e. what `uvicorn --workers` costs.
+
+Usage:
+    python -m services.prefork --workers 4 --port 8000
+    python -m services.prefork --workers 4 --measure
+    python -m services.prefork --workers 4 --measure --spawn
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+import traceback
+from statistics import median
+from typing import Callable, Dict, List, Optional
+
+PREFORK_WORKERS = int(os.getenv("WISDOM_PREFORK_WORKERS", "2"))
+
+# Seconds between memory reports in the master log (0: off)
+MEMORY_REPORT_SECONDS = float(os.getenv("WISDOM_MEMORY_REPORT_SECONDS", "300"))
+
+# A worker that dies sooner than this after its fork is restarted with
+# this delay, so a crashing app does not fork in a tight loop
+RESTART_BACKOFF_SECONDS = 1.0
+
+# Workers get this long to finish in-flight requests on shutdown
+SHUTDOWN_GRACE_SECONDS = 30.0
+
+
+# -----------------------------
+# Memory
+# -----------------------------
+def memory_of(pid: int) -> Optional[Dict[str, float]]:
+    """rss / pss / uss / shared MB of a process (Linux smaps_rollup)."""
+    fields: Dict[str, int] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        return None
+
+    def mb(*names: str) -> float:
+        return round(sum(fields.get(n, 0) for n in names) / 1024, 1)
+
+    return {
+        "rss_mb": mb("Rss"),
+        "pss_mb": mb("Pss"),
+        "uss_mb": mb("Private_Clean", "Private_Dirty"),
+        "shared_mb": mb("Shared_Clean", "Shared_Dirty"),
+    }
+
+
+def memory_report(master_pid: Optional[int], worker_pids: List[int]) -> Dict:
+    workers = {pid: memory_of(pid) for pid in worker_pids}
+    measured = [m for m in workers.values() if m]
+    master = memory_of(master_pid) if master_pid else None
+
+    report = {
+        "master": master,
+        "workers": {str(pid): m for pid, m in workers.items()},
+    }
+    if measured:
+        report["summary"] = {
+            "workers": len(measured),
+            "median_rss_mb": median(m["rss_mb"] for m in measured),
+            "median_uss_mb": median(m["uss_mb"] for m in measured),
+            # what the whole group really occupies
+            "total_pss_mb": round(sum(m["pss_mb"] for m in measured) + (master or {}).get("pss_mb", 0), 1),
+        }
+    return report
+
+
+# -----------------------------
+# Master
+# -----------------------------
+def preload(freeze: bool = True):
+    """
+    Import the app and build its read-only state in the master: org
+    policy verification, compiled rule tables, the rule catalog and
+    the analyzers' first-use paths (warm-up on the in-process engine;
+    an analysis pool is started per worker by the lifespan).
+    """
+    if freeze:
+        # no collections while loading: they would leave freed holes
+        # between the long-lived objects that end up frozen
+        gc.disable()
+
+    from core.security.api_auth import API_KEYS
+    from services import wisdom_service
+    from services.warmup import warm_up
+
+    warm_up(wisdom_service.readiness, wisdom_service.brain, API_KEYS.values())
+
+    if freeze:
+        gc.freeze()
+        print(f"[PREFORK] froze {gc.get_freeze_count()} objects")
+
+
+def bind(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _after_fork(freeze: bool):
+    # the master's handlers are for the master; uvicorn installs its own
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # inherited RNG state would make capture sampling identical in
+    # every worker
+    random.seed()
+    if freeze:
+        gc.enable()
+
+
+class PreforkMaster:
+    """
+    Forks `workers` children running `target()` and keeps them alive:
+    dead workers are replaced, SIGTERM / SIGINT stop them all.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[], None],
+        workers: int,
+        freeze: bool = True,
+        report_seconds: float = MEMORY_REPORT_SECONDS,
+    ):
+        self.target = target
+        self.workers = max(1, workers)
+        self.freeze = freeze
+        self.report_seconds = report_seconds
+        self.children: Dict[int, float] = {}   # pid → fork time
+        self.stopping = False
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _after_fork(self.freeze)
+                self.target()
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                # never run the master's cleanup in a child
+                os._exit(code)
+
+        self.children[pid] = time.monotonic()
+        return pid
+
+    def _stop(self, signum, frame):
+        self.stopping = True
+
+    def _reap(self) -> List[float]:
+        """Ages (seconds) of workers that exited since the last call."""
+        ages = []
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            started = self.children.pop(pid, None)
+            if started is None:
+                continue
+            ages.append(time.monotonic() - started)
+            if not self.stopping:
+                print(f"[PREFORK] worker {pid} exited ({os.waitstatus_to_exitcode(status)})")
+        return ages
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        for _ in range(self.workers):
+            self.spawn()
+        print(f"[PREFORK] master {os.getpid()} started {self.workers} workers: {sorted(self.children)}")
+
+        next_report = time.monotonic() + self.report_seconds
+        while not self.stopping:
+            for age in self._reap():
+                if self.stopping:
+                    break
+                if age < RESTART_BACKOFF_SECONDS:
+                    time.sleep(RESTART_BACKOFF_SECONDS)
+                print(f"[PREFORK] restarted worker {self.spawn()}")
+
+            if self.report_seconds and time.monotonic() >= next_report:
+                print("[PREFORK MEMORY]", json.dumps(memory_report(os.getpid(), sorted(self.children))))
+                next_report = time.monotonic() + self.report_seconds
+            time.sleep(0.5)
+
+        self.shutdown()
+
+    def shutdown(self):
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + SHUTDOWN_GRACE_SECONDS
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            self.children.pop(pid, None)
+
+
+# -----------------------------
+# Worker targets
+# -----------------------------
+def serve_target(sock: socket.socket, log_level: str) -> Callable[[], None]:
+    def serve():
+        import uvicorn
+
+        from services.wisdom_service import app
+
+        config = uvicorn.Config(app, lifespan="on", log_level=log_level)
+        uvicorn.Server(config).run(sockets=[sock])
+
+    return serve
+
+
+def _touch_engine():
+    """One review + response, as a worker's first request would."""
+    from core.explain_engine import explain_results
+    from services.serialization import render
+    from services.warmup import WARMUP_SOURCE
+    from services.wisdom_service import brain
+
+    findings = brain.review_code({"file": "measure.py", "language": "python", "code": WARMUP_SOURCE})
+    render({"issues": explain_results(findings)})
+    # a long-running worker eventually runs a full collection; without
+    # gc.freeze() it writes to every tracked object's GC header
+    gc.collect()
+
+
+def measure_target(ready_fd: int) -> Callable[[], None]:
+    def measure():
+        _touch_engine()
+        os.write(ready_fd, b".")
+        while True:
+            signal.pause()
+
+    return measure
+
+
+# -----------------------------
+# Measure mode
+# -----------------------------
+def _wait_ready(read_fd: int, count: int, timeout: float = 120):
+    seen = 0
+    deadline = time.monotonic() + timeout
+    while seen < count:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"only {seen}/{count} workers became ready")
+        seen += len(os.read(read_fd, count))
+
+
+def measure_forked(workers: int, freeze: bool) -> Dict:
+    preload(freeze)
+    read_fd, write_fd = os.pipe()
+    master = PreforkMaster(measure_target(write_fd), workers, freeze=freeze, report_seconds=0)
+    for _ in range(master.workers):
+        master.spawn()
+    try:
+        _wait_ready(read_fd, master.workers)
+        report = memory_report(os.getpid(), sorted(master.children))
+    finally:
+        master.shutdown()
+    report["mode"] = "fork+freeze" if freeze else "fork"
+    return report
+
+
+def measure_spawned(workers: int) -> Dict:
+    """Fresh interpreters, like `uvicorn --workers N`."""
+    env = dict(os.environ)
+    env["WISDOM_WARMUP"] = "false"
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "services.prefork", "--measure-worker"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env,
+        )
+        for _ in range(max(1, workers))
+    ]
+    try:
+        for p in procs:
+            while p.stdout.readline().strip() != b"ready":
+                if p.poll() is not None:
+                    raise RuntimeError(f"worker {p.pid} exited ({p.returncode})")
+        report = memory_report(None, [p.pid for p in procs])
+    finally:
+        for p in procs:
+            p.terminate()
+            p.wait()
+    report["mode"] = "spawn"
+    return report
+
+
+def _measure_worker():
+    """--spawn child: the same state a forked worker holds, built locally."""
+    with contextlib.redirect_stdout(sys.stderr):
+        from core.security.api_auth import API_KEYS
+        from services import wisdom_service
+        from services.warmup import warm_up
+
+        warm_up(wisdom_service.readiness, wisdom_service.brain, API_KEYS.values())
+        _touch_engine()
+    print("ready", flush=True)
+    while True:
+        signal.pause()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=PREFORK_WORKERS)
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-freeze", action="store_true", help="skip gc.freeze() (for comparison)")
+    parser.add_argument("--measure", action="store_true", help="report worker memory and exit; no server")
+    parser.add_argument("--spawn", action="store_true", help="with --measure: fresh interpreters instead of forks")
+    parser.add_argument("--measure-worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure_worker:
+        _measure_worker()
+        return
+
+    if not hasattr(os, "fork"):
+        parser.error("pre-fork mode needs os.fork (POSIX)")
+
+    freeze = not args.no_freeze
+    if args.measure:
+        # the engine logs to stdout; keep it for the JSON report
+        with contextlib.redirect_stdout(sys.stderr):
+            if args.spawn:
+                report = measure_spawned(args.workers)
+            else:
+                report = measure_forked(args.workers, freeze)
+        print(json.dumps(report, indent=2))
+        return
+
+    sock = bind(args.host, args.port)
+    preload(freeze)
+    print(f"[PREFORK] listening on {args.host}:{args.port}")
+    PreforkMaster(serve_target(sock, args.log_level), args.workers, freeze=freeze).run()
+
+
+if __name__ == "__main__":
+    main()
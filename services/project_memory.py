@@ -5,7 +5,18 @@ from datetime import datetime
 
 DB_PATH = "wisdom_memory.db"
 
+# Schema is created on first use (or by the service warm-up), not at
+# import: importing the chat router must not touch the filesystem
+_db_ready = False
+
+
+def _ensure_db():
+    if not _db_ready:
+        init_db()
+
+
 def init_db():
+    global _db_ready
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
 
@@ -21,8 +32,10 @@ def init_db():
 
     conn.commit()
     conn.close()
+    _db_ready = True
 
 def save_message(project_id, role, content):
+    _ensure_db()
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
 
@@ -35,6 +48,7 @@ def save_message(project_id, role, content):
     conn.close()
 
 def load_memory(project_id, limit=20):
+    _ensure_db()
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
 
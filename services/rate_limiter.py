@@ -10,9 +10,6 @@ from fastapi import HTTPException
 USAGE_DIR = Path("usage")
 LIMITS_FILE = Path("usage_limits.json")
 
-# ensure usage folder exists
-USAGE_DIR.mkdir(exist_ok=True)
-
 
 def _today():
     return datetime.utcnow().strftime("%Y-%m-%d")
@@ -40,6 +37,8 @@ def _load_usage(org: str):
 
 
 def _save_usage(org: str, data: dict):
+    # created on first write, not at import (cold start)
+    USAGE_DIR.mkdir(exist_ok=True)
     usage_file = USAGE_DIR / f"{org}.json"
     with open(usage_file, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
@@ -1,17 +1,31 @@
 # services/review_brain.py
 
-from typing import List, Dict
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-from core.ast_analyzer import analyze_python_ast
+from core.analyzer_plan import AnalyzerPlan, plan_analysis
+from core.chunking import CHUNK_LINES, split_top_level
+from core.deadline import (
+    ANALYZER_DEADLINE_SECONDS,
+    NO_DEADLINE,
+    REVIEW_DEADLINE_SECONDS,
+    AnalysisTimeout,
+    Deadline,
+)
+from core.file_context import FileContext
+from core.finding import Finding
+from core.ast_analyzer import analyze_python_ast, rules_for_policy, valid_org_rules
 from core.structure_analyzer import analyze_structure
 from core.complexity_engine import analyze_complexity
 from core.cfg_engine import analyze_cfg
 from core.dfg_engine import analyze_dfg
-from core.taint_engine import analyze_taint
+from core.taint_engine import TaintConfig, analyze_taint
 from core.architecture_engine import analyze_architecture
 from core.resource_engine import analyze_resources
 from core.fix_registry import FIX_HANDLERS
-from core.scope_mapper import map_scopes, resolve_scope
+from core.policy_engine import PolicyEvaluator
+from core.scope_mapper import ScopeIndex
+from services.analysis_threads import analyzer_threads, get_executor
 
 
 # -----------------------------------
@@ -24,104 +38,414 @@ DANGEROUS_PATTERNS = [
     ("mkfs", "This command formats a filesystem and can destroy data."),
 ]
 
+# Analyzers whose findings on a top-level statement depend on that
+# statement alone (no name resolution, no module-wide state): on a
+# chunked file they run once per chunk. The rest need the whole file's
+# symbols / dataflow and run on the joined tree.
+CHUNK_LOCAL_ANALYZERS = {"structure", "complexity", "cfg"}
+
+# Verdict-only reviews run analyzers cheapest first (measured on the
+# stdlib corpus, flat metrics on), so a failing verdict is usually
+# decided before the expensive dataflow passes
+VERDICT_ORDER = (
+    "complexity", "structure", "architecture", "resources", "cfg", "taint", "ast", "dfg",
+)
+
+
+def analysis_payload(
+    file: Optional[str],
+    language: str,
+    code: str,
+    *,
+    scope: str = "file",
+    org_policy: Optional[dict] = None,
+    rules: Optional[List[str]] = None,
+    categories: Optional[List[str]] = None,
+) -> dict:
+    """
+    review_code() input for one file. Org policy contributes analyzer
+    settings (taint sources / sinks, declarative AST rules) and its
+    rule selection, narrowed further by `rules` / `categories`.
+    """
+    select = []
+    if (org_policy or {}).get("select"):
+        select.append(org_policy["select"])
+    if rules is not None or categories is not None:
+        select.append({"rules": rules, "categories": categories})
+
+    return {
+        "file": file,
+        "language": language,
+        "code": code,
+        "scope": scope,
+        "taint": (org_policy or {}).get("taint"),
+        "rules": (org_policy or {}).get("rules"),
+        "select": select,
+    }
+
+
+def _incomplete_finding(rule_id: str, reason: str, analyzers: List[str]) -> Finding:
+    return Finding(
+        rule_id,
+        "warning",
+        "reliability",
+        f"{reason}; results are partial. Incomplete analyzers: {', '.join(analyzers)}.",
+        "high",
+    )
+
+
+def _analyzer_slice(deadline: Deadline) -> Deadline:
+    """
+    One analyzer's share of a bounded review; a review without a
+    deadline (CI, benchmarks) leaves its analyzers unbounded too.
+    """
+    return deadline.child(ANALYZER_DEADLINE_SECONDS if deadline.expires_at is not None else None)
+
+
+def _reported(results: List[Finding], plan: AnalyzerPlan) -> List[Finding]:
+    """
+    Findings as the response reports them: unused-variable findings
+    for names already reported as used before assignment dropped,
+    then the plan's rule selection applied.
+    """
+    used_before_assign_vars = {
+        r.symbol
+        for r in results
+        if r.rule_id == "DFG_USE_BEFORE_ASSIGN"
+    }
+
+    cleaned: List[Finding] = []
+    for r in results:
+        if (
+            r.rule_id == "DFG_UNUSED_VARIABLE"
+            and r.symbol in used_before_assign_vars
+        ):
+            continue
+        # Engines report related rules together; keep the selected ones
+        if not plan.complete and not plan.selects(r.rule_id, r.category):
+            continue
+        cleaned.append(r)
+
+    return cleaned
+
+
+def _run_analyzer(
+    name: str,
+    run: Callable[[FileContext], List[Finding]],
+    ctx: FileContext,
+    deadline: Deadline,
+    timings: Optional[Dict[str, float]],
+    parallel: bool,
+) -> Tuple[List[Finding], Optional[str]]:
+    """
+    One analyzer under its own slice of the request deadline.
+    Returns (findings, failure) with failure None, "timeout" or "depth".
+
+    Serial runs swap the token on the shared context; parallel runs
+    get a view with their own token.
+    """
+    if deadline.expired():
+        return [], "timeout"
+
+    budget = _analyzer_slice(deadline)
+    if parallel:
+        ctx = ctx.with_deadline(budget)
+    else:
+        ctx.deadline = budget
+
+    start = time.perf_counter()
+    try:
+        return run(ctx), None
+    except AnalysisTimeout:
+        return [], "timeout"
+    except RecursionError:
+        return [], "depth"
+    finally:
+        if not parallel:
+            ctx.deadline = NO_DEADLINE
+        if timings is not None:
+            timings[name] = time.perf_counter() - start
+
+
+def _join_chunks(
+    name: str,
+    outcomes: List[Tuple[List[Finding], Optional[str]]],
+    chunk_timings: List[Dict[str, float]],
+    timings: Optional[Dict[str, float]],
+) -> Tuple[List[Finding], Optional[str]]:
+    """Per-chunk outcomes of one analyzer, as if it had run once."""
+    if timings is not None:
+        timings[name] = sum(t.get(name, 0.0) for t in chunk_timings)
+    for _, failure in outcomes:
+        if failure is not None:
+            return [], failure
+    return [f for found, _ in outcomes for f in found], None
+
 
 class ReviewBrain:
-    def __init__(self):
+    def __init__(self, threads: Optional[str] = None, chunk_lines: Optional[int] = None):
+        # None: WISDOM_ANALYZER_THREADS (see services/analysis_threads.py)
+        self.threads = threads
+        # None: WISDOM_CHUNK_LINES (see core/chunking.py)
+        self.chunk_lines = CHUNK_LINES if chunk_lines is None else chunk_lines
         print("[ReviewBrain] Initialized (analysis-only mode)")
 
-    def review_code(self, payload: dict) -> List[Dict]:
+    def _parse(self, code: str, threads: int) -> FileContext:
+        """
+        One parse, or — with analyzer threads and a file of at least
+        two chunks — top-level chunks parsed on the analyzer pool.
+        """
+        if threads > 1 and self.chunk_lines and code.count("\n") >= 2 * self.chunk_lines:
+            chunks = split_top_level(code, self.chunk_lines)
+            return FileContext.from_chunks(code, chunks, get_executor(threads).map)
+        return FileContext(code)
+
+    def _run_analyzers(
+        self,
+        analyzers: List[Tuple[str, Callable[[FileContext], List[Finding]]]],
+        ctx: FileContext,
+        deadline: Deadline,
+        timings: Optional[Dict[str, float]],
+        threads: int,
+    ) -> Iterable[Tuple[str, List[Finding], Optional[str]]]:
+        """
+        Serial, or — free-threaded interpreters — one thread per
+        analyzer over the shared tree, plus one per chunk for chunk-local
+        analyzers of a chunked file. Outcomes come back in analyzer (and
+        chunk) order either way, so findings are identical.
+        """
+        if threads > 1 and self._prepare_shared(ctx, deadline, timings):
+            executor = get_executor(threads)
+            futures = []
+            for name, run in analyzers:
+                if ctx.chunks and name in CHUNK_LOCAL_ANALYZERS:
+                    chunk_timings = [{} for _ in ctx.chunks]
+                    futures.append((name, chunk_timings, [
+                        executor.submit(_run_analyzer, name, run, chunk, deadline, t, True)
+                        for chunk, t in zip(ctx.chunks, chunk_timings)
+                    ]))
+                else:
+                    futures.append((name, None, executor.submit(
+                        _run_analyzer, name, run, ctx, deadline, timings, True,
+                    )))
+
+            outcomes = []
+            for name, chunk_timings, future in futures:
+                if chunk_timings is None:
+                    outcomes.append((name, *future.result()))
+                else:
+                    joined = _join_chunks(name, [f.result() for f in future], chunk_timings, timings)
+                    outcomes.append((name, *joined))
+            return outcomes
+
+        # lazy: a verdict-only review stops pulling once decided
+        return (
+            (name, *_run_analyzer(name, run, ctx, deadline, timings, False))
+            for name, run in analyzers
+        )
+
+    @staticmethod
+    def _prepare_shared(ctx: FileContext, deadline: Deadline, timings: Optional[Dict[str, float]]) -> bool:
+        """
+        Build the indexes parallel analyzers share. False (hit the
+        deadline / depth limit): run serially, so each analyzer
+        reports its own outcome.
+        """
+        ctx.deadline = _analyzer_slice(deadline)
+        start = time.perf_counter()
+        try:
+            ctx.prepare_shared()
+            return True
+        except (AnalysisTimeout, RecursionError):
+            return False
+        finally:
+            ctx.deadline = NO_DEADLINE
+            if timings is not None:
+                timings["shared"] = time.perf_counter() - start
+
+    def review_code(self, payload: dict) -> List[Finding]:
         code = payload.get("code", "")
         language = payload.get("language", "unknown")
 
-        results: List[Dict] = []
+        # Whole-request budget; each analyzer also gets its own slice
+        budget: Optional[float] = payload.get("deadline", REVIEW_DEADLINE_SECONDS)
+        deadline = Deadline(budget)
+
+        # Org-configured taint sources / sinks (extend the defaults)
+        taint_config = TaintConfig.from_policy(payload.get("taint"))
+
+        # Org-declared AST rules, validated once (compiled sets are cached
+        # by hash); a malformed block is reported and the built-ins run
+        org_rules, rules_error = valid_org_rules(payload.get("rules"))
+
+        # Rule selection (org policy "select", request rules / categories)
+        # → only the analyzers and AST rules that can report a selected rule
+        plan = plan_analysis(payload.get("select"), org_rules)
+
+        # Org rules compiled with the built-ins (cached by hash)
+        rules = rules_for_policy(org_rules, plan.ast_rules)
+
+        # Optional ProjectIndex (CI / multi-file runs)
+        project = payload.get("project")
+        module = project.module_for_path(payload.get("file")) if project else None
+
+        # Verdict-only (CI gates): the effective policy, evaluated as
+        # findings arrive; analysis stops once the outcome is decided
+        verdict_policy: Optional[dict] = payload.get("verdict_policy")
+        evaluator = PolicyEvaluator(**verdict_policy) if verdict_policy else None
+
+        # Optional caller-owned dict: filled with per-stage seconds
+        # (parse, each analyzer, scope) for capture / replay
+        timings: Optional[Dict[str, float]] = payload.get("timings")
+
+        results: List[Finding] = []
+
+        if rules_error is not None:
+            # error severity: a broken policy fails the gate, not passes it
+            results.append(Finding(
+                "POLICY_RULES_INVALID",
+                "error",
+                "policy",
+                f"Org policy rules are invalid and were not applied: {rules_error}",
+                "high",
+            ))
 
         # --------------------------------------------------
         # 1) Regex prefilter
         # --------------------------------------------------
-        lowered = code.lower()
-        for pattern, message in DANGEROUS_PATTERNS:
-            if pattern in lowered:
-                results.append({
-                    "rule_id": "REGEX_DESTRUCTIVE_COMMAND",
-                    "severity": "error",
-                    "category": "security",
-                    "message": message,
-                    "confidence": "high",
-                })
+        if plan.prefilter:
+            lowered = code.lower()
+            for pattern, message in DANGEROUS_PATTERNS:
+                if pattern in lowered:
+                    results.append(Finding(
+                        "REGEX_DESTRUCTIVE_COMMAND",
+                        "error",
+                        "security",
+                        message,
+                        "high",
+                    ))
+        decided = evaluator is not None and evaluator.add(results)
 
         # --------------------------------------------------
         # 2) Static analyzers
         # --------------------------------------------------
+        ctx = None
         if language.lower() in ["python", "py", "auto"]:
-            results.extend(analyze_python_ast(code))
-            results.extend(analyze_structure(code))
-            results.extend(analyze_complexity(code))
-            results.extend(analyze_cfg(code))
-            results.extend(analyze_dfg(code))
-            results.extend(analyze_taint(code))
-            results.extend(analyze_resources(code))
-            results.extend(analyze_architecture(code))
+            analyzers = [
+                ("ast", lambda c: analyze_python_ast(code, c, rules)),
+                ("structure", lambda c: analyze_structure(code, c)),
+                ("complexity", lambda c: analyze_complexity(code, c)),
+                ("cfg", lambda c: analyze_cfg(code, c)),
+                ("dfg", lambda c: analyze_dfg(code, c)),
+                ("taint", lambda c: analyze_taint(code, c, taint_config)),
+                ("resources", lambda c: analyze_resources(code, c)),
+                ("architecture", lambda c: analyze_architecture(code, c, project, module)),
+            ]
+            analyzers = [(name, run) for name, run in analyzers if name in plan.analyzers]
+            threads = analyzer_threads(self.threads, len(analyzers))
+            if evaluator is not None:
+                # cheapest first, one at a time, so the run can stop early
+                analyzers.sort(key=lambda a: VERDICT_ORDER.index(a[0]))
+                threads = 0
+
+            # Cooperative cancellation: traversals tick ctx.deadline and
+            # raise AnalysisTimeout; findings of finished analyzers stay.
+            timed_out: List[str] = []
+            too_deep: List[str] = []
+            ran = 0
+            if not decided:
+                # Parsed once; shared by every analyzer
+                start = time.perf_counter()
+                ctx = self._parse(code, threads)
+                if timings is not None:
+                    timings["parse"] = time.perf_counter() - start
+
+                for name, found, failure in self._run_analyzers(analyzers, ctx, deadline, timings, threads):
+                    ran += 1
+                    results.extend(found)
+                    if failure == "timeout":
+                        timed_out.append(name)
+                    elif failure == "depth":
+                        too_deep.append(name)
+                    if evaluator is not None and evaluator.add(_reported(found, plan)):
+                        break
+
+            skipped = [name for name, _ in analyzers[ran:]]
+            if skipped:
+                results.append(Finding(
+                    "ANALYSIS_SHORT_CIRCUIT",
+                    "info",
+                    "reliability",
+                    f"Policy verdict decided before analysis finished; results are partial. Skipped analyzers: {', '.join(skipped)}.",
+                    "high",
+                ))
+            if timed_out:
+                results.append(_incomplete_finding(
+                    "ANALYSIS_TIMEOUT", "Analysis deadline exceeded", timed_out,
+                ))
+            if too_deep:
+                results.append(_incomplete_finding(
+                    "ANALYSIS_DEPTH_LIMIT", "Syntax tree nesting exceeds analyzer limits", too_deep,
+                ))
 
         # --------------------------------------------------
         # 3) Cleanup / suppression
         # --------------------------------------------------
-        used_before_assign_vars = {
-            r["message"].split("'")[1]
-            for r in results
-            if r["rule_id"] == "DFG_USE_BEFORE_ASSIGN"
-        }
-
-        cleaned: List[Dict] = []
-        for r in results:
-            if (
-                r["rule_id"] == "DFG_UNUSED_VARIABLE"
-                and r["message"].split("'")[1] in used_before_assign_vars
-            ):
-                continue
-            cleaned.append(r)
-
-        results = cleaned
+        results = _reported(results, plan)
 
         # --------------------------------------------------
         # 4) Deterministic auto-fixes (G.2)
         # --------------------------------------------------
-        for issue in results:
-            handler = FIX_HANDLERS.get(issue["rule_id"])
+        # Split once per file, not once per fixable finding. Verdict-only
+        # reviews skip fixes.
+        lines = None
+        for issue in results if evaluator is None else ():
+            handler = FIX_HANDLERS.get(issue.rule_id)
             if not handler:
                 continue
 
+            if lines is None:
+                lines = ctx.source_lines if ctx else code.splitlines()
             try:
-                fix = handler(issue, code)
+                fix = handler(issue, lines)
             except Exception:
                 fix = None
 
             if fix:
-                issue["fix"] = fix
+                issue.fix = fix
 
         # --------------------------------------------------
         # 5) G.3 — Scope mapping
         # --------------------------------------------------
-        scopes = map_scopes(code)
+        # Built once per file; O(1) per lookup. Skipped when nothing
+        # has a location (e.g. every analyzer timed out).
+        scope_index = ScopeIndex([], [])
+        if ctx and any(issue.line is not None for issue in results):
+            ctx.deadline = _analyzer_slice(deadline)
+            start = time.perf_counter()
+            try:
+                scope_index = ctx.scope_index
+            except (AnalysisTimeout, RecursionError):
+                pass
+            finally:
+                ctx.deadline = NO_DEADLINE
+                if timings is not None:
+                    timings["scope"] = time.perf_counter() - start
 
         for issue in results:
-            loc = issue.get("location")
-            if not loc:
-                issue["scope"] = {"class": None, "function": None}
-                continue
-
-            issue["scope"] = resolve_scope(loc["line"], scopes)
+            issue.scope = scope_index.resolve(issue.line)
 
         # --------------------------------------------------
         # 6) Clean-code fallback
         # --------------------------------------------------
         if not results:
-            results.append({
-                "rule_id": "CLEAN_CODE",
-                "severity": "info",
-                "category": "style",
-                "message": "No critical issues detected by static analyzers.",
-                "confidence": "low",
-                "scope": {"class": None, "function": None},
-            })
+            results.append(Finding(
+                "CLEAN_CODE",
+                "info",
+                "style",
+                "No critical issues detected by static analyzers.",
+                "low",
+                scope={"class": None, "function": None},
+            ))
 
         return results
@@ -3,17 +3,16 @@ from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
-import os, json, requests
+import os, json
 
 from wisdom_brain.intent_engine import detect_intent
 from wisdom_brain.context_builder import build_context
 from wisdom_brain.system_prompt import SYSTEM_PROMPT
-from services.project_memory import init_db, save_message, load_memory
+from services.project_memory import save_message, load_memory
 
 router = APIRouter()
-init_db()
 GROQ_KEY = os.getenv("LLM_API_KEY")
-GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_URL = os.getenv("LLM_API_URL", "https://api.groq.com/openai/v1/chat/completions")
 MODEL = "llama-3.1-8b-instant"
 
 
@@ -57,6 +56,9 @@ async def wisdom_chat(req: ChatRequest):
     messages.append({"role": "user", "content": req.message})
 
     def stream():
+        # imported on first chat, not at service import (cold start)
+        import requests
+
         try:
             with requests.post(
                 GROQ_URL,
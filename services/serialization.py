@@ -0,0 +1,110 @@
+# services/serialization.py
+import json
+from typing import Any, List, Optional, Tuple
+
+from fastapi.responses import Response
+
+# Optional fast encoders. Stdlib json is always available as fallback.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Compact UTF-8 JSON. orjson when installed, stdlib otherwise.
+    Same document FastAPI's JSONResponse would produce.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def dumps_msgpack(content: Any) -> bytes:
+    return msgpack.packb(content, use_bin_type=True)
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    ranges: List[Tuple[str, float]] = []
+
+    for part in accept.split(","):
+        fields = part.strip().split(";")
+        media = fields[0].strip().lower()
+        if not media:
+            continue
+
+        q = 1.0
+        for param in fields[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+
+        ranges.append((media, q))
+
+    # stable: equal q keeps client order
+    ranges.sort(key=lambda r: r[1], reverse=True)
+    return ranges
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Pick the response media type from an Accept header.
+    MessagePack only when requested AND the encoder is installed.
+    Anything else (missing header, */*, unknown types) → JSON.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    for media, q in _parse_accept(accept):
+        if q <= 0:
+            continue
+        if media in MSGPACK_MEDIA_TYPES and msgpack is not None:
+            return media
+        if media in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            return JSON_MEDIA_TYPE
+
+    return JSON_MEDIA_TYPE
+
+
+def render(
+    content: Any,
+    *,
+    status_code: int = 200,
+    accept: Optional[str] = None,
+) -> Response:
+    """
+    Response boundary encoder used by all analysis endpoints.
+    Bypasses jsonable_encoder: content must already be plain JSON types.
+    """
+    media_type = negotiate(accept)
+
+    if media_type in MSGPACK_MEDIA_TYPES:
+        body = dumps_msgpack(content)
+    else:
+        body = dumps_json(content)
+
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type=media_type,
+        headers={"Vary": "Accept"},
+    )
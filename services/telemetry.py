@@ -7,16 +7,25 @@ import uuid
 LOG_DIR = Path("logs")
 AUDIT_LOG = LOG_DIR / "audit.log"
 
-# ensure log folder exists safely
-try:
-    LOG_DIR.mkdir(exist_ok=True)
-except Exception as e:
-    print("[AUDIT INIT ERROR]", e)
+_log_dir_ready = False
+
+
+def _ensure_log_dir():
+    # created on first write, not at import (cold start)
+    global _log_dir_ready
+    if _log_dir_ready:
+        return
+    try:
+        LOG_DIR.mkdir(exist_ok=True)
+        _log_dir_ready = True
+    except Exception as e:
+        print("[AUDIT INIT ERROR]", e)
 
 
 def _write_log(entry: dict):
     try:
         print("[AUDIT]", json.dumps(entry))
+        _ensure_log_dir()
         with open(AUDIT_LOG, "a", encoding="utf-8") as f:
             f.write(json.dumps(entry) + "\n")
     except Exception as e:
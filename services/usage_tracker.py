@@ -4,7 +4,6 @@ from pathlib import Path
 from datetime import datetime
 
 USAGE_DIR = Path("usage")
-USAGE_DIR.mkdir(exist_ok=True)
 
 
 def _get_usage_file(org: str) -> Path:
@@ -36,6 +35,8 @@ def track_usage(org: str | None):
     data["total_scans"] += 1
     data["last_scan"] = datetime.utcnow().isoformat() + "Z"
 
+    # created on first write, not at import (cold start)
+    USAGE_DIR.mkdir(exist_ok=True)
     with open(usage_file, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
     
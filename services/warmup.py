@@ -0,0 +1,177 @@
+# services/warmup.py
+import importlib
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from core.ast_analyzer import rules_for_policy
+from core.explain_engine import explain_results, rule_catalog
+from core.org_policy_loader import load_org_policy
+from core.policy_engine import evaluate_policy
+from core.rule_dsl import RuleSpecError
+from core.sarif_exporter import to_sarif
+from services.project_memory import init_db
+from services.serialization import render
+
+# Off: the process reports ready as soon as it is up; the first
+# requests then pay for policy verification, rule compilation, etc.
+WARMUP_ENABLED = os.getenv("WISDOM_WARMUP", "true").lower() == "true"
+
+# Reported at startup and by /ready; benchmarks/cold_start.py fails
+# above it
+IMPORT_BUDGET_MS = float(os.getenv("WISDOM_IMPORT_BUDGET_MS", "1000"))
+
+# Tiny but touches every analyzer: loop, branch, taint flow, unclosed
+# resource, unused variable
+WARMUP_SOURCE = '''
+import os
+
+
+def handler(request, items):
+    total = 0
+    unused = None
+    for item in items:
+        if item and item.ready:
+            total += item.size
+    command = request.args.get("q")
+    os.system(command)
+    log = open("warmup.log")
+    return total
+'''
+
+
+class Readiness:
+    """
+    "Up" (the process answers) vs "ready" (warm-up finished). Stage
+    timings and warm-up errors are kept for /ready.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ready = False
+        self.import_ms: Optional[float] = None
+        self.warmup_ms: Optional[float] = None
+        self.stages: Dict[str, float] = {}
+        self.errors: List[str] = []
+
+    def stage_done(self, name: str, seconds: float):
+        with self.lock:
+            self.stages[name] = round(seconds * 1000, 1)
+
+    def error(self, message: str):
+        with self.lock:
+            self.errors.append(message)
+
+    def mark_ready(self, warmup_seconds: Optional[float] = None):
+        with self.lock:
+            if warmup_seconds is not None:
+                self.warmup_ms = round(warmup_seconds * 1000, 1)
+            self.ready = True
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "status": "ready" if self.ready else "warming",
+                "import_ms": self.import_ms,
+                "import_budget_ms": IMPORT_BUDGET_MS,
+                "warmup_ms": self.warmup_ms,
+                "stages": dict(self.stages),
+                "errors": list(self.errors),
+            }
+
+
+def report_import_time(readiness: Readiness, started: float):
+    import_ms = round((time.perf_counter() - started) * 1000, 1)
+    readiness.import_ms = import_ms
+    flag = "" if import_ms <= IMPORT_BUDGET_MS else "  OVER BUDGET"
+    print(f"[STARTUP] import {import_ms} ms (budget {IMPORT_BUDGET_MS:.0f} ms){flag}")
+
+
+def warm_up(readiness: Readiness, analyzer, orgs: Iterable[str]):
+    """
+    Pays the first-request costs before traffic does: verifies every
+    org policy signature (then cached by content), compiles rule
+    tables, runs one tiny analysis through the full pipeline and
+    creates the chat schema. A failing stage is reported, not fatal.
+    """
+    started = time.perf_counter()
+
+    def stage(name: str, fn):
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            print(f"[WARMUP ERROR] {name}: {e}")
+            readiness.error(f"{name}: {e}")
+        finally:
+            readiness.stage_done(name, time.perf_counter() - start)
+
+    policies: Dict[str, dict] = {}
+
+    def verify_policies():
+        for org in sorted(set(orgs)):
+            try:
+                policies[org] = load_org_policy(org)
+            except Exception as e:
+                readiness.error(f"policy {org}: {e}")
+
+    def compile_rules():
+        rules_for_policy(None)
+        for org, policy in sorted(policies.items()):
+            try:
+                rules_for_policy(policy.get("rules"))
+            except RuleSpecError as e:
+                # requests still run (built-ins + POLICY_RULES_INVALID)
+                readiness.error(f"rules {org}: {e}")
+        rule_catalog()
+
+    def analysis():
+        # through the analysis pool when enabled: warms a worker too
+        findings = analyzer.review_code({
+            "file": "warmup.py",
+            "language": "python",
+            "code": WARMUP_SOURCE,
+        })
+        explained = explain_results(findings)
+        explain_results(findings, compact=True)
+        evaluate_policy(explained)
+        render({"issues": explained})
+        to_sarif(issues=explained, file_path="warmup.py")
+
+    def chat():
+        init_db()
+        # the LLM client is imported lazily; pay for it here when in use
+        if os.getenv("LLM_API_KEY"):
+            importlib.import_module("requests")
+
+    stage("policies", verify_policies)
+    stage("rules", compile_rules)
+    stage("analysis", analysis)
+    stage("chat", chat)
+
+    readiness.mark_ready(time.perf_counter() - started)
+    snapshot = readiness.snapshot()
+    print(f"[STARTUP] warm in {snapshot['warmup_ms']} ms {snapshot['stages']}")
+
+
+def start_warm_up(readiness: Readiness, analyzer, orgs: Iterable[str]) -> Optional[threading.Thread]:
+    """
+    Runs in the background so the server accepts connections (and
+    answers /health) right away; /ready turns 200 when it is done.
+    """
+    # pre-fork workers inherit the master's finished warm-up
+    if readiness.ready:
+        return None
+    if not WARMUP_ENABLED:
+        readiness.mark_ready()
+        return None
+
+    thread = threading.Thread(
+        target=warm_up,
+        args=(readiness, analyzer, list(orgs)),
+        name="wisdom-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -1,28 +1,63 @@
 # services/wisdom_service.py
+import re
 import time
-from fastapi import FastAPI, Depends
+_IMPORT_STARTED = time.perf_counter()
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Header
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response, StreamingResponse
 
 from services.rate_limiter import enforce_rate_limit
-from core.security.api_auth import authenticate_request
-from services.review_brain import ReviewBrain
-from core.explain_engine import explain_results
+from core.security.api_auth import API_KEYS, authenticate_request
+from services.review_brain import ReviewBrain, analysis_payload
+from services.analysis_pool import ANALYSIS_WORKERS, AnalysisPool
+from core.analyzer_plan import plan_analysis
+from core.ast_analyzer import valid_org_rules
+from core.explain_engine import explain_results, rule_catalog
 from core.policy_engine import evaluate_policy
 from llmexplainer.llm_wrapper import explain_with_llm
-from core.sarif_exporter import to_sarif
+from core.sarif_exporter import iter_sarif, to_sarif
 from core.org_policy_loader import load_org_policy
 from services.telemetry import log_review_event
 from services.usage_tracker import track_usage
+from services.capture import capture_request, flush_captures, should_capture
 from services.routes.chat import router as chat_router
+from services.serialization import JSON_MEDIA_TYPE, negotiate, render
+from services.warmup import Readiness, report_import_time, start_warm_up
 
 # =========================
 # App init
 # =========================
-app = FastAPI(title="WISDOM AI Code Intelligence Engine")
+# Import stays free of side effects (no directories, databases or
+# network clients); those happen on first use or in the warm-up.
 brain = ReviewBrain()
+
+# Optional process isolation (WISDOM_ANALYSIS_WORKERS > 0): analysis
+# runs in limited subprocesses instead of this server's threadpool
+analysis_pool = AnalysisPool(ANALYSIS_WORKERS) if ANALYSIS_WORKERS > 0 else None
+analyzer = analysis_pool or brain
+
+readiness = Readiness()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if analysis_pool:
+        analysis_pool.start()
+    # background: /health answers at once, /ready once warm
+    start_warm_up(readiness, analyzer, API_KEYS.values())
+
+    yield
+
+    if analysis_pool:
+        analysis_pool.shutdown()
+    flush_captures()
+
+
+app = FastAPI(title="WISDOM AI Code Intelligence Engine", lifespan=lifespan)
 app.include_router(chat_router)
 
 # =========================
@@ -35,6 +70,26 @@ class ReviewRequest(BaseModel):
     scope: str = "file"
     range: Optional[dict] = None
     policy: Optional[dict] = None
+    # Optional rule selection (ids / fnmatch patterns, categories):
+    # only analyzers that can report a selected rule run
+    rules: Optional[List[str]] = None
+    categories: Optional[List[str]] = None
+
+
+def _analysis_payload(req: ReviewRequest, org_policy: Optional[dict] = None) -> dict:
+    """
+    Engine input without req.dict(): references the validated
+    strings directly, so a large `code` body is never copied.
+    """
+    return analysis_payload(
+        req.file,
+        req.language,
+        req.code,
+        scope=req.scope,
+        org_policy=org_policy,
+        rules=req.rules,
+        categories=req.categories,
+    )
 
 
 # =========================
@@ -45,6 +100,16 @@ def health():
     return {"status": "ok", "service": "wisdom-ai"}
 
 
+# =========================
+# Readiness (warm-up done)
+# =========================
+@app.get("/ready")
+def ready():
+    body = readiness.snapshot()
+    body["service"] = "wisdom-ai"
+    return render(body, status_code=200 if readiness.ready else 503)
+
+
 # =========================
 # Schema discovery
 # =========================
@@ -53,12 +118,47 @@ def review_schema():
     return ReviewRequest.model_json_schema()
 
 
+# =========================
+# Rule metadata catalog
+# =========================
+RULE_CATALOG_CACHE_CONTROL = "public, max-age=86400"
+
+# entity-tag = [ "W/" ] DQUOTE *etagc DQUOTE (RFC 9110 8.8.3);
+# etagc excludes DQUOTE but not ",", so tags are matched, not split
+_ENTITY_TAG = re.compile(r'(?:W/)?"([^"]*)"')
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Match per RFC 9110 13.1.2: "*" or any listed tag, by weak
+    comparison (the W/ prefix is ignored, opaque tags compared).
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque = _ENTITY_TAG.fullmatch(etag).group(1)
+    return any(m.group(1) == opaque for m in _ENTITY_TAG.finditer(if_none_match))
+
+
+@app.get("/rules/catalog")
+def rules_catalog(if_none_match: Optional[str] = Header(None)):
+    body, etag = rule_catalog()
+    headers = {"ETag": etag, "Cache-Control": RULE_CATALOG_CACHE_CONTROL}
+
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # =========================
 # MAIN REVIEW ENDPOINT
 # =========================
 @app.post("/review")
 def review(
     req: ReviewRequest,
+    compact: bool = False,
+    verdict_only: bool = False,
+    accept: Optional[str] = Header(None),
     org_from_key: str = Depends(authenticate_request)  # H6 AUTH
 ):
     start_time = time.time()
@@ -71,15 +171,11 @@ def review(
     # =========================
     enforce_rate_limit(org_name)
 
-    # =========================
-    # 1 Deterministic analysis
-    # =========================
-    raw_issues = brain.review_code(req.dict())
+    # signed org policy: analyzer settings + policy overrides
+    org_policy = load_org_policy(org_name) if org_name else {}
 
-    # =========================
-    # 2 Deterministic explanation
-    # =========================
-    explained_issues = explain_results(raw_issues)
+    # opt-in capture for replay (org policy "capture" / WISDOM_CAPTURE_ORGS)
+    capture = should_capture(org_name, org_policy)
 
     # =========================
     # POLICY SYSTEM (H1–H3)
@@ -90,15 +186,43 @@ def review(
     profile = policy_cfg.get("profile", "balanced")
     warning_threshold = policy_cfg.get("warning_threshold", 5)
 
-    # load org policy override
-    if org_name:
-        org_policy = load_org_policy(org_name)
-        if org_policy:
-            policy_version = org_policy.get("policy_version", policy_version)
-            profile = org_policy.get("profile", profile)
-            warning_threshold = org_policy.get("warning_threshold", warning_threshold)
+    # org policy override
+    if org_policy:
+        policy_version = org_policy.get("policy_version", policy_version)
+        profile = org_policy.get("profile", profile)
+        warning_threshold = org_policy.get("warning_threshold", warning_threshold)
+
+    effective_policy = {
+        "policy_version": policy_version,
+        "profile": profile,
+        "warning_threshold": warning_threshold,
+    }
+
+    # =========================
+    # 1 Deterministic analysis
+    # =========================
+    payload = _analysis_payload(req, org_policy)
+    if verdict_only:
+        # CI gates: analysis stops once the policy outcome is decided
+        payload["verdict_policy"] = effective_policy
+    if capture:
+        payload["timings"] = {}
+    analysis_start = time.time()
+    raw_issues = analyzer.review_code(payload)
+    if capture:
+        payload["timings"]["analysis"] = time.time() - analysis_start
+
+    # =========================
+    # 2 Deterministic explanation
+    # =========================
+    # compact: findings reference /rules/catalog by rule_id
+    explained_issues = explain_results(raw_issues, compact=compact)
 
-    # evaluate policy
+    # =========================
+    # Policy verdict
+    # =========================
+    # verdict-only: same status as a full review; counts cover the
+    # findings seen before analysis stopped
     policy_result = evaluate_policy(
         explained_issues,
         policy_version=policy_version,
@@ -124,11 +248,15 @@ def review(
     # =========================
     # Optional LLM explanation
     # =========================
-    try:
-        llm_text = explain_with_llm(explained_issues)
-        llm_block = {"present": True, "content": llm_text}
-    except Exception:
-        llm_block = {"present": False, "content": None}
+    llm_block = {"present": False, "content": None}
+    if not verdict_only:
+        try:
+            # LLM prompt needs the explanation blocks even in compact mode
+            llm_input = explain_results(raw_issues) if compact else explained_issues
+            llm_text = explain_with_llm(llm_input)
+            llm_block = {"present": True, "content": llm_text}
+        except Exception:
+            pass
 
     # =========================
     # Response
@@ -144,10 +272,21 @@ def review(
             "engine_version": "wisdom-1.0",
             "analysis_scope": "single-file",
             "llm_used": llm_block["present"],
+            "response_mode": "compact" if compact else "full",
+            # as reviewed: an invalid org rules block was not applied
+            "analysis_plan": plan_analysis(payload["select"], valid_org_rules(payload["rules"])[0]).describe(),
+            "verdict_only": verdict_only,
+            "short_circuited": any(i.rule_id == "ANALYSIS_SHORT_CIRCUIT" for i in raw_issues),
             "timestamp": datetime.utcnow().isoformat() + "Z"
         }
     }
 
+    if compact:
+        response["metadata"]["rule_catalog"] = {
+            "href": "/rules/catalog",
+            "etag": rule_catalog()[1],
+        }
+
     # =========================
     # H4 — AUDIT LOGGING
     # =========================
@@ -182,7 +321,18 @@ def review(
     # CI status semantics
     # =========================
     status_code = 200 if policy_result["status"] == "pass" else 422
-    return JSONResponse(content=response, status_code=status_code)
+
+    if capture:
+        try:
+            payload["timings"]["request"] = time.time() - start_time
+            capture_request(
+                org_name, "/review", payload, raw_issues,
+                policy=effective_policy, status=status_code, timings=payload["timings"],
+            )
+        except Exception as e:
+            print("[CAPTURE ERROR]", e)
+
+    return render(response, status_code=status_code, accept=accept)
 
 
 # =========================
@@ -191,6 +341,7 @@ def review(
 @app.post("/review/sarif")
 def review_sarif(
     req: ReviewRequest,
+    accept: Optional[str] = Header(None),
     org_from_key: str = Depends(authenticate_request)
 ):
     org_name = org_from_key
@@ -198,12 +349,43 @@ def review_sarif(
     # RATE LIMIT for SARIF too
     enforce_rate_limit(org_name)
 
-    raw_issues = brain.review_code(req.dict())
+    org_policy = load_org_policy(org_name) if org_name else {}
+    capture = should_capture(org_name, org_policy)
+
+    payload = _analysis_payload(req, org_policy)
+    if capture:
+        payload["timings"] = {}
+    analysis_start = time.time()
+    raw_issues = analyzer.review_code(payload)
     explained = explain_results(raw_issues)
 
+    if capture:
+        try:
+            payload["timings"]["analysis"] = time.time() - analysis_start
+            capture_request(
+                org_name, "/review/sarif", payload, raw_issues,
+                policy=req.policy, status=200, timings=payload["timings"],
+            )
+        except Exception as e:
+            print("[CAPTURE ERROR]", e)
+
+    file_path = req.file or "unknown"
+
+    # JSON is streamed result by result (bounded memory);
+    # MessagePack needs the whole document
+    if negotiate(accept) == JSON_MEDIA_TYPE:
+        return StreamingResponse(
+            iter_sarif([(file_path, explained)]),
+            media_type=JSON_MEDIA_TYPE,
+            headers={"Vary": "Accept"},
+        )
+
     sarif = to_sarif(
         issues=explained,
-        file_path=req.file or "unknown"
+        file_path=file_path
     )
 
-    return JSONResponse(content=sarif)
\ No newline at end of file
+    return render(sarif, accept=accept)
+
+
+report_import_time(readiness, _IMPORT_STARTED)
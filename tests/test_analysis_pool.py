@@ -0,0 +1,90 @@
+# tests/test_analysis_pool.py
+import threading
+from multiprocessing import shared_memory
+
+import pytest
+
+from services import analysis_pool
+from services.analysis_pool import SHM_THRESHOLD, AnalysisPool
+
+SMALL = "def f(a):\n    return a\n"
+# > SHM_THRESHOLD and a few seconds of analysis
+LARGE = "".join(f"def f{i}(a):\n    if a:\n        return a + {i}\n    return 0\n" for i in range(40000))
+
+
+def _review(pool, code):
+    return pool.review_code({"file": "a.py", "language": "python", "code": code, "deadline": None})
+
+
+@pytest.fixture
+def segments(monkeypatch):
+    """Names of the shared-memory segments the pool creates."""
+    names = []
+
+    class Recording(shared_memory.SharedMemory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if kwargs.get("create"):
+                names.append(self.name)
+
+    monkeypatch.setattr(analysis_pool.shared_memory, "SharedMemory", Recording)
+    return names
+
+
+def _unlinked(name) -> bool:
+    try:
+        shared_memory.SharedMemory(name=name).close()
+    except FileNotFoundError:
+        return True
+    return False
+
+
+def test_cpu_limit_returns_an_aborted_finding_and_respawns(segments):
+    assert len(LARGE) >= SHM_THRESHOLD
+    pool = AnalysisPool(1, memory_mb=0, cpu_seconds=1)
+    pool.start()
+    try:
+        findings = _review(pool, LARGE)
+        assert [f.rule_id for f in findings] == ["ANALYSIS_ABORTED"]
+        assert "CPU limit" in findings[0].message
+        assert pool.restarts == 1
+
+        assert [f.rule_id for f in _review(pool, SMALL)] == ["CLEAN_CODE"]
+    finally:
+        pool.shutdown()
+
+    assert segments and all(_unlinked(name) for name in segments)
+
+
+def test_crashed_worker_is_reported_and_replaced(segments):
+    pool = AnalysisPool(1, memory_mb=0, cpu_seconds=0)
+    pool.start()
+    try:
+        _review(pool, SMALL)   # worker up and warm
+        worker = pool.slots[0].process
+
+        # kill the worker while it analyzes the large file
+        threading.Timer(0.5, worker.kill).start()
+        findings = _review(pool, LARGE)
+        assert [f.rule_id for f in findings] == ["ANALYSIS_ABORTED"]
+        assert "crashed" in findings[0].message
+
+        assert pool.slots[0].process is not worker
+        assert [f.rule_id for f in _review(pool, SMALL)] == ["CLEAN_CODE"]
+    finally:
+        pool.shutdown()
+
+    assert segments and all(_unlinked(name) for name in segments)
+
+
+def test_large_source_goes_through_shared_memory_and_is_unlinked(segments):
+    code = "x = 1\n" * (SHM_THRESHOLD // 6 + 1)
+    pool = AnalysisPool(1)
+    pool.start()
+    try:
+        findings = _review(pool, code)
+    finally:
+        pool.shutdown()
+
+    assert "ANALYSIS_ABORTED" not in [f.rule_id for f in findings]
+    assert len(segments) == 1 and _unlinked(segments[0])
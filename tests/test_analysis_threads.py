@@ -0,0 +1,28 @@
+# tests/test_analysis_threads.py
+import pytest
+
+from core.analyzer_plan import ANALYZERS
+from services import analysis_threads
+from services.analysis_threads import get_executor
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor(monkeypatch):
+    monkeypatch.setattr(analysis_threads, "_executor", None)
+    monkeypatch.setattr(analysis_threads, "_executor_size", 0)
+
+
+def test_pool_is_sized_once_for_every_plan():
+    first = get_executor(2)
+    for threads in range(2, len(ANALYZERS) + 1):
+        assert get_executor(threads) is first
+
+
+def test_growing_keeps_the_old_pool_usable():
+    old = get_executor(2)
+    new = get_executor(len(ANALYZERS) + 4)
+
+    assert new is not old
+    # a request still holding the old pool can keep submitting
+    assert old.submit(pow, 2, 3).result() == 8
+    assert list(old.map(abs, [-1, -2])) == [1, 2]
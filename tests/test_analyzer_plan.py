@@ -0,0 +1,75 @@
+# tests/test_analyzer_plan.py
+import pytest
+
+from core.analyzer_plan import ALWAYS_REPORTED, ANALYZERS, plan_analysis
+from core.ast_analyzer import BUILTIN_RULES
+from core.finding import Finding
+from services.review_brain import ReviewBrain, _reported
+
+ORG_RULES = [{"id": "ORG_NO_PICKLE", "call": "pickle.load", "category": "policy"}]
+
+
+def test_no_selection_runs_everything():
+    for selections in (None, [], [None], [{}], [{"rules": None, "categories": None}]):
+        plan = plan_analysis(selections, ORG_RULES)
+        assert plan.complete
+        assert plan.analyzers == ANALYZERS
+        assert plan.ast_rules is None
+        assert plan.prefilter
+
+
+def test_category_selection_picks_engines_and_ast_rules():
+    plan = plan_analysis([{"categories": ["Security"]}], ORG_RULES)
+
+    assert plan.analyzers == ("ast", "taint")
+    assert set(plan.ast_rules) == {s["id"] for s in BUILTIN_RULES if s.get("category") == "security"}
+    assert plan.prefilter
+
+
+def test_rule_patterns_skip_the_ast_rule_walk():
+    plan = plan_analysis([{"rules": ["DFG_*", "CFG_DEAD_AFTER_RETURN"]}])
+
+    assert plan.analyzers == ("ast", "cfg", "dfg")
+    assert plan.ast_rules == ()
+    assert not plan.prefilter
+    assert plan.describe()["skipped"] == ["structure", "complexity", "taint", "resources", "architecture"]
+
+
+def test_org_rules_are_planned_by_id_and_category():
+    assert plan_analysis([{"rules": ["ORG_*"]}], ORG_RULES).ast_rules == ("ORG_NO_PICKLE",)
+    assert plan_analysis([{"categories": ["policy"]}], ORG_RULES).ast_rules == ("ORG_NO_PICKLE",)
+    assert plan_analysis([{"categories": ["policy"]}]).ast_rules == ()
+
+
+def test_request_selection_narrows_the_org_selection():
+    org = {"categories": ["security"]}
+    plan = plan_analysis([org, {"rules": ["TAINT_*", "DFG_*"]}])
+    assert plan.analyzers == ("ast", "taint")
+
+    # a request cannot widen past the org's selection
+    assert plan_analysis([org, {"categories": ["maintainability"]}]).analyzers == ("ast",)
+
+
+@pytest.mark.parametrize("rule_id", sorted(ALWAYS_REPORTED))
+def test_always_reported_findings_pass_any_selection(rule_id):
+    plan = plan_analysis([{"rules": ["DFG_USE_BEFORE_ASSIGN"]}])
+    findings = [
+        Finding(rule_id, "warning", "reliability", "m", "high"),
+        Finding("ARCH_UNUSED_IMPORT", "warning", "architecture", "m", "high"),
+        Finding("DFG_USE_BEFORE_ASSIGN", "error", "logic", "m", "high"),
+    ]
+    assert [f.rule_id for f in _reported(findings, plan)] == [rule_id, "DFG_USE_BEFORE_ASSIGN"]
+
+
+def test_selected_review_reports_only_selected_rules():
+    code = "import os\n\ndef f():\n    eval(input())\n    return x\n    x = 1\n"
+    review = ReviewBrain().review_code
+
+    full = {f.rule_id for f in review({"code": code, "language": "python"})}
+    assert {"ARCH_UNUSED_IMPORT", "AST_EVAL_EXECUTION", "DFG_USE_BEFORE_ASSIGN"} <= full
+
+    selected = {f.rule_id for f in review({"code": code, "language": "python", "select": [{"rules": ["DFG_*"]}]})}
+    assert selected == {"DFG_USE_BEFORE_ASSIGN"}
+
+    broken = review({"code": "def f(:\n", "language": "python", "select": [{"rules": ["DFG_*"]}]})
+    assert [f.rule_id for f in broken] == ["AST_SYNTAX_ERROR"]
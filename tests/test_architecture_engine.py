@@ -0,0 +1,21 @@
+# tests/test_architecture_engine.py
+from core.architecture_engine import analyze_architecture
+
+
+def _unused(code: str):
+    return [f.message for f in analyze_architecture(code) if f.rule_id == "ARCH_UNUSED_IMPORT"]
+
+
+def test_unused_import_names_modules_and_from_imported_names():
+    assert _unused("import os.path as p\nfrom typing import List\nfrom . import sibling\n") == [
+        "Imported module 'os.path' is never used.",
+        "Imported name 'List' from 'typing' is never used.",
+        "Imported name 'sibling' from '.' is never used.",
+    ]
+
+
+def test_shadowed_import_use_does_not_count():
+    # the function's own `json` parameter, not the import, is read
+    assert _unused("import json\n\ndef f(json):\n    return json\n") == [
+        "Imported module 'json' is never used.",
+    ]
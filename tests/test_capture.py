@@ -0,0 +1,46 @@
+# tests/test_capture.py
+from services import capture
+from services.analysis_pool import AnalysisPool
+from services.capture import CaptureWriter, capture_request, iter_captures
+
+CODE = "import os\n\ndef run(cmd):\n    os.system(cmd)\n"
+
+
+def test_pool_capture_holds_stage_timings(tmp_path, monkeypatch):
+    monkeypatch.setattr(capture, "_writer", CaptureWriter(tmp_path, flush_records=1))
+
+    pool = AnalysisPool(1)
+    pool.start()
+    try:
+        payload = {"file": "a.py", "language": "python", "code": CODE, "timings": {}}
+        findings = pool.review_code(payload)
+    finally:
+        pool.shutdown()
+
+    payload["timings"]["analysis"] = 0.0
+    capture_request("acme", "/review", payload, findings, status=200, timings=payload["timings"])
+
+    (record,) = iter_captures([tmp_path])
+    assert {"parse", "ast", "taint", "dfg", "analysis"} <= set(record["timings"])
+
+
+def test_verdict_only_capture_replays_identically(tmp_path, monkeypatch):
+    from benchmarks.replay import compare_output, replay_one
+    from services.review_brain import ReviewBrain
+
+    monkeypatch.setattr(capture, "_writer", CaptureWriter(tmp_path, flush_records=1))
+    policy = {"policy_version": "v1", "profile": "strict", "warning_threshold": 0}
+    payload = {"file": "a.py", "language": "python", "code": CODE, "verdict_policy": policy}
+
+    brain = ReviewBrain()
+    findings = brain.review_code(payload)
+    assert "ANALYSIS_SHORT_CIRCUIT" in [f.rule_id for f in findings]
+    capture_request("acme", "/review", payload, findings, policy=policy, status=422)
+
+    (record,) = iter_captures([tmp_path])
+    assert record["verdict_policy"] == policy
+    assert record["policy"] == policy
+
+    run = replay_one(brain, record, 1, None)
+    report = compare_output([run], {record["id"]: record["result"]["findings"]})
+    assert report["identical"] == 1 and not report["changed"]
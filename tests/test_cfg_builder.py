@@ -0,0 +1,144 @@
+# tests/test_cfg_builder.py
+import ast
+import textwrap
+
+from core.cfg_builder import FunctionCFG, build_cfg
+
+
+def _cfg(src: str):
+    return build_cfg(ast.parse(textwrap.dedent(src)).body[0])
+
+
+def _block(bound, text: str) -> int:
+    """Block holding the first item whose source starts with `text`."""
+    for i, item in enumerate(bound.items):
+        if ast.unparse(item).startswith(text):
+            return next(b.id for b in bound.cfg.blocks if i in b.items)
+    raise AssertionError(text)
+
+
+def test_straight_line_body_is_one_block():
+    bound = _cfg("""
+        def f():
+            a = 1
+            b = a
+            return b
+    """)
+    entry = bound.cfg.blocks[FunctionCFG.ENTRY]
+    assert len(entry.items) == 3
+    assert entry.succs == [FunctionCFG.EXIT]
+
+
+def test_statement_after_return_has_its_own_unreachable_block():
+    bound = _cfg("""
+        def f():
+            return 1
+            dead()
+    """)
+    dead = _block(bound, "dead()")
+    assert bound.cfg.blocks[dead].preds == []
+    assert dead not in bound.cfg.reachable()
+
+
+def test_return_inside_try_runs_finally_first():
+    bound = _cfg("""
+        def f():
+            try:
+                a()
+                return 1
+            finally:
+                b()
+            c()
+    """)
+    cfg = bound.cfg
+    body, fin = _block(bound, "a()"), _block(bound, "b()")
+
+    assert _block(bound, "return 1") == body
+    assert cfg.blocks[body].succs == [fin]
+    assert FunctionCFG.EXIT in cfg.blocks[fin].succs
+
+
+def test_try_body_blocks_may_raise_into_handlers():
+    bound = _cfg("""
+        def f():
+            try:
+                if x:
+                    a()
+                b()
+            except ValueError:
+                c()
+            d()
+    """)
+    cfg = bound.cfg
+    handler = _block(bound, "except ValueError")
+    for stmt in ("if x", "a()", "b()"):
+        assert handler in cfg.blocks[_block(bound, stmt)].succs
+    assert _block(bound, "c()") == handler
+    assert _block(bound, "d()") in cfg.reachable(handler)
+
+
+def test_break_skips_loop_else():
+    bound = _cfg("""
+        def f(x):
+            while x:
+                if x > 1:
+                    break
+                x = g()
+            else:
+                h()
+            return x
+    """)
+    cfg = bound.cfg
+    header = _block(bound, "while x")
+    after_break = cfg.reachable(_block(bound, "break"))
+
+    assert _block(bound, "h()") not in after_break
+    assert _block(bound, "return x") in after_break
+    # back edge from the end of the body
+    assert header in cfg.blocks[_block(bound, "x = g()")].succs
+    assert _block(bound, "h()") in cfg.blocks[header].succs
+    assert bound.loop_can_exit(bound.items[cfg.blocks[header].items[0]])
+
+
+def test_while_true_without_break_cannot_exit():
+    bound = _cfg("""
+        def f():
+            while True:
+                tick()
+    """)
+    loop = next(item for item in bound.items if isinstance(item, ast.While))
+    assert not bound.loop_can_exit(loop)
+    assert FunctionCFG.EXIT not in bound.cfg.reachable()
+
+
+def test_match_cases_and_fallthrough():
+    partial = _cfg("""
+        def f(v):
+            match v:
+                case 1:
+                    a()
+                case [x]:
+                    b()
+            c()
+    """)
+    cfg = partial.cfg
+    head = _block(partial, "match v")
+    after = _block(partial, "c()")
+    cases = [_block(partial, "case 1"), _block(partial, "case [x]")]
+
+    assert _block(partial, "a()") == cases[0]
+    assert sorted(cfg.blocks[head].succs) == sorted(cases + [after])
+    for case in cases:
+        assert after in cfg.blocks[case].succs
+
+    exhaustive = _cfg("""
+        def f(v):
+            match v:
+                case 1:
+                    a()
+                case _:
+                    b()
+            c()
+    """)
+    head = _block(exhaustive, "match v")
+    assert _block(exhaustive, "c()") not in exhaustive.cfg.blocks[head].succs
@@ -0,0 +1,126 @@
+# tests/test_chunking.py
+import ast
+
+from core.chunking import split_top_level
+from core.file_context import FileContext
+
+SOURCE = '''\
+"""Module docstring
+spanning lines."""
+import os
+
+# comment between statements
+
+@decorator
+@other(
+    arg=1,
+)
+def f(a):
+    return a
+
+
+class C:
+    x = 1
+
+
+if os.name == "nt":
+    A = 1
+elif os.name == "posix":
+    A = 2
+else:
+    A = 3
+
+try:
+    import json
+except ImportError:
+    json = None
+else:
+    pass
+finally:
+    done = True
+
+for i in range(3):
+    pass
+else:
+    B = [
+        1,
+        2,
+    ]
+
+TEXT = """
+else:
+@not_a_decorator
+"""
+
+match A:
+    case 1:
+        pass
+    case _:
+        pass
+'''
+
+CONTINUATIONS = ("else", "elif", "except", "finally", "case")
+
+
+def _first_code_line(text: str) -> str:
+    for line in text.splitlines():
+        if line.strip() and not line.lstrip().startswith("#"):
+            return line
+    return ""
+
+
+def test_chunks_cover_the_file_and_parse_on_their_own():
+    chunks = list(split_top_level(SOURCE, 1))
+
+    assert len(chunks) > 5
+    assert "".join(c.text for c in chunks) == SOURCE
+    for chunk in chunks:
+        ast.parse(chunk.text)
+
+
+def test_offsets_count_the_lines_before_each_chunk():
+    chunks = list(split_top_level(SOURCE, 1))
+    offset = 0
+    for chunk in chunks:
+        assert chunk.line_offset == offset
+        offset += chunk.text.count("\n")
+
+
+def test_continuations_and_decorators_stay_with_their_statement():
+    for chunk in split_top_level(SOURCE, 1):
+        first = _first_code_line(chunk.text)
+        assert not first.startswith(CONTINUATIONS), first
+        assert not first.startswith((" ", ")")), first
+        last = [line for line in chunk.text.splitlines() if line.strip()][-1]
+        assert not last.startswith("@"), chunk.text
+
+
+def test_large_target_keeps_one_chunk():
+    assert [c.line_offset for c in split_top_level(SOURCE, 10_000)] == [0]
+
+
+def test_joined_chunk_trees_equal_the_whole_file_tree():
+    whole = FileContext(SOURCE)
+    joined = FileContext.from_chunks(SOURCE, split_top_level(SOURCE, 1))
+
+    assert len(joined.chunks) > 5
+    assert ast.dump(joined.tree, include_attributes=True) == ast.dump(whole.tree, include_attributes=True)
+    # snippets of chunk nodes come from the file's lines
+    part = joined.chunks[-1]
+    node = part.tree.body[0]
+    assert part.source_lines[node.lineno - 1].startswith("match A:")
+
+
+def test_crlf_line_numbers_map_back():
+    code = SOURCE.replace("\n", "\r\n")
+    joined = FileContext.from_chunks(code, split_top_level(code, 1))
+    assert ast.dump(joined.tree, include_attributes=True) == ast.dump(FileContext(code).tree, include_attributes=True)
+
+
+def test_syntax_error_falls_back_to_the_whole_file():
+    code = SOURCE + "\ndef broken(:\n    pass\n"
+    whole = FileContext(code)
+    joined = FileContext.from_chunks(code, split_top_level(code, 1))
+
+    assert joined.tree is None and not joined.chunks
+    assert joined.syntax_error.lineno == whole.syntax_error.lineno
@@ -0,0 +1,131 @@
+# tests/test_dataflow.py
+import ast
+import textwrap
+
+from core.cfg_builder import FunctionCFG, build_cfg
+from core.dataflow import FunctionDataflow, solve
+
+
+def _facts(src: str) -> FunctionDataflow:
+    bound = build_cfg(ast.parse(textwrap.dedent(src)).body[0])
+    return FunctionDataflow(bound.cfg, bound.items)
+
+
+def _block(facts: FunctionDataflow, text: str) -> int:
+    for i, item in enumerate(facts.items):
+        if ast.unparse(item).startswith(text):
+            return next(b.id for b in facts.cfg.blocks if i in b.items)
+    raise AssertionError(text)
+
+
+def _unassigned(src: str):
+    return sorted(name for _, name in _facts(src).maybe_unassigned_uses())
+
+
+def test_solve_forward_may_and_must_meet_at_a_join():
+    facts = _facts("""
+        def f(c):
+            if c:
+                a = 1
+            else:
+                b = 2
+            return c
+    """)
+    cfg = facts.cfg
+    a_bit, b_bit = facts.bits(["a"]), facts.bits(["b"])
+    then, other = _block(facts, "a = 1"), _block(facts, "b = 2")
+    join = _block(facts, "return c")
+
+    gen = [0] * len(cfg.blocks)
+    gen[then], gen[other] = a_bit, b_bit
+    kill = [0] * len(cfg.blocks)
+    universe = a_bit | b_bit
+
+    may_in, _ = solve(cfg, gen, kill)
+    must_in, _ = solve(cfg, gen, kill, must=True, universe=universe)
+
+    assert may_in[join] == a_bit | b_bit
+    assert must_in[join] == 0
+    assert must_in[FunctionCFG.ENTRY] == 0
+
+
+def test_definite_assignment_needs_every_path():
+    assert _unassigned("""
+        def f(c):
+            if c:
+                x = 1
+            return x
+    """) == ["x"]
+    assert _unassigned("""
+        def f(c):
+            if c:
+                x = 1
+            else:
+                x = 2
+            return x
+    """) == []
+
+
+def test_definite_assignment_through_try_and_loops():
+    # every way out of the try assigns x
+    assert _unassigned("""
+        def f():
+            try:
+                x = g()
+            except OSError:
+                x = None
+            finally:
+                done()
+            return x
+    """) == []
+    # the else branch runs only after the body completed
+    assert _unassigned("""
+        def f(c):
+            try:
+                g()
+            except OSError:
+                return None
+            else:
+                x = 1
+            return x
+    """) == []
+    # a for body may not run at all
+    assert _unassigned("""
+        def f(items):
+            for i in items:
+                last = i
+            return last
+    """) == ["last"]
+
+
+def test_liveness_reaches_fixpoint_across_the_back_edge():
+    facts = _facts("""
+        def f(n):
+            total = 0
+            unused = 1
+            while n:
+                total = total + n
+                n = n - 1
+            return total
+    """)
+    live_in, live_out = facts.liveness()
+    header = _block(facts, "while n")
+
+    assert facts.names(live_in[header]) == {"n", "total"}
+    assert facts.names(live_in[FunctionCFG.ENTRY]) == {"n"}
+    assert "unused" not in facts.names(live_out[FunctionCFG.ENTRY])
+
+
+def test_reaching_definitions_merge_loop_iterations():
+    facts = _facts("""
+        def f(n):
+            x = 0
+            while n:
+                x = x + 1
+            return x
+    """)
+    definitions, ins, _ = facts.reaching_definitions()
+    ret = _block(facts, "return x")
+    reaching = {facts.items[i].lineno for bit, (name, i) in enumerate(definitions) if ins[ret] >> bit & 1}
+
+    assert reaching == {3, 5}
@@ -0,0 +1,22 @@
+# tests/test_dfg_engine.py
+from core.dfg_engine import analyze_dfg
+
+
+def _reads(code: str):
+    return [(f.line, f.symbol) for f in analyze_dfg(code) if f.rule_id == "DFG_USE_BEFORE_ASSIGN"]
+
+
+def test_augassign_on_unassigned_local_is_a_read():
+    assert _reads("def f():\n    a += 1\n    return a\n") == [(2, "a")]
+
+
+def test_augassign_after_assignment_is_clean():
+    assert _reads("def f():\n    a = 0\n    a += 1\n    return a\n") == []
+
+
+def test_lambda_body_is_not_a_read_at_definition():
+    assert _reads("def f():\n    g = lambda: x\n    x = 1\n    return g()\n") == []
+
+
+def test_lambda_default_is_a_read_at_definition():
+    assert _reads("def f():\n    g = lambda a=x: a\n    x = 1\n    return g()\n") == [(2, "x")]
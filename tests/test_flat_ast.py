@@ -0,0 +1,120 @@
+# tests/test_flat_ast.py
+import argparse
+import ast
+import json
+import textwrap
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core import flat_ast
+from core.architecture_engine import analyze_architecture
+from core.ast_summary import BLOCK_NODES, summarize
+from core.complexity_engine import analyze_complexity
+from core.file_context import FileContext
+from core.flat_ast import FUNCTION_NODES, flatten
+from core.structure_analyzer import analyze_structure
+
+NESTED = textwrap.dedent('''
+    import os
+
+    class Outer:
+        def method(self, items):
+            for item in items:
+                if item and (item.ok or item.retry or item.force):
+                    while item.pending:
+                        try:
+                            with open(item.path) as f:
+                                if f.read():
+                                    break
+                        except OSError as e:
+                            raise RuntimeError(e)
+            return [x for x in items if x]
+
+        async def fetch(self):
+            handler = lambda v: v * 2
+            async with self.session as s:
+                return await s.get(handler)
+
+    def top(value):
+        match value:
+            case {"k": [1, *rest]}:
+                return rest
+            case _:
+                def inner():
+                    return os.getcwd()
+                return inner
+''')
+
+FIXTURES = {
+    "nested": NESTED,
+    "empty": "",
+    "argparse": Path(argparse.__file__).read_text(),
+    "json.decoder": Path(json.decoder.__file__).read_text(),
+}
+
+
+def _reference(tree: ast.AST):
+    """Rows of the NodeVisitor pre-order walk: (node, parent, depth, function, nesting)."""
+    rows = []
+
+    def visit(node, parent, depth, function, nesting):
+        row = len(rows)
+        nesting += isinstance(node, BLOCK_NODES)
+        rows.append((node, parent, depth, function, nesting))
+        inner = row if isinstance(node, FUNCTION_NODES) else function
+        for child in ast.iter_child_nodes(node):
+            visit(child, row, depth + 1, inner, nesting)
+
+    visit(tree, -1, 0, -1, 0)
+    return rows
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_flat_tree_matches_the_ast_walk(name):
+    tree = ast.parse(FIXTURES[name])
+    flat = flatten(tree)
+    rows = _reference(tree)
+
+    assert len(flat) == len(rows) == sum(1 for _ in ast.walk(tree))
+    assert all(a is b for a, (b, *_) in zip(flat.nodes, rows))
+    assert flat.parent.tolist() == [r[1] for r in rows]
+    assert flat.depth.tolist() == [r[2] for r in rows]
+    assert flat.function.tolist() == [r[3] for r in rows]
+    assert flat.nesting.tolist() == [r[4] for r in rows]
+
+    children = [0] * len(rows)
+    for _, parent, *_ in rows[1:]:
+        children[parent] += 1
+    assert flat.child_count.tolist() == children
+
+    # subtree [row, subtree_end) holds exactly the node's descendants
+    for row, (node, *_) in enumerate(rows):
+        assert flat.subtree_end[row] - row == sum(1 for _ in ast.walk(node))
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_flat_summaries_match_summarize(name):
+    tree = ast.parse(FIXTURES[name])
+    assert flatten(tree).summaries() == summarize(tree)
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_metric_analyzers_agree_with_and_without_flat_tree(name, monkeypatch):
+    code = FIXTURES[name]
+
+    def findings():
+        ctx = FileContext(code)
+        return [
+            f.to_dict()
+            for analyze in (analyze_structure, analyze_complexity, analyze_architecture)
+            for f in analyze(code, ctx)
+        ]
+
+    assert FileContext(code).flat is not None
+    flat = findings()
+    monkeypatch.setattr(flat_ast, "FLAT_METRICS", "off")
+    assert FileContext(code).flat is None
+    assert findings() == flat
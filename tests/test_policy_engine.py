@@ -0,0 +1,83 @@
+# tests/test_policy_engine.py
+import pytest
+
+from core.explain_engine import explain_results
+from core.policy_engine import PolicyEvaluator, evaluate_policy
+from services.review_brain import ReviewBrain
+
+# errors from the AST and taint analyzers
+BLOCK = "def f():\n    eval(input())\n"
+# warnings only: bare except, unused imports, use before assignment
+WARN = "import os\nimport sys\nimport json\n\ndef f():\n    try:\n        g()\n    except:\n        pass\n    print(y)\n    y = 1\n"
+PASS = "def f(a):\n    return a\n"
+
+CASES = [
+    # (code, profile, warning_threshold, status)
+    (BLOCK, "balanced", 5, "fail"),
+    (BLOCK, "permissive", 5, "fail"),
+    (WARN, "balanced", 2, "fail"),
+    (WARN, "balanced", 10, "pass"),
+    (WARN, "strict", 5, "fail"),
+    (WARN, "permissive", 0, "pass"),
+    (PASS, "strict", 0, "pass"),
+    (PASS, "balanced", 5, "pass"),
+]
+
+
+def _key(finding):
+    return (finding.rule_id, finding.line or 0, finding.column or 0, finding.message)
+
+
+def _policy(profile, threshold):
+    return {"policy_version": "v1", "profile": profile, "warning_threshold": threshold}
+
+
+@pytest.mark.parametrize("code, profile, threshold, status", CASES)
+def test_verdict_only_review_gives_the_full_review_verdict(code, profile, threshold, status):
+    brain = ReviewBrain()
+    policy = _policy(profile, threshold)
+
+    full = brain.review_code({"code": code, "language": "python"})
+    short = brain.review_code({"code": code, "language": "python", "verdict_policy": policy})
+
+    full_verdict = evaluate_policy(explain_results(full), **policy)
+    short_verdict = evaluate_policy(explain_results(short), **policy)
+
+    assert full_verdict["status"] == short_verdict["status"] == status
+    assert short_verdict["reason"] == full_verdict["reason"]
+
+    if status == "pass":
+        # nothing can be skipped before a pass is known (analyzers run
+        # cheapest first, so only the order may differ)
+        assert sorted(map(_key, short)) == sorted(map(_key, full))
+    else:
+        # whatever was found before stopping is part of the full review
+        assert {_key(f) for f in short if f.rule_id != "ANALYSIS_SHORT_CIRCUIT"} <= {_key(f) for f in full}
+
+
+def test_blocking_review_short_circuits():
+    findings = ReviewBrain().review_code({
+        "code": BLOCK, "language": "python", "verdict_policy": _policy("balanced", 5),
+    })
+    assert "ANALYSIS_SHORT_CIRCUIT" in [f.rule_id for f in findings]
+
+
+@pytest.mark.parametrize("profile, threshold", [("strict", 0), ("balanced", 2), ("permissive", 0)])
+def test_evaluator_decides_exactly_when_the_status_can_no_longer_change(profile, threshold):
+    issues = [{"severity": s} for s in ("warning", "info", "warning", "warning", "error", "warning")]
+    evaluator = PolicyEvaluator(**_policy(profile, threshold))
+
+    for n, issue in enumerate(issues, 1):
+        decided = evaluator.add([issue])
+        verdict = evaluate_policy(issues[:n], **_policy(profile, threshold))
+        if decided:
+            # fails now, and every later finding keeps it failing
+            assert verdict["status"] == "fail"
+            assert evaluate_policy(issues, **_policy(profile, threshold))["status"] == "fail"
+        else:
+            assert verdict["status"] == "pass"
+
+
+def test_unsupported_policy_is_decided_at_once():
+    assert PolicyEvaluator(policy_version="v9").decided
+    assert PolicyEvaluator(profile="lenient").decided
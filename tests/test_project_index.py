@@ -0,0 +1,99 @@
+# tests/test_project_index.py
+import json
+import os
+
+from core.project_index import DEFAULT_INDEX_PATH, INDEX_VERSION, ProjectIndex
+
+
+def _project(root):
+    (root / "pkg").mkdir()
+    (root / "pkg" / "__init__.py").write_text("")
+    (root / "pkg" / "a.py").write_text("from pkg import b\n\nVALUE = b.VALUE\n")
+    (root / "pkg" / "b.py").write_text("VALUE = 1\n")
+    index = ProjectIndex(str(root))
+    index.update()
+    index.save()
+    return index
+
+
+def _bump_mtime(path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+
+
+def test_round_trip_keeps_modules_and_graph(tmp_path):
+    built = _project(tmp_path)
+    loaded = ProjectIndex.load(str(tmp_path))
+
+    assert loaded.modules == built.modules
+    assert loaded.by_path == built.by_path
+    assert loaded.dependencies == built.dependencies == {"pkg": set(), "pkg.a": {"pkg.b"}, "pkg.b": set()}
+    assert loaded.dependents["pkg.b"] == {"pkg.a"}
+    assert loaded.module_for_path("pkg/a.py") == "pkg.a"
+    # nothing on disk changed
+    assert loaded.update() == set()
+
+
+def test_touched_but_identical_file_is_not_reparsed(tmp_path):
+    _project(tmp_path)
+    _bump_mtime(tmp_path / "pkg" / "b.py")
+
+    index = ProjectIndex.load(str(tmp_path))
+    assert index.update() == set()
+    assert index.modules["pkg.b"].mtime_ns == (tmp_path / "pkg" / "b.py").stat().st_mtime_ns
+
+
+def test_modified_added_and_removed_files_are_invalidated(tmp_path):
+    _project(tmp_path)
+    a = tmp_path / "pkg" / "a.py"
+    a.write_text("VALUE = 2\n")
+    _bump_mtime(a)
+    (tmp_path / "pkg" / "c.py").write_text("import pkg.a\n")
+    (tmp_path / "pkg" / "b.py").unlink()
+
+    index = ProjectIndex.load(str(tmp_path))
+    assert index.update() == {"pkg.a", "pkg.b", "pkg.c"}
+    assert "pkg.b" not in index.modules and "pkg/b.py" not in index.by_path
+    assert index.dependencies["pkg.a"] == set()
+    assert index.dependents["pkg.a"] == {"pkg.c"}
+    assert index.affected({"pkg.a"}) == {"pkg.a", "pkg.c"}
+
+    index.save()
+    assert ProjectIndex.load(str(tmp_path)).dependencies == index.dependencies
+
+
+def test_explicit_paths_only_check_those_files(tmp_path):
+    _project(tmp_path)
+    for name in ("a.py", "b.py"):
+        path = tmp_path / "pkg" / name
+        path.write_text(path.read_text() + "EXTRA = 0\n")
+
+    index = ProjectIndex.load(str(tmp_path))
+    assert index.update(["pkg/b.py", "README.md"]) == {"pkg.b"}
+    assert index.update() == {"pkg.a"}
+
+
+def test_version_mismatch_starts_over(tmp_path):
+    _project(tmp_path)
+    path = tmp_path / DEFAULT_INDEX_PATH
+    data = json.loads(path.read_text())
+    data["version"] = INDEX_VERSION + 1
+    path.write_text(json.dumps(data))
+
+    index = ProjectIndex.load(str(tmp_path))
+    assert index.modules == {}
+    assert index.update() == {"pkg", "pkg.a", "pkg.b"}
+
+
+def test_corrupt_or_missing_file_starts_over(tmp_path):
+    _project(tmp_path)
+    path = tmp_path / DEFAULT_INDEX_PATH
+    path.write_text('{"version": 1, "modules": [')
+
+    index = ProjectIndex.load(str(tmp_path))
+    assert index.modules == {}
+    assert ProjectIndex.load(str(tmp_path), str(tmp_path / "missing.json")).modules == {}
+
+    index.update()
+    index.save()
+    assert set(ProjectIndex.load(str(tmp_path)).modules) == {"pkg", "pkg.a", "pkg.b"}
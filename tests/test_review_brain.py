@@ -0,0 +1,46 @@
+# tests/test_review_brain.py
+import pytest
+
+from services.review_brain import ReviewBrain
+
+CODE = "eval(input())\n"
+
+
+@pytest.mark.parametrize("rules", [
+    [{"id": "ORG_BAD", "call": "pickle.load", "severity": "fatal"}],
+    [{"id": "ORG_BAD", "node": "NoSuchNode"}],
+    ["not a rule"],
+])
+def test_invalid_org_rules_are_reported_not_raised(rules):
+    findings = ReviewBrain().review_code({"code": CODE, "language": "python", "rules": rules})
+    ids = [f.rule_id for f in findings]
+
+    assert ids.count("POLICY_RULES_INVALID") == 1
+    invalid = findings[ids.index("POLICY_RULES_INVALID")]
+    assert invalid.severity == "error"
+    # built-in rules still run
+    assert "AST_EVAL_EXECUTION" in ids
+
+
+def test_review_without_deadline_leaves_analyzers_unbounded(monkeypatch):
+    # CI reviews pass deadline None: no per-analyzer slice either
+    monkeypatch.setattr("services.review_brain.ANALYZER_DEADLINE_SECONDS", 0.0)
+    code = "".join(f"x{i} = {i}\n" for i in range(2000))
+
+    bounded = ReviewBrain().review_code({"code": code, "language": "python", "deadline": 60})
+    unbounded = ReviewBrain().review_code({"code": code, "language": "python", "deadline": None})
+
+    assert "ANALYSIS_TIMEOUT" in [f.rule_id for f in bounded]
+    assert "ANALYSIS_TIMEOUT" not in [f.rule_id for f in unbounded]
+
+
+@pytest.mark.parametrize("rules", [5, True, "ORG_BAD", {"id": "ORG_BAD", "call": "eval"}])
+def test_non_list_org_rules_are_reported_not_raised(rules):
+    findings = ReviewBrain().review_code({
+        "code": CODE, "language": "python", "rules": rules,
+        "select": [{"categories": ["security", "policy"]}],
+    })
+    ids = [f.rule_id for f in findings]
+
+    assert ids.count("POLICY_RULES_INVALID") == 1
+    assert "AST_EVAL_EXECUTION" in ids
@@ -0,0 +1,27 @@
+# tests/test_sarif_exporter.py
+import json
+
+from core.sarif_exporter import iter_sarif, to_sarif
+
+ISSUES = [
+    {"rule_id": "AST_EVAL_EXECUTION", "severity": "error", "category": "security",
+     "message": "eval", "confidence": "high", "location": {"line": 3, "column": 0}},
+    {"rule_id": "DFG_UNUSED_VARIABLE", "severity": "warning", "category": "maintainability",
+     "message": "unused", "confidence": "medium"},
+]
+
+
+def _without_times(doc):
+    for run in doc["runs"]:
+        run.pop("invocations")
+    return doc
+
+
+def test_columns_are_one_based():
+    (result, _) = to_sarif(ISSUES, "a.py")["runs"][0]["results"]
+    assert result["locations"][0]["physicalLocation"]["region"] == {"startLine": 3, "startColumn": 1}
+
+
+def test_streamed_document_matches_built_one():
+    streamed = json.loads("".join(iter_sarif([("a.py", ISSUES)])))
+    assert _without_times(streamed) == _without_times(to_sarif(ISSUES, "a.py"))
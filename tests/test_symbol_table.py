@@ -0,0 +1,114 @@
+# tests/test_symbol_table.py
+import ast
+import textwrap
+
+from core.symbol_table import IMPORTED, SymbolTable
+
+
+def _table(src: str):
+    tree = ast.parse(textwrap.dedent(src))
+    return tree, SymbolTable.from_tree(tree)
+
+
+def _loads(tree, name: str):
+    return [n for n in ast.walk(tree) if isinstance(n, ast.Name) and n.id == name and isinstance(n.ctx, ast.Load)]
+
+
+def _scope_kinds(table, tree, name: str):
+    """Kind of the scope each load of `name` resolves to (None: unresolved)."""
+    kinds = []
+    for node in sorted(_loads(tree, name), key=lambda n: (n.lineno, n.col_offset)):
+        sym = table.resolve(node)
+        kinds.append(sym.scope.kind if sym else None)
+    return kinds
+
+
+def test_local_binding_shadows_global_in_the_whole_function():
+    tree, table = _table("""
+        x = 1
+        def f():
+            print(x)
+            x = 2
+        def g():
+            return x
+    """)
+    # f's x is local everywhere in f (read before assignment is still local)
+    assert _scope_kinds(table, tree, "x") == ["function", "module"]
+
+
+def test_class_scope_is_not_visible_from_methods():
+    tree, table = _table("""
+        y = 0
+        class C:
+            y = 1
+            z = y
+            def m(self):
+                return y
+    """)
+    assert _scope_kinds(table, tree, "y") == ["class", "module"]
+
+
+def test_global_and_nonlocal_rebind_outer_symbols():
+    tree, table = _table("""
+        counter = 0
+        def bump():
+            global counter
+            counter = counter + 1
+        def outer():
+            n = 0
+            def inner():
+                nonlocal n
+                n = n + 1
+            inner()
+            return n
+    """)
+    module = table.module.symbols["counter"]
+    assert _scope_kinds(table, tree, "counter") == ["module"]
+    assert len(module.defs) == 2
+
+    outer = table.scope_of(tree.body[2])
+    n = outer.symbols["n"]
+    assert len(n.defs) == 2
+    assert len(n.uses) == 2
+    assert "n" not in table.scope_of(tree.body[2].body[1]).symbols
+
+
+def test_comprehension_targets_are_local_but_walrus_binds_outside():
+    tree, table = _table("""
+        def f(items):
+            out = [i for i in items if (last := i)]
+            return i, last
+    """)
+    f = table.scope_of(tree.body[0])
+    assert "last" in f.symbols
+    assert "i" not in f.symbols
+    assert _scope_kinds(table, tree, "i") == ["comprehension", "comprehension", None]
+
+
+def test_imports_carry_qualified_names():
+    tree, table = _table("""
+        import os.path
+        import numpy as np
+        from typing import List as L
+        from ..pkg import thing
+        np.linalg.norm(L)
+    """)
+    symbols = table.module.symbols
+    assert symbols["os"].qualified == "os" and symbols["os"].imported_from is None
+    assert symbols["np"].qualified == "numpy"
+    assert (symbols["L"].qualified, symbols["L"].imported_from) == ("typing.List", "typing")
+    assert (symbols["thing"].qualified, symbols["thing"].imported_from) == ("..pkg.thing", "..pkg")
+    assert all(sym.flags & IMPORTED for sym in symbols.values())
+
+    call = tree.body[-1].value
+    assert table.qualified_name(call.func) == "numpy.linalg.norm"
+
+
+def test_star_import_marks_the_scope_and_leaves_names_unresolved():
+    tree, table = _table("""
+        from os.path import *
+        join("a", "b")
+    """)
+    assert table.module.star_import
+    assert _scope_kinds(table, tree, "join") == [None]
+    assert _loads(tree, "join")[0] in table.unresolved
@@ -0,0 +1,16 @@
+# tests/test_taint_engine.py
+from core.file_context import FileContext
+from core.taint_engine import analyze_taint
+
+BODY = "def run(cmd):\n    os.system(cmd)\n\nrun(input())\n"
+
+
+def _taint(code: str):
+    return [f.rule_id for f in analyze_taint(code, FileContext(code))]
+
+
+def test_cached_summary_does_not_leak_across_imports():
+    # same function body; `os` is a harmless alias in the first file
+    assert _taint("from mylib import safe as os\n" + BODY) == []
+    assert _taint("import os\n" + BODY) == ["TAINT_SINK_REACHED"]
+    assert _taint("from mylib import safe as os\n" + BODY) == []
@@ -0,0 +1,55 @@
+# tests/test_wisdom_service.py
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import wisdom_service
+
+CORE = Path(wisdom_service.__file__).resolve().parent.parent / "core"
+HEADERS = {"X-API-Key": "devsync_live_abc123"}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # signed policies are read from, and audit / usage logs written
+    # to, the working directory
+    (tmp_path / "core").mkdir()
+    (tmp_path / "core" / "org_policies").symlink_to(CORE / "org_policies")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("POLICY_PUBLIC_KEY", (CORE / "security" / "public.pem").read_text())
+    monkeypatch.setenv("DEV_MODE", "true")
+    return TestClient(wisdom_service.app)
+
+
+@pytest.mark.parametrize("code", [
+    "def f():\n    eval(input())\n",
+    "import os\nimport sys\nimport json\n\ndef f():\n    try:\n        g()\n    except:\n        pass\n",
+    "def f(a):\n    return a\n",
+])
+def test_verdict_only_endpoint_matches_full_review(client, code):
+    body = {"file": "a.py", "language": "python", "code": code}
+    full = client.post("/review", json=body, headers=HEADERS)
+    short = client.post("/review?verdict_only=true", json=body, headers=HEADERS)
+
+    assert short.status_code == full.status_code
+    assert short.json()["policy"]["status"] == full.json()["policy"]["status"]
+    assert short.json()["policy"]["reason"] == full.json()["policy"]["reason"]
+    assert short.json()["metadata"]["verdict_only"] is True
+
+
+@pytest.mark.parametrize("header, cached", [
+    ("{etag}", True),
+    ("W/{etag}", True),
+    ('"other", W/{etag}', True),
+    ('"a,b",{etag}', True),
+    ("*", True),
+    ('"other"', False),
+    ('W/"other", "a,b"', False),
+])
+def test_rule_catalog_if_none_match(client, header, cached):
+    etag = client.get("/rules/catalog").headers["ETag"]
+    response = client.get("/rules/catalog", headers={"If-None-Match": header.format(etag=etag)})
+
+    assert response.status_code == (304 if cached else 200)
+    assert response.headers["ETag"] == etag